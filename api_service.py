@@ -0,0 +1,247 @@
+"""
+🇮🇳 INDIAN NEWS VERIFIER - HTTP API SERVICE
+===========================================
+Headless JSON service exposing the verification engine alongside the
+Streamlit UI. The engine and its caches are shared by every request;
+blocking model calls run in the worker thread pool so handlers stay async.
+
+Endpoints:
+    GET  /health        Liveness and engine status (never calls the model)
+    POST /verify        {"claim": "..."}
+    POST /verify/batch  {"claims": ["...", ...], "timeout": 60}
+    POST /verify/url    {"url": "https://..."}
+    GET  /metrics       Prometheus text format
+    GET|POST /metrics/profile  Last cProfile report / profile the next verification (X-Admin-Token)
+    GET  /history/export  ?format=ndjson|csv&since=&until=&status= streamed (X-Admin-Token)
+    GET  /history/search  ?q=...&status=&limit= full-text search over past claims (X-Admin-Token)
+
+Run:
+    python api_service.py
+    uvicorn api_service:app --host 0.0.0.0 --port 8000
+"""
+
+import json
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from main_beautiful import (
+    AppConfig, NewsURLExtractor, get_feed_monitor, get_shared_engine, get_url_flights, is_admin, render_metrics
+)
+from history_store import parse_time
+from metrics import METRICS
+
+engine = get_shared_engine()
+
+
+class BadRequest(Exception):
+    """Client error reported as a 400 JSON response"""
+
+
+async def read_json(request):
+    """Parse a JSON object body"""
+    try:
+        payload = await request.json()
+    except json.JSONDecodeError:
+        raise BadRequest("Request body must be valid JSON")
+    if not isinstance(payload, dict):
+        raise BadRequest("Request body must be a JSON object")
+    return payload
+
+
+def require_text(payload, field):
+    """Fetch a non-empty string field"""
+    value = payload.get(field)
+    if not isinstance(value, str) or not value.strip():
+        raise BadRequest(f"'{field}' must be a non-empty string")
+    return value.strip()
+
+
+async def health(request):
+    """Engine status without touching the model"""
+    verifier = engine.peek()
+    body = {
+        'status': 'ok',
+        'version': AppConfig.VERSION,
+        'engine_started': verifier is not None,
+        'engine_ready': bool(verifier and verifier.is_ready),
+        'model': verifier.model_name if verifier else None,
+    }
+    if verifier is not None:
+        body['models'] = verifier.router.stats()
+        body['rate_limit'] = verifier.limiter.stats()
+        body['coalesced'] = {'claims': verifier.flights.stats(), 'urls': get_url_flights().stats()}
+        if verifier.cassette is not None:
+            # Imported only when a cassette is configured, like the engine does
+            from cassette import CassettePlayer
+            if isinstance(verifier.cassette, CassettePlayer):
+                body['cassette'] = {'mode': 'replay', **verifier.cassette.stats()}
+            else:
+                body['cassette'] = {'mode': 'record', 'recorded': verifier.cassette.recorded}
+    if verifier is not None and verifier.cache is not None:
+        body['cache'] = await run_in_threadpool(verifier.cache.stats)
+    if verifier is not None and verifier.history is not None:
+        body['history'] = await run_in_threadpool(verifier.history.stats)
+    monitor = get_feed_monitor()
+    if monitor is not None:
+        body['monitor'] = await run_in_threadpool(monitor.stats)
+    return JSONResponse(body)
+
+
+async def verify(request):
+    """Verify a single claim"""
+    claim = require_text(await read_json(request), 'claim')
+    verifier = await run_in_threadpool(engine.get)
+    result = await run_in_threadpool(verifier.verify_news, claim)
+    return JSONResponse(result)
+
+
+async def verify_batch(request):
+    """Verify a list of claims concurrently; results keep the input order"""
+    payload = await read_json(request)
+    claims = payload.get('claims')
+    if not isinstance(claims, list) or not claims:
+        raise BadRequest("'claims' must be a non-empty list of strings")
+    if len(claims) > AppConfig.API_MAX_BATCH:
+        raise BadRequest(f"At most {AppConfig.API_MAX_BATCH} claims per batch")
+    if not all(isinstance(claim, str) and claim.strip() for claim in claims):
+        raise BadRequest("'claims' must be a non-empty list of strings")
+
+    timeout = payload.get('timeout')
+    if timeout is not None and (not isinstance(timeout, (int, float)) or timeout <= 0):
+        raise BadRequest("'timeout' must be a positive number of seconds")
+
+    verifier = await run_in_threadpool(engine.get)
+    results = await run_in_threadpool(verifier.verify_many, [claim.strip() for claim in claims], None, timeout)
+    return JSONResponse({'results': results})
+
+
+async def verify_url(request):
+    """Extract article text from a URL and verify it"""
+    url = require_text(await read_json(request), 'url')
+    if not url.startswith(('http://', 'https://')):
+        raise BadRequest("'url' must be an http(s) URL")
+
+    try:
+        article = await run_in_threadpool(NewsURLExtractor.extract_article, url)
+    except Exception as e:
+        return JSONResponse({'url': url, 'error': f"Error extracting URL: {str(e)}"}, status_code=502)
+    if not article.paragraphs:
+        return JSONResponse({'url': url, 'error': "Could not extract text from this URL"}, status_code=422)
+
+    extracted_text = NewsURLExtractor.claim_from(article)
+    verifier = await run_in_threadpool(engine.get)
+    if AppConfig.ARTICLE_MAX_CLAIMS:
+        # Claim-by-claim verdicts under result['claims']
+        result = await run_in_threadpool(verifier.verify_article, article.title, article.paragraphs)
+    else:
+        result = await run_in_threadpool(verifier.verify_news, extracted_text)
+    return JSONResponse({
+        'url': url,
+        'extracted_text': extracted_text,
+        'article': {'title': article.title, 'published': article.published, 'byline': article.byline},
+        'result': result
+    })
+
+
+async def metrics(request):
+    """Prometheus text exposition of stage latencies, verdict counters and engine gauges"""
+    body = await run_in_threadpool(render_metrics)
+    return PlainTextResponse(body, media_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+async def profile(request):
+    """POST arms cProfile for the next verification; GET returns the last report (X-Admin-Token required)"""
+    if not is_admin(request.headers.get('X-Admin-Token')):
+        return JSONResponse({'error': "Admin token required"}, status_code=403)
+    if request.method == 'POST':
+        METRICS.profile_next()
+        return JSONResponse({'armed': True})
+    return JSONResponse({'armed': METRICS.profile_armed, 'profile': METRICS.last_profile})
+
+
+async def history_store(request):
+    """The engine's history store, after the admin check"""
+    if not is_admin(request.headers.get('X-Admin-Token')):
+        return None, JSONResponse({'error': "Admin token required"}, status_code=403)
+    verifier = await run_in_threadpool(engine.get)
+    if verifier.history is None:
+        return None, JSONResponse({'error': "Verification history is disabled"}, status_code=404)
+    return verifier.history, None
+
+
+async def history_export(request):
+    """Stream past verifications in [since, until) as NDJSON or CSV (X-Admin-Token required)"""
+    store, denied = await history_store(request)
+    if denied is not None:
+        return denied
+    params = request.query_params
+    export_format = params.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        raise BadRequest("'format' must be ndjson or csv")
+    try:
+        since, until = parse_time(params.get('since')), parse_time(params.get('until'))
+    except ValueError:
+        raise BadRequest("'since' and 'until' must be ISO dates or epoch seconds")
+
+    # Pages are read lazily from SQLite while the response is being sent
+    if export_format == 'csv':
+        chunks, media_type = store.iter_csv(since, until, params.get('status')), 'text/csv; charset=utf-8'
+    else:
+        chunks, media_type = store.iter_ndjson(since, until, params.get('status')), 'application/x-ndjson'
+    return StreamingResponse(chunks, media_type=media_type, headers={
+        'Content-Disposition': f'attachment; filename="history.{export_format}"'})
+
+
+async def history_search(request):
+    """Full-text search over past claims (X-Admin-Token required)"""
+    store, denied = await history_store(request)
+    if denied is not None:
+        return denied
+    params = request.query_params
+    query = params.get('q', '').strip()
+    if not query:
+        raise BadRequest("'q' must be a non-empty string")
+    try:
+        limit = min(max(int(params.get('limit', 50)), 1), 500)
+    except ValueError:
+        raise BadRequest("'limit' must be a number")
+    records = await run_in_threadpool(store.search, query, limit, params.get('status'))
+    return JSONResponse({'query': query, 'results': records})
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Build the engine in the background at startup so the first request finds it warm; start the feed monitor"""
+    engine.start()
+    get_feed_monitor()
+    yield
+
+
+async def bad_request(request, exc):
+    return JSONResponse({'error': str(exc)}, status_code=400)
+
+
+app = Starlette(
+    routes=[
+        Route('/health', health, methods=['GET']),
+        Route('/verify', verify, methods=['POST']),
+        Route('/verify/batch', verify_batch, methods=['POST']),
+        Route('/verify/url', verify_url, methods=['POST']),
+        Route('/metrics', metrics, methods=['GET']),
+        Route('/metrics/profile', profile, methods=['GET', 'POST']),
+        Route('/history/export', history_export, methods=['GET']),
+        Route('/history/search', history_search, methods=['GET']),
+    ],
+    exception_handlers={BadRequest: bad_request},
+    lifespan=lifespan,
+)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run(app, host='0.0.0.0', port=AppConfig.API_PORT, timeout_keep_alive=AppConfig.API_KEEP_ALIVE)
@@ -0,0 +1,345 @@
+"""
+ARTICLE EXTRACTION ENGINE
+=========================
+Fast article-body extraction for news pages, built on lxml's incremental
+HTML parser instead of a full BeautifulSoup tree.
+
+- The page is fed to the parser in chunks and paragraphs are scored as they
+  close: text length, commas and link density decide whether a paragraph
+  is body text, and paragraphs are grouped by their parent block.
+- Navigation, headers/footers, comments, "related stories", share bars and
+  similar boilerplate are skipped by tag and by class/id hints.
+- Parsing stops early once the best block holds `target_chars` of body text.
+- Headline, publish date, byline and description come from OpenGraph/meta
+  tags, JSON-LD (NewsArticle) and common markup, in that order.
+"""
+
+import json
+import re
+
+from lxml import etree
+
+SKIP_TAGS = frozenset([
+    'script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form', 'iframe',
+    'svg', 'button', 'select', 'textarea', 'figcaption', 'template',
+])
+BOILERPLATE_HINT = re.compile(
+    r'comment|related|also[-_]?read|read[-_]?more|recommend|trending|popular|'
+    r'sidebar|side[-_]bar|widget|promo|advert|\bads?\b|\bad[-_]|sponsor|newsletter|subscribe|'
+    r'breadcrumb|footer|header|menu|\bnav|cookie|consent|disclaimer|copyright|more[-_]stories',
+    re.IGNORECASE
+)
+# Also used as class modifiers on article containers ("post tag-politics", "entry-content share-top"),
+# so they only mark leaf blocks such as share bars and tag lists
+LEAF_BOILERPLATE_HINT = re.compile(r'\bshare|social|\btags?\b|\btag[-_]', re.IGNORECASE)
+CONTENT_HINT = re.compile(r'article|story|content|body|post|entry|main|text|detail', re.IGNORECASE)
+CONTAINER_TAGS = frozenset(['html', 'body', 'article', 'main'])
+CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+WHITESPACE = re.compile(r'\s+')
+
+PARAGRAPH_TAGS = frozenset(['p'])
+MIN_PARAGRAPH_CHARS = 25
+MAX_LINK_DENSITY = 0.5
+
+DATE_META = ('article:published_time', 'og:published_time', 'datepublished', 'publish-date',
+             'pubdate', 'publishdate', 'date', 'dc.date.issued', 'article:modified_time')
+AUTHOR_META = ('author', 'article:author', 'byl', 'dc.creator', 'twitter:creator')
+TITLE_META = ('og:title', 'twitter:title', 'headline')
+
+
+class ExtractedArticle:
+    """Article body and metadata pulled from one page"""
+
+    __slots__ = ('title', 'published', 'byline', 'description', 'paragraphs', 'stopped_early')
+
+    def __init__(self, title=None, published=None, byline=None, description=None, paragraphs=None,
+                 stopped_early=False):
+        self.title = title
+        self.published = published
+        self.byline = byline
+        self.description = description
+        self.paragraphs = paragraphs or []
+        self.stopped_early = stopped_early
+
+    @property
+    def text(self):
+        """Body text, one paragraph per line"""
+        return '\n'.join(self.paragraphs)
+
+    def claim_text(self, max_chars=1000):
+        """Headline followed by body text, cut to max_chars on a word boundary"""
+        parts = [self.title] if self.title else []
+        parts.extend(self.paragraphs)
+        text = ' '.join(parts)
+        if len(text) <= max_chars:
+            return text
+        return text[:max_chars].rsplit(' ', 1)[0]
+
+    def to_dict(self):
+        return {
+            'title': self.title,
+            'published': self.published,
+            'byline': self.byline,
+            'description': self.description,
+            'text': self.text,
+        }
+
+
+class _Block:
+    """Paragraphs sharing a parent element, with a running content score"""
+
+    __slots__ = ('paragraphs', 'chars', 'score')
+
+    def __init__(self):
+        self.paragraphs = []
+        self.chars = 0
+        self.score = 0.0
+
+
+def _clean(text):
+    return WHITESPACE.sub(' ', text or '').strip()
+
+
+def _detect_encoding(head):
+    match = CHARSET_PATTERN.search(head)
+    if match:
+        return match.group(1).decode('ascii', 'ignore').lower()
+    return 'utf-8'
+
+
+def _hint(element):
+    return f"{element.get('class', '')} {element.get('id', '')} {element.get('itemprop', '')}"
+
+
+class ArticleExtractor:
+    """Streaming article extractor; instances are stateless and thread-safe"""
+
+    def __init__(self, target_chars=4000, chunk_size=16384):
+        self.target_chars = target_chars
+        self.chunk_size = chunk_size
+
+    def extract(self, html):
+        """Extract an ExtractedArticle from HTML bytes or text"""
+        if isinstance(html, str):
+            html = html.encode('utf-8')
+            encoding = 'utf-8'
+        else:
+            encoding = _detect_encoding(html[:4096])
+
+        try:
+            parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding, recover=True,
+                                          remove_comments=True, no_network=True)
+        except LookupError:
+            parser = etree.HTMLPullParser(events=('start', 'end'), recover=True, remove_comments=True,
+                                          no_network=True)
+        state = _ExtractionState()
+
+        for offset in range(0, len(html), self.chunk_size):
+            parser.feed(html[offset:offset + self.chunk_size])
+            if self._consume(parser, state):
+                state.stopped_early = True
+                break
+        else:
+            try:
+                parser.close()
+            except etree.XMLSyntaxError:
+                pass
+            self._consume(parser, state)
+
+        return state.result()
+
+    def _consume(self, parser, state):
+        """Process pending parser events; True once enough body text is collected"""
+        for event, element in parser.read_events():
+            tag = element.tag if isinstance(element.tag, str) else ''
+            tag = tag.lower()
+
+            if event == 'start':
+                hint = None if tag in CONTAINER_TAGS else _boilerplate_hint(element)
+                if tag in SKIP_TAGS or hint == 'block':
+                    state.skip(element, hard=True)
+                elif hint == 'leaf':
+                    state.skip(element, hard=False)
+                continue
+
+            # 'end' event: the element and its children are complete
+            if element in state.skipped:
+                state.unskip(element)
+                if tag == 'script' and element.get('type', '').lower() == 'application/ld+json':
+                    state.read_json_ld(element.text)
+                continue
+
+            if tag == 'meta':
+                state.read_meta(element)
+            elif tag == 'title' and state.html_title is None:
+                state.html_title = _clean(element.text)
+            elif tag == 'time' and state.time_datetime is None:
+                state.time_datetime = element.get('datetime') or _clean(element.text) or None
+            elif tag == 'h1' and state.skip_depth == 0 and state.h1 is None:
+                state.h1 = _clean(''.join(element.itertext())) or None
+            elif tag == 'h1' and state.hard_depth == 0 and state.fallback_h1 is None:
+                state.fallback_h1 = _clean(''.join(element.itertext())) or None
+            elif tag in ('a', 'span', 'div', 'p') and state.byline_hint is None and state.skip_depth == 0:
+                hint = _hint(element) + ' ' + element.get('rel', '')
+                if re.search(r'byline|author', hint, re.IGNORECASE):
+                    text = _clean(''.join(element.itertext()))
+                    if 2 < len(text) < 80:
+                        state.byline_hint = text
+
+            if tag in PARAGRAPH_TAGS and state.skip_depth == 0:
+                best = state.add_paragraph(element)
+                if best is not None and best.chars >= self.target_chars:
+                    return True
+            elif tag in PARAGRAPH_TAGS and state.hard_depth == 0 and _boilerplate_hint(element) is None:
+                # Inside a share bar or tag list: kept only in case no body block is found
+                state.add_fallback(element)
+        return False
+
+
+def _boilerplate_hint(element):
+    """'block' or 'leaf' when class/id hints mark an element as boilerplate, else None"""
+    hint = _hint(element)
+    if CONTENT_HINT.search(element.get('itemprop', '')):
+        return None
+    if BOILERPLATE_HINT.search(hint):
+        return 'block'
+    # Leaf hints do not apply to content containers
+    if LEAF_BOILERPLATE_HINT.search(hint) and not CONTENT_HINT.search(hint):
+        return 'leaf'
+    return None
+
+
+class _ExtractionState:
+    """Mutable state for one extraction"""
+
+    def __init__(self):
+        self.skipped = {}
+        self.skip_depth = 0
+        self.hard_depth = 0
+        self.fallback = []
+        self.fallback_h1 = None
+        self.blocks = {}
+        self.meta = {}
+        self.json_ld = {}
+        self.html_title = None
+        self.h1 = None
+        self.time_datetime = None
+        self.byline_hint = None
+        self.stopped_early = False
+        self.best = None
+
+    def skip(self, element, hard):
+        """Ignore an element's content; hard skips (scripts, related stories...) also exclude it from the fallback"""
+        self.skipped[element] = hard
+        self.skip_depth += 1
+        self.hard_depth += hard
+
+    def unskip(self, element):
+        self.hard_depth -= self.skipped.pop(element)
+        self.skip_depth -= 1
+
+    def read_meta(self, element):
+        name = (element.get('property') or element.get('name') or element.get('itemprop') or '').lower()
+        content = element.get('content')
+        if name and content and name not in self.meta:
+            self.meta[name] = _clean(content)
+
+    def read_json_ld(self, text):
+        """Pick headline/date/author from a NewsArticle JSON-LD block"""
+        try:
+            data = json.loads(text or '')
+        except ValueError:
+            return
+        items = data if isinstance(data, list) else data.get('@graph', [data]) if isinstance(data, dict) else []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            kind = item.get('@type')
+            kinds = kind if isinstance(kind, list) else [kind]
+            if not any(k in ('NewsArticle', 'Article', 'ReportageNewsArticle') for k in kinds):
+                continue
+            author = item.get('author')
+            if isinstance(author, list):
+                author = author[0] if author else None
+            if isinstance(author, dict):
+                author = author.get('name')
+            for field, value in (('headline', item.get('headline')), ('published', item.get('datePublished')),
+                                 ('author', author)):
+                if isinstance(value, str) and value.strip() and field not in self.json_ld:
+                    self.json_ld[field] = _clean(value)
+
+    @staticmethod
+    def _paragraph_text(element):
+        """(text, link density) of a paragraph, or None when it is too short or mostly links"""
+        text = _clean(''.join(element.itertext()))
+        if len(text) < MIN_PARAGRAPH_CHARS:
+            return None
+        link_chars = sum(len(_clean(''.join(link.itertext()))) for link in element.iter('a'))
+        link_density = link_chars / len(text)
+        if link_density > MAX_LINK_DENSITY:
+            return None
+        return text, link_density
+
+    def add_fallback(self, element):
+        paragraph = self._paragraph_text(element)
+        if paragraph is not None:
+            self.fallback.append(paragraph[0])
+
+    def add_paragraph(self, element):
+        """Score a closed paragraph into its parent block; returns the best block"""
+        paragraph = self._paragraph_text(element)
+        if paragraph is None:
+            return self.best
+        text, link_density = paragraph
+
+        # Credit the parent fully and the grandparent by half, so bodies split
+        # into one <div> per paragraph still form a single block
+        score = (len(text) / 100 + text.count(',') + 1) * (1 - link_density)
+        parent = element.getparent()
+        grandparent = parent.getparent() if parent is not None else None
+        for container, weight in ((parent, 1.0), (grandparent, 0.5)):
+            if container is None:
+                continue
+            block = self.blocks.get(container)
+            if block is None:
+                block = self.blocks[container] = _Block()
+                if CONTENT_HINT.search(_hint(container)):
+                    block.score += 25
+            block.paragraphs.append(text)
+            block.chars += len(text)
+            block.score += score * weight
+            if self.best is None or block.score > self.best.score:
+                self.best = block
+        return self.best
+
+    def result(self):
+        best = self.best
+        # No block outside hinted boilerplate: fall back to every paragraph not marked as boilerplate itself
+        paragraphs = list(best.paragraphs) if best else list(self.fallback)
+
+        published = self.json_ld.get('published')
+        if not published:
+            published = next((self.meta[name] for name in DATE_META if name in self.meta), None)
+        if not published:
+            published = self.time_datetime
+
+        byline = self.json_ld.get('author')
+        if not byline:
+            byline = next((self.meta[name] for name in AUTHOR_META
+                           if name in self.meta and not self.meta[name].startswith('http')), None)
+        if not byline:
+            byline = self.byline_hint
+        if byline:
+            byline = re.sub(r'^(by|written by)\s+', '', byline, flags=re.IGNORECASE)
+
+        title = self.json_ld.get('headline') or next((self.meta[name] for name in TITLE_META if name in self.meta),
+                                                      None) or self.h1 or self.fallback_h1 or self.html_title
+
+        return ExtractedArticle(
+            title=title,
+            published=published,
+            byline=byline,
+            description=self.meta.get('og:description') or self.meta.get('description'),
+            paragraphs=paragraphs,
+            stopped_early=self.stopped_early
+        )
@@ -0,0 +1,135 @@
+"""
+Benchmark: article-body extraction
+==================================
+Compares the original BeautifulSoup/html.parser pass (join every <p>,
+cut to 1000 characters) with ArticleExtractor on the saved pages in
+benchmarks/corpus. Each page has a .json file with the expected headline,
+date, byline and body text.
+
+Reported per page and overall:
+- extraction time (median of --repeat runs)
+- body F1 against the expected text (word tokens)
+- precision of the 1000-character text that reaches the prompt
+- metadata hits (headline, date, byline) for the new engine
+
+Usage:
+    python benchmarks/bench_article_extraction.py [--repeat 20]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from article_extractor import ArticleExtractor  # noqa: E402
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+PROMPT_CHARS = 1000
+TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def baseline_extract(html):
+    """The original extraction path from render_verification_form"""
+    soup = BeautifulSoup(html, 'html.parser')
+    for script in soup(["script", "style"]):
+        script.decompose()
+    paragraphs = soup.find_all('p')
+    return ' '.join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
+
+
+def tokens(text):
+    return Counter(token.lower() for token in TOKEN.findall(text or ''))
+
+
+def f1(predicted, expected):
+    overlap = sum((tokens(predicted) & tokens(expected)).values())
+    predicted_count, expected_count = sum(tokens(predicted).values()), sum(tokens(expected).values())
+    if not overlap:
+        return 0.0
+    precision, recall = overlap / predicted_count, overlap / expected_count
+    return 2 * precision * recall / (precision + recall)
+
+
+def precision(predicted, expected):
+    predicted_tokens = tokens(predicted)
+    total = sum(predicted_tokens.values())
+    return sum((predicted_tokens & tokens(expected)).values()) / total if total else 0.0
+
+
+def timed(function, html, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        output = function(html)
+        samples.append((time.perf_counter() - started) * 1000)
+    return output, statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    extractor = ArticleExtractor()
+    rows = []
+    for html_path in sorted(glob.glob(os.path.join(CORPUS_DIR, '*.html'))):
+        with open(html_path, 'rb') as handle:
+            html = handle.read()
+        with open(html_path[:-len('.html')] + '.json', encoding='utf-8') as handle:
+            expected = json.load(handle)
+
+        old_text, old_ms = timed(baseline_extract, html, args.repeat)
+        article, new_ms = timed(extractor.extract, html, args.repeat)
+
+        rows.append({
+            'page': os.path.basename(html_path),
+            'kb': round(len(html) / 1024),
+            'baseline_ms': round(old_ms, 2),
+            'engine_ms': round(new_ms, 2),
+            'baseline_f1': round(f1(old_text, expected['text']), 3),
+            'engine_f1': round(f1(article.text, expected['text']), 3),
+            'baseline_prompt_precision': round(precision(old_text[:PROMPT_CHARS], expected['text']), 3),
+            'engine_prompt_precision': round(precision(article.claim_text(PROMPT_CHARS),
+                                                       expected['title'] + ' ' + expected['text']), 3),
+            'title': article.title == expected['title'],
+            'published': article.published == expected['published'],
+            'byline': article.byline == expected['byline'],
+        })
+
+    header = f"{'page':<20}{'KB':>5}{'old ms':>9}{'new ms':>9}{'old F1':>8}{'new F1':>8}{'old P@1k':>10}{'new P@1k':>10}  meta"
+    print(header)
+    print('-' * len(header))
+    for row in rows:
+        meta = ''.join('✓' if row[field] else '✗' for field in ('title', 'published', 'byline'))
+        print(f"{row['page']:<20}{row['kb']:>5}{row['baseline_ms']:>9.2f}{row['engine_ms']:>9.2f}"
+              f"{row['baseline_f1']:>8.3f}{row['engine_f1']:>8.3f}"
+              f"{row['baseline_prompt_precision']:>10.3f}{row['engine_prompt_precision']:>10.3f}  {meta}")
+
+    summary = {
+        'baseline_ms_total': round(sum(row['baseline_ms'] for row in rows), 2),
+        'engine_ms_total': round(sum(row['engine_ms'] for row in rows), 2),
+        'baseline_f1_mean': round(statistics.mean(row['baseline_f1'] for row in rows), 3),
+        'engine_f1_mean': round(statistics.mean(row['engine_f1'] for row in rows), 3),
+    }
+    print('-' * len(header))
+    print(f"Total time: baseline {summary['baseline_ms_total']:.1f} ms, engine {summary['engine_ms_total']:.1f} ms "
+          f"({summary['baseline_ms_total'] / summary['engine_ms_total']:.1f}x faster); "
+          f"mean F1 {summary['baseline_f1_mean']:.3f} -> {summary['engine_f1_mean']:.3f}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as handle:
+            json.dump({'pages': rows, 'summary': summary}, handle, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: fact-check retrieval index at scale
+==============================================
+Builds a FactCheckIndex of synthetic fact-checks (1M by default, appended
+in segments), reopens it from disk, then measures top-k query latency for
+paraphrases of indexed claims and for unseen claims, plus how often
+the source fact-check ranks first.
+
+Usage:
+    python benchmarks/bench_factcheck_index.py [--size 1000000] [--queries 2000] [--index DIR]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_near_duplicate import paraphrase, render, synthetic_claim  # noqa: E402
+
+from factcheck_index import FactCheckIndex  # noqa: E402
+
+SOURCES = ["Alt News", "Boom Live", "The Quint WebQoof", "PIB Fact Check", "India Today Fact Check"]
+RATINGS = ["False", "Misleading", "Fake", "True", "Partly False", "Satire", "Missing Context"]
+
+
+def synthetic_fact_check(rng, serial):
+    parts = synthetic_claim(rng)
+    claim = render(parts)
+    return parts, {
+        'claim': claim,
+        'title': f"Fact Check: {claim}",
+        'rating': rng.choice(RATINGS),
+        'source': rng.choice(SOURCES),
+        'url': f"https://factcheck.example/{serial}",
+        'text': f"A message claiming that {claim.lower()} is being shared on WhatsApp. We found no official order.",
+    }
+
+
+def percentile(values, share):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=1000000)
+    parser.add_argument('--segment-size', type=int, default=250000)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--index', help="Index directory to build in (default: a temporary directory)")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    directory = args.index or tempfile.mkdtemp(prefix='factchecks-')
+    index = FactCheckIndex(directory)
+    started = time.perf_counter()
+    for start in range(0, args.size, args.segment_size):
+        index.append(synthetic_fact_check(rng, serial)[1] for serial in range(start, min(args.size, start + args.segment_size)))
+    print(f"built {len(index):,} documents in {index.segment_count} segments in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    index = FactCheckIndex(directory)
+    print(f"reopened in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    # Regenerate the same claims to build paraphrased queries with known answers
+    rng = random.Random(7)
+    documents = [synthetic_fact_check(rng, serial) for serial in range(args.size)]
+    picks = random.Random(11).sample(range(args.size), args.queries)
+    query_rng = random.Random(13)
+
+    for label, queries in (
+        ('paraphrase', [(paraphrase(query_rng, documents[i][0]), documents[i][1]['url']) for i in picks]),
+        ('unseen', [(render(synthetic_claim(query_rng)), None) for _ in range(args.queries)]),
+    ):
+        timings = []
+        first = 0
+        for query, url in queries:
+            began = time.perf_counter()
+            matches = index.search(query, k=5)
+            timings.append((time.perf_counter() - began) * 1000)
+            if url is not None and matches and matches[0].document['url'] == url:
+                first += 1
+        line = f"{label:<10} p50 {percentile(timings, 0.5):.2f}ms  p99 {percentile(timings, 0.99):.2f}ms"
+        if label == 'paraphrase':
+            line += f"  top-1 {first / len(queries):.1%}"
+        print(line)
+
+    if not args.index:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+"""
+Benchmark: near-duplicate claim index at scale
+==============================================
+Fills a NearDuplicateIndex with synthetic claims (1M by default), then
+measures lookup latency and accuracy for three query sets:
+
+- paraphrases of stored claims (word changes, same names and figures):
+  recall, i.e. the share matched to the right claim;
+- hard negatives that differ from a stored claim only by a negation or a
+  figure: false matches, which must stay at zero;
+- unseen claims: false matches.
+
+Usage:
+    python benchmarks/bench_near_duplicate.py [--size 1000000] [--queries 2000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from near_duplicate import NearDuplicateIndex  # noqa: E402
+from verdict_cache import claim_key  # noqa: E402
+
+SUBJECTS = ["PM Modi", "The RBI", "The Supreme Court", "ISRO", "The Election Commission",
+            "The Delhi government", "Indian Railways", "The Health Ministry", "UIDAI", "SEBI",
+            "The Maharashtra CM", "The Army chief", "NASA", "WHO", "The Finance Minister"]
+# (past tense, base form, paraphrases of the past tense)
+VERBS = [("announced", "announce", ["declared", "has announced", "officially announced"]),
+         ("confirmed", "confirm", ["has confirmed", "verified", "officially confirmed"]),
+         ("banned", "ban", ["has banned", "prohibited", "imposed a ban on"]),
+         ("approved", "approve", ["has approved", "cleared", "gave approval to"]),
+         ("launched", "launch", ["has launched", "rolled out", "started"]),
+         ("cancelled", "cancel", ["has cancelled", "scrapped", "called off"]),
+         ("ordered", "order", ["has ordered", "directed", "issued orders for"])]
+OBJECTS = ["a new currency note", "free electricity for all households", "a nationwide lockdown",
+           "a tax on WhatsApp messages", "a ban on Chinese apps", "free laptops for students",
+           "a new vaccine for dengue", "the merger of public banks", "a cap on petrol prices",
+           "compulsory Aadhaar for SIM cards", "a holiday for all schools", "a new satellite launch"]
+PLACES = ["in Delhi", "in Mumbai", "across India", "in Uttar Pradesh", "in Kerala", "in Bengal",
+          "in all metro cities", "in rural districts", "in Assam", "in Gujarat"]
+TAILS = ["from tomorrow", "from next month", "this week", "with immediate effect", "by Diwali",
+         "before the elections", "after the budget", "starting Monday"]
+FILLERS = ["reportedly", "apparently", "finally", "suddenly"]
+SYLLABLES = ["ra", "man", "pur", "ga", "dev", "shi", "vi", "nath", "ko", "bad", "la", "sen",
+             "har", "ji", "pat", "nag", "mi", "tra", "su", "dha"]
+PREFIXES = ["Breaking: ", "Forwarded as received: ", "Urgent!! ", "Please share: ", "", "News: "]
+
+
+def proper_noun(rng):
+    """Random Indian-sounding name, so claims are not all template siblings"""
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+
+def synthetic_claim(rng):
+    """Parts of a synthetic claim; names and figures make stored claims distinct"""
+    return {
+        'subject': rng.choice(SUBJECTS),
+        'verb': rng.choice(VERBS),
+        'object': rng.choice(OBJECTS),
+        'amount': rng.randint(2, 999),
+        'place': rng.choice(PLACES),
+        'names': (proper_noun(rng), proper_noun(rng), proper_noun(rng)),
+        'tail': rng.choice(TAILS),
+    }
+
+
+def render(parts, verb=None, filler='', tail_first=False):
+    """Claim text from its parts"""
+    first, second, third = parts['names']
+    verb = verb or parts['verb'][0]
+    body = (f"{parts['subject']} {filler + ' ' if filler else ''}{verb} {parts['object']} worth "
+            f"Rs {parts['amount']} crore {parts['place']} near {first} with {second} {third}")
+    if tail_first:
+        return f"{parts['tail'].capitalize()}, {body[0].lower() + body[1:]}"
+    return f"{body} {parts['tail']}"
+
+
+def paraphrase(rng, parts):
+    """
+    Same claim in other words: a synonymous verb, an added filler word or a
+    moved time phrase, plus forwarded-message noise (prefix, case, emphasis).
+    Names and figures are kept, as in real paraphrases of one rumour.
+    """
+    change = rng.randrange(3)
+    variant = render(parts,
+                     verb=rng.choice(parts['verb'][2]) if change == 0 else None,
+                     filler=rng.choice(FILLERS) if change == 1 else '',
+                     tail_first=change == 2)
+    variant = rng.choice(PREFIXES) + variant
+    if rng.random() < 0.5:
+        variant = variant.upper()
+    if rng.random() < 0.5:
+        variant += rng.choice(["!!!", " 🙏", " - share with everyone", " #India"])
+    return variant
+
+
+def hard_negative(rng, parts):
+    """Nearly the same text but the opposite or a different claim: a negation or another figure"""
+    if rng.random() < 0.5:
+        return render(parts, verb=f"did not {parts['verb'][1]}")
+    return render(dict(parts, amount=parts['amount'] + rng.randint(1, 50)))
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=1_000_000)
+    parser.add_argument('--queries', type=int, default=2000)
+    parser.add_argument('--threshold', type=float, default=0.8)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    index = NearDuplicateIndex(capacity=args.size, threshold=args.threshold)
+    print(f"Index arrays: {index.memory_bytes() / 2 ** 20:.1f} MiB for capacity {args.size:,}")
+
+    sample_every = max(1, args.size // args.queries)
+    stored = []
+    started = time.perf_counter()
+    for serial in range(args.size):
+        parts = synthetic_claim(rng)
+        claim = render(parts)
+        key = claim_key(claim)
+        index.add(key, claim)
+        if serial % sample_every == 0:
+            stored.append((key, parts))
+    build_seconds = time.perf_counter() - started
+    print(f"Inserted {args.size:,} claims in {build_seconds:.1f}s "
+          f"({args.size / build_seconds:,.0f} inserts/s)")
+
+    def timed_lookups(claims):
+        latencies, results = [], []
+        for claim in claims:
+            t0 = time.perf_counter()
+            results.append(index.lookup(claim))
+            latencies.append((time.perf_counter() - t0) * 1000)
+        return latencies, results
+
+    paraphrased = [(key, paraphrase(rng, parts)) for key, parts in stored[:args.queries]]
+    latencies, results = timed_lookups([claim for _, claim in paraphrased])
+    found = sum(1 for (key, _), match in zip(paraphrased, results) if match is not None and match.key == key)
+    print(f"Paraphrase lookups:    p50 {percentile(latencies, 50):.3f} ms, p99 {percentile(latencies, 99):.3f} ms, "
+          f"recall {found / len(paraphrased):.1%}")
+
+    negatives = [hard_negative(rng, parts) for _, parts in stored[:args.queries]]
+    latencies, results = timed_lookups(negatives)
+    false_hits = sum(1 for match in results if match is not None)
+    print(f"Hard-negative lookups: p50 {percentile(latencies, 50):.3f} ms, p99 {percentile(latencies, 99):.3f} ms, "
+          f"false matches {false_hits} ({false_hits / len(negatives):.1%})")
+
+    unseen = [f"Completely new rumour number {i} about {rng.choice(OBJECTS)}" for i in range(args.queries)]
+    latencies, results = timed_lookups(unseen)
+    false_hits = sum(1 for match in results if match is not None)
+    print(f"Unseen lookups:        p50 {percentile(latencies, 50):.3f} ms, p99 {percentile(latencies, 99):.3f} ms, "
+          f"false matches {false_hits}")
+
+
+if __name__ == '__main__':
+    main()
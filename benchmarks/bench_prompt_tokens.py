@@ -0,0 +1,100 @@
+"""
+Benchmark: prompt size per verification
+=======================================
+Estimated input tokens per request for the original prompt (verbose
+preamble with the article cut to 1000 characters) and for the compact
+system instruction plus a token-budgeted claim, on the pages in
+benchmarks/corpus. The system instruction is billed on every request,
+so it is counted in full for the new prompt too.
+
+Usage:
+    python benchmarks/bench_prompt_tokens.py [--article-tokens 250]
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from prompt_builder import PromptBuilder, compact_article, estimate_tokens  # noqa: E402
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+
+LEGACY_TEMPLATE = """
+        🇮🇳 INDIAN NEWS FACT-CHECK ANALYSIS
+        =====================================
+        
+        You are an expert Indian news fact-checker with deep knowledge of:
+        - Indian politics, government, and current affairs
+        - Indian media landscape and reliable sources
+        - Indian cultural and social context
+        - Common misinformation patterns in India
+        
+        NEWS CLAIM TO ANALYZE:
+        "{claim}"
+        
+        Please provide analysis in this EXACT format:
+        
+        VERIFICATION_STATUS: [TRUE/FALSE/PARTIALLY_TRUE/UNVERIFIED]
+        CONFIDENCE_SCORE: [0-100]
+        
+        DETAILED_ANALYSIS:
+        [Provide thorough explanation of why this claim is true/false]
+        
+        INDIAN_CONTEXT:
+        [Explain relevance to Indian politics, society, current events]
+        
+        EVIDENCE_CHECK:
+        [What evidence supports or contradicts this claim]
+        
+        RECOMMENDED_SOURCES:
+        [List specific Indian sources to verify this claim]
+        
+        RED_FLAGS:
+        [Any warning signs or suspicious elements in this claim]
+        
+        CONCLUSION:
+        [Final assessment with reasoning]
+        """
+
+
+def legacy_claim(title, paragraphs, max_chars=1000):
+    text = ' '.join([title] + paragraphs)
+    return text if len(text) <= max_chars else text[:max_chars].rsplit(' ', 1)[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--article-tokens', type=int, default=250)
+    args = parser.parse_args()
+
+    builder = PromptBuilder()
+    totals = [0, 0]
+    print(f"{'page':<16}{'legacy':>8}{'compact':>9}{'saved':>8}")
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, '*.json'))):
+        with open(path, encoding='utf-8') as handle:
+            expected = json.load(handle)
+        paragraphs = expected['text'].split('\n')
+
+        legacy = estimate_tokens(LEGACY_TEMPLATE.format(claim=legacy_claim(expected['title'], paragraphs)))
+        claim = compact_article(expected['title'], paragraphs, args.article_tokens)
+        compact = builder.build(claim).estimated_tokens
+
+        totals[0] += legacy
+        totals[1] += compact
+        name = os.path.splitext(os.path.basename(path))[0]
+        print(f"{name:<16}{legacy:>8}{compact:>9}{1 - compact / legacy:>8.0%}")
+
+    print(f"{'total':<16}{totals[0]:>8}{totals[1]:>9}{1 - totals[1] / totals[0]:>8.0%}")
+
+    short = "PM Modi is the current Prime Minister of India"
+    legacy = estimate_tokens(LEGACY_TEMPLATE.format(claim=short))
+    compact = builder.build(short).estimated_tokens
+    print(f"{'short claim':<16}{legacy:>8}{compact:>9}{1 - compact / legacy:>8.0%}")
+
+
+if __name__ == '__main__':
+    main()
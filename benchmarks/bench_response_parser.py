@@ -0,0 +1,96 @@
+"""
+Benchmark: model response parsing
+=================================
+Microbenchmark of the original substring/regex chain (status and
+confidence only), the single-pass parse_response() (status, confidence
+and all six sections) and parse_json_response() for structured output.
+
+Usage:
+    python benchmarks/bench_response_parser.py [--iterations 20000]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from response_parser import parse_json_response, parse_response  # noqa: E402
+
+SECTIONS_TEXT = {
+    'DETAILED_ANALYSIS': "The claim circulated widely on WhatsApp. Official records show no such announcement. " * 6,
+    'INDIAN_CONTEXT': "Similar rumours about currency changes have appeared before elections in several states. " * 3,
+    'EVIDENCE_CHECK': "The RBI website and PIB Fact Check both contradict the claim; no gazette notification exists. " * 3,
+    'RECOMMENDED_SOURCES': "- PIB Fact Check\n- Reserve Bank of India press releases\n- Alt News\n- Boom Live",
+    'RED_FLAGS': "- No named source\n- Urgent call to forward\n- Screenshot of an unverifiable circular",
+    'CONCLUSION': "The claim is false and should not be shared.",
+}
+
+PLAIN = "VERIFICATION_STATUS: FALSE\nCONFIDENCE_SCORE: 92\n\n" + "\n\n".join(
+    f"{name}:\n{text}" for name, text in SECTIONS_TEXT.items())
+BOLD_REORDERED = "**VERIFICATION_STATUS:** FALSE\n**CONFIDENCE_SCORE:** 92\n\n" + "\n\n".join(
+    f"**{name.replace('_', ' ').title()}:**\n{text}" for name, text in reversed(list(SECTIONS_TEXT.items())))
+STRUCTURED = json.dumps(dict({'verification_status': 'FALSE', 'confidence_score': 92},
+                             **{name.lower(): text for name, text in SECTIONS_TEXT.items()}))
+
+
+def legacy_parse(ai_text):
+    """The original _parse_ai_response logic (status and confidence only)"""
+    status = "UNVERIFIED"
+    confidence = 50
+    if "VERIFICATION_STATUS: TRUE" in ai_text:
+        status, confidence = "TRUE", 85
+    elif "VERIFICATION_STATUS: FALSE" in ai_text:
+        status, confidence = "FALSE", 90
+    elif "VERIFICATION_STATUS: PARTIALLY_TRUE" in ai_text:
+        status, confidence = "PARTIALLY_TRUE", 70
+    elif "VERIFICATION_STATUS: UNVERIFIED" in ai_text:
+        status, confidence = "UNVERIFIED", 30
+    import re as re_module  # the original re-imported re on every call
+    conf_match = re_module.search(r'CONFIDENCE_SCORE:\s*(\d+)', ai_text)
+    if conf_match:
+        extracted_confidence = int(conf_match.group(1))
+        if status == "UNVERIFIED" and extracted_confidence > 50:
+            confidence = min(extracted_confidence, 50)
+        elif status in ["TRUE", "FALSE", "PARTIALLY_TRUE"]:
+            confidence = extracted_confidence
+    return status, confidence
+
+
+def legacy_with_sections(ai_text):
+    """Legacy parse plus naive per-section regex searches, as downstream consumers had to do"""
+    result = legacy_parse(ai_text)
+    sections = {}
+    for name in SECTIONS_TEXT:
+        match = re.search(name + r':\s*(.*?)(?=\n[A-Z_]+:|\Z)', ai_text, re.S)
+        sections[name] = match.group(1).strip() if match else ''
+    return result, sections
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--iterations', type=int, default=20000)
+    args = parser.parse_args()
+
+    cases = [
+        ('legacy (status+confidence)', legacy_parse, PLAIN),
+        ('legacy + section regexes', legacy_with_sections, PLAIN),
+        ('parse_response (plain)', parse_response, PLAIN),
+        ('parse_response (bold, reordered)', parse_response, BOLD_REORDERED),
+        ('parse_json_response', parse_json_response, STRUCTURED),
+    ]
+
+    assert parse_response(BOLD_REORDERED).sections() == parse_response(PLAIN).sections()
+    assert legacy_parse(BOLD_REORDERED) != legacy_parse(PLAIN)  # the old parser missed bolded labels
+
+    print(f"{'parser':<36}{'µs/parse':>10}")
+    for label, function, text in cases:
+        seconds = min(timeit.repeat(lambda: function(text), number=args.iterations, repeat=3))
+        print(f"{label:<36}{seconds / args.iterations * 1e6:>10.2f}")
+
+
+if __name__ == '__main__':
+    main()
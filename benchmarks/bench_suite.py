@@ -0,0 +1,336 @@
+"""
+Benchmark: offline end-to-end suite
+===================================
+Runs the verification paths with no API key and no network:
+
+- the AI model is replaced by fake_genai (canned VERIFICATION_STATUS
+  answers after --latency seconds, +/- --jitter)
+- news pages come from a local HTTP server serving benchmarks/corpus
+
+Benchmarks, each at every --concurrency level:
+- verify   IndianNewsVerifier.verify_news on unique claims
+- stream   verify_news_stream (latency to the final result; time to first
+           verdict is reported separately)
+- batch    iter_verify over --batch-size claims with max_workers = level;
+           latency is completion time from the start of the batch
+- extract  NewsURLExtractor.extract_article against the local server
+- parse    parse_response on canned model output
+
+The verdict cache, fact-check index and triage model are disabled so every
+claim reaches the (fake) model. Results, the settings used and per-stage
+timings from metrics.py go to --json; --compare prints the change
+against an earlier results file.
+
+Usage:
+    python benchmarks/bench_suite.py --json results.json
+    python benchmarks/bench_suite.py --latency 0.5 --concurrency 1,8,32 --compare results.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+CORPUS_DIR = os.path.join(BENCH_DIR, 'corpus')
+sys.path.insert(0, REPO_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+BENCHMARKS = ('verify', 'stream', 'batch', 'extract', 'parse')
+
+CLAIM_TEMPLATES = (
+    "Government announces free electricity for all households in {place} from next month",
+    "RBI to withdraw all {amount} rupee notes by the end of this week, says viral message",
+    "Indian Railways cancels all trains to {place} for the festival season",
+    "New rule makes helmets mandatory for car drivers in {place}, fine of {amount} rupees",
+    "WHO declares {place} the cleanest city in Asia in its latest report",
+)
+PLACES = ('Mumbai', 'Delhi', 'Kolkata', 'Chennai', 'Bengaluru', 'Hyderabad', 'Pune', 'Jaipur', 'Lucknow', 'Patna')
+AMOUNTS = ('100', '200', '500', '2000', '5000')
+
+
+def make_claims(count, offset=0):
+    """Distinct claims, so neither coalescing nor any cache can answer them"""
+    claims = []
+    for number in range(offset, offset + count):
+        template = CLAIM_TEMPLATES[number % len(CLAIM_TEMPLATES)]
+        claim = template.format(place=PLACES[number // len(CLAIM_TEMPLATES) % len(PLACES)],
+                                amount=AMOUNTS[number % len(AMOUNTS)])
+        claims.append(f"{claim} (report #{number})")
+    return claims
+
+
+def configure_environment(args):
+    """Settings read by main_beautiful at import time"""
+    os.environ.update({
+        'GEMINI_API_KEY': 'offline-benchmark',
+        'MODEL_OPTIONS': 'fake-model',
+        'VERDICT_CACHE_PATH': '',
+        'FACTCHECK_INDEX_DIR': '',
+        'TRIAGE_MODEL_PATH': '',
+        'FETCH_CACHE_DIR': '',
+        'FETCH_ALLOW_PRIVATE_HOSTS': '1',  # the corpus is served from 127.0.0.1
+        'STRUCTURED_OUTPUT': '1' if args.structured else '0',
+    })
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+
+# ---------- local news server ----------
+
+class _CorpusHandler(SimpleHTTPRequestHandler):
+    """Serves the corpus pages, ignoring query strings, after an optional delay"""
+
+    delay = 0.0
+
+    def do_GET(self):
+        if self.delay:
+            time.sleep(self.delay)
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_news_server(delay):
+    handler = type('Handler', (_CorpusHandler,), {'delay': delay})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(handler, directory=CORPUS_DIR))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='bench-news-server', daemon=True).start()
+    return server
+
+
+# ---------- measurement ----------
+
+def percentile(ordered, share):
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(share * (len(ordered) - 1))))]
+
+
+def summarize(benchmark, concurrency, samples, seconds, errors, **extra):
+    """One result row; latencies in milliseconds"""
+    ordered = sorted(samples)
+    row = {
+        'benchmark': benchmark,
+        'concurrency': concurrency,
+        'operations': len(samples),
+        'errors': errors,
+        'seconds': round(seconds, 4),
+        'throughput_per_s': round(len(samples) / seconds, 2) if seconds else None,
+    }
+    for name, share in (('p50_ms', 0.5), ('p95_ms', 0.95), ('p99_ms', 0.99)):
+        value = percentile(ordered, share)
+        row[name] = round(value * 1000, 3) if value is not None else None
+    row.update(extra)
+    return row
+
+
+def run_concurrent(operation, items, concurrency):
+    """Apply operation to every item on `concurrency` threads; returns (latencies, wall seconds, errors)"""
+    def timed(item):
+        started = time.perf_counter()
+        try:
+            ok = operation(item)
+        except Exception:
+            ok = False
+        return time.perf_counter() - started, ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(timed, items))
+    seconds = time.perf_counter() - started
+    return [latency for latency, _ in outcomes], seconds, sum(1 for _, ok in outcomes if not ok)
+
+
+# ---------- benchmarks ----------
+
+def bench_verify(verifier, concurrency, args, offset):
+    claims = make_claims(args.requests, offset)
+    samples, seconds, errors = run_concurrent(lambda claim: verifier.verify_news(claim)['success'],
+                                              claims, concurrency)
+    return summarize('verify', concurrency, samples, seconds, errors)
+
+
+def bench_stream(verifier, concurrency, args, offset):
+    first_verdicts = []
+
+    def stream(claim):
+        result = None
+        for event in verifier.verify_news_stream(claim):
+            if event['type'] == 'result':
+                result = event['result']
+        if result and result.get('timings'):
+            first_verdicts.append(result['timings']['first_verdict_ms'] / 1000)
+        return bool(result and result['success'])
+
+    samples, seconds, errors = run_concurrent(stream, make_claims(args.requests, offset), concurrency)
+    first_verdicts.sort()
+    return summarize('stream', concurrency, samples, seconds, errors,
+                     first_verdict_p50_ms=round(percentile(first_verdicts, 0.5) * 1000, 3) if first_verdicts else None,
+                     first_verdict_p95_ms=round(percentile(first_verdicts, 0.95) * 1000, 3) if first_verdicts else None)
+
+
+def bench_batch(verifier, concurrency, args, offset):
+    claims = make_claims(args.batch_size, offset)
+    samples, errors = [], 0
+    started = time.perf_counter()
+    for _, result in verifier.iter_verify(claims, max_workers=concurrency):
+        samples.append(time.perf_counter() - started)
+        errors += not result['success']
+    return summarize('batch', concurrency, samples, time.perf_counter() - started, errors,
+                     batch_size=len(claims))
+
+
+def bench_extract(base_url, concurrency, args, offset):
+    from main_beautiful import NewsURLExtractor
+
+    pages = sorted(name for name in os.listdir(CORPUS_DIR) if name.endswith('.html'))
+    # A distinct query string per request keeps URL coalescing out of the measurement
+    urls = [f"{base_url}/{pages[number % len(pages)]}?request={offset + number}" for number in range(args.requests)]
+    samples, seconds, errors = run_concurrent(lambda url: bool(NewsURLExtractor.extract_article(url).paragraphs),
+                                              urls, concurrency)
+    return summarize('extract', concurrency, samples, seconds, errors)
+
+
+def bench_parse(concurrency, args):
+    import fake_genai
+    from response_parser import parse_response
+
+    texts = [fake_genai.canned_response(claim) for claim in make_claims(50)]
+    items = [texts[number % len(texts)] for number in range(args.parse_iterations)]
+    samples, seconds, errors = run_concurrent(lambda text: parse_response(text).status is not None,
+                                              items, concurrency)
+    return summarize('parse', concurrency, samples, seconds, errors)
+
+
+# ---------- reporting ----------
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                                text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'git_commit': commit,
+    }
+
+
+def print_rows(rows):
+    header = f"{'benchmark':<10}{'conc':>6}{'ops':>7}{'err':>5}{'ops/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print('-' * len(header))
+    for row in rows:
+        print(f"{row['benchmark']:<10}{row['concurrency']:>6}{row['operations']:>7}{row['errors']:>5}"
+              f"{row['throughput_per_s']:>10.1f}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['p99_ms']:>10.2f}")
+
+
+def print_comparison(rows, baseline_path):
+    with open(baseline_path, encoding='utf-8') as handle:
+        baseline = {(row['benchmark'], row['concurrency']): row for row in json.load(handle)['results']}
+
+    def change(new, old):
+        return f"{(new - old) / old:+.1%}" if new is not None and old else 'n/a'
+
+    print(f"\nChange against {baseline_path}:")
+    print(f"{'benchmark':<10}{'conc':>6}{'ops/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}")
+    for row in rows:
+        old = baseline.get((row['benchmark'], row['concurrency']))
+        if old is None:
+            continue
+        print(f"{row['benchmark']:<10}{row['concurrency']:>6}"
+              f"{change(row['throughput_per_s'], old['throughput_per_s']):>10}"
+              f"{change(row['p50_ms'], old['p50_ms']):>10}{change(row['p95_ms'], old['p95_ms']):>10}"
+              f"{change(row['p99_ms'], old['p99_ms']):>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--concurrency', default='1,4,16', help="Comma-separated concurrency levels")
+    parser.add_argument('--requests', type=int, default=100, help="Operations per level for verify/stream/extract")
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--parse-iterations', type=int, default=5000)
+    parser.add_argument('--latency', type=float, default=0.2, help="Simulated model latency in seconds")
+    parser.add_argument('--jitter', type=float, default=0.05, help="Uniform +/- jitter on the model latency")
+    parser.add_argument('--failure-rate', type=float, default=0.0, help="Share of model calls that fail")
+    parser.add_argument('--server-delay', type=float, default=0.0, help="Delay per page from the local server")
+    parser.add_argument('--structured', action='store_true', help="Use JSON structured output on verify/batch")
+    parser.add_argument('--only', default=','.join(BENCHMARKS), help="Comma-separated benchmarks to run")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="Write the results to this JSON file")
+    parser.add_argument('--compare', help="Earlier --json output to compare against")
+    args = parser.parse_args()
+
+    levels = [int(level) for level in args.concurrency.split(',') if level.strip()]
+    selected = [name.strip() for name in args.only.split(',') if name.strip()]
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    configure_environment(args)
+    import fake_genai
+    fake_genai.install(latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate, seed=args.seed)
+    from main_beautiful import IndianNewsVerifier
+    from metrics import METRICS
+
+    verifier = IndianNewsVerifier()
+    if not verifier.is_ready:
+        print(f"❌ Engine not ready: {verifier.setup_error}", file=sys.stderr)
+        return 1
+    server = start_news_server(args.server_delay)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    rows, offset = [], 0
+    for name in selected:
+        for level in levels:
+            if name == 'verify':
+                row = bench_verify(verifier, level, args, offset)
+            elif name == 'stream':
+                row = bench_stream(verifier, level, args, offset)
+            elif name == 'batch':
+                row = bench_batch(verifier, level, args, offset)
+            elif name == 'extract':
+                row = bench_extract(base_url, level, args, offset)
+            else:
+                row = bench_parse(level, args)
+            offset += max(args.requests, args.batch_size)
+            rows.append(row)
+            print(f"✓ {name} x{level}: {row['throughput_per_s']:.1f} ops/s, p95 {row['p95_ms']:.1f} ms",
+                  file=sys.stderr)
+    server.shutdown()
+
+    print()
+    print_rows(rows)
+    if args.compare:
+        print_comparison(rows, args.compare)
+
+    if args.json:
+        report = {
+            'suite': 'offline',
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'environment': environment(),
+            'settings': {key: value for key, value in vars(args).items() if key not in ('json', 'compare')},
+            'results': rows,
+            'stages': METRICS.summary(),
+            'model_calls': fake_genai.calls,
+        }
+        with open(args.json, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+        print(f"\n📄 Results written to {args.json}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
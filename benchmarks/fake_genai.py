@@ -0,0 +1,134 @@
+"""
+Offline stand-in for google.generativeai
+========================================
+Deterministic fake used by the benchmark suite: GenerativeModel answers
+every prompt with a canned, well-formed VERIFICATION_STATUS response after
+a configurable latency with jitter. The verdict is derived from a hash of
+the prompt, so runs are repeatable; streaming and JSON output are
+supported, and usage metadata is filled in like the real SDK.
+
+install() must run before main_beautiful is imported:
+
+    import fake_genai
+    fake_genai.install(latency=0.2, jitter=0.05, seed=1)
+    import main_beautiful
+"""
+
+import json
+import random
+import sys
+import threading
+import time
+import types
+import zlib
+
+STATUSES = ('TRUE', 'FALSE', 'PARTIALLY_TRUE', 'UNVERIFIED')
+
+SECTIONS = {
+    'DETAILED_ANALYSIS': "The claim was checked against official announcements and major Indian outlets. "
+                         "No matching statement, gazette notification or press release was found.",
+    'INDIAN_CONTEXT': "Similar messages have circulated on WhatsApp before state elections and festivals.",
+    'EVIDENCE_CHECK': "PIB Fact Check and the relevant ministry website were reviewed; neither supports the claim.",
+    'RECOMMENDED_SOURCES': "- PIB Fact Check\n- Alt News\n- Boom Live",
+    'RED_FLAGS': "- No named source\n- Urgent call to forward",
+    'CONCLUSION': "Treat the claim with caution until an official source confirms it.",
+}
+
+
+class _Settings:
+    latency = 0.0
+    jitter = 0.0
+    chunk_chars = 80
+    failure_rate = 0.0
+
+
+settings = _Settings()
+_rng = random.Random(0)
+_rng_lock = threading.Lock()
+calls = 0
+
+
+class _UsageMetadata:
+    def __init__(self, prompt_tokens, output_tokens):
+        self.prompt_token_count = prompt_tokens
+        self.candidates_token_count = output_tokens
+        self.total_token_count = prompt_tokens + output_tokens
+
+
+class _Response:
+    def __init__(self, text, usage=None):
+        self.text = text
+        self.usage_metadata = usage
+
+
+def canned_response(prompt, structured=False):
+    """Well-formed answer whose verdict depends only on the prompt text"""
+    digest = zlib.crc32(prompt.encode('utf-8'))
+    status = STATUSES[digest % len(STATUSES)]
+    confidence = 55 + digest % 40
+    if structured:
+        return json.dumps(dict({'verification_status': status, 'confidence_score': confidence},
+                               **{name.lower(): text for name, text in SECTIONS.items()}))
+    return f"VERIFICATION_STATUS: {status}\nCONFIDENCE_SCORE: {confidence}\n\n" + "\n\n".join(
+        f"{name}:\n{text}" for name, text in SECTIONS.items())
+
+
+def _delay():
+    with _rng_lock:
+        seconds = settings.latency + _rng.uniform(-settings.jitter, settings.jitter)
+        fail = _rng.random() < settings.failure_rate
+    if seconds > 0:
+        time.sleep(seconds)
+    if fail:
+        raise RuntimeError("503 Service Unavailable (simulated)")
+
+
+class GenerativeModel:
+    def __init__(self, model_name, system_instruction=None, **kwargs):
+        self.model_name = model_name
+        self.system_instruction = system_instruction
+
+    def generate_content(self, prompt, stream=False, generation_config=None, request_options=None, **kwargs):
+        global calls
+        with _rng_lock:
+            calls += 1
+        structured = bool(generation_config) and generation_config.get('response_mime_type') == 'application/json'
+        text = canned_response(str(prompt), structured)
+        usage = _UsageMetadata(len(str(prompt)) // 4, len(text) // 4)
+        if not stream:
+            _delay()
+            return _Response(text, usage)
+        return self._stream(text, usage)
+
+    @staticmethod
+    def _stream(text, usage):
+        # The whole simulated latency is spent before the first chunk
+        size = settings.chunk_chars
+        pieces = [text[start:start + size] for start in range(0, len(text), size)]
+        _delay()
+        for position, piece in enumerate(pieces):
+            last = position == len(pieces) - 1
+            yield _Response(piece, usage if last else None)
+
+
+def configure(**kwargs):
+    pass
+
+
+def install(latency=0.0, jitter=0.0, chunk_chars=80, failure_rate=0.0, seed=0):
+    """Register this module as google.generativeai and set the simulated behaviour"""
+    settings.latency = latency
+    settings.jitter = min(jitter, latency)
+    settings.chunk_chars = chunk_chars
+    settings.failure_rate = failure_rate
+    _rng.seed(seed)
+
+    module = sys.modules[__name__]
+    google = sys.modules.get('google')
+    if google is None:
+        google = types.ModuleType('google')
+        google.__path__ = []
+        sys.modules['google'] = google
+    google.generativeai = module
+    sys.modules['google.generativeai'] = module
+    return module
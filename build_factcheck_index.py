@@ -0,0 +1,72 @@
+"""
+🇮🇳 INDIAN NEWS VERIFIER - FACT-CHECK INDEX BUILDER
+===================================================
+Load a crawl dump of published fact-checks into the local BM25 index
+(factcheck_index.py) that verify_news consults before the AI model.
+
+Input is JSONL or a JSON array of records with claim/title/rating/url/
+source/published/text fields, or schema.org ClaimReview objects. Each run
+appends a new segment; use --compact to merge segments afterwards.
+
+Usage:
+    python build_factcheck_index.py altnews.jsonl boomlive.jsonl
+    python build_factcheck_index.py webqoof.json --compact
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from main_beautiful import AppConfig
+from factcheck_index import FactCheckIndex
+
+
+def read_dump(path, batch_size):
+    """Yield lists of records from a JSONL or JSON-array file"""
+    with open(path, encoding='utf-8') as handle:
+        first = handle.read(1)
+        handle.seek(0)
+        if first == '[':
+            records = json.load(handle)
+            for start in range(0, len(records), batch_size):
+                yield records[start:start + batch_size]
+            return
+        batch = []
+        for line in handle:
+            line = line.strip()
+            if line:
+                batch.append(json.loads(line))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Append fact-check crawl dumps to the local retrieval index")
+    parser.add_argument('inputs', nargs='*', help="JSONL or JSON files of fact-check records")
+    parser.add_argument('--index', default=AppConfig.FACTCHECK_INDEX_DIR or 'factchecks',
+                        help="Index directory (default: %(default)s)")
+    parser.add_argument('--segment-size', type=int, default=250000,
+                        help="Documents per appended segment (default: %(default)s)")
+    parser.add_argument('--compact', action='store_true', help="Merge all segments into one when done")
+    args = parser.parse_args(argv)
+
+    index = FactCheckIndex(args.index)
+    started = time.perf_counter()
+    added = 0
+    for path in args.inputs:
+        for batch in read_dump(path, args.segment_size):
+            added += index.append(batch)
+    if args.compact:
+        index.compact()
+
+    print(f"✅ Added {added} fact-checks in {time.perf_counter() - started:.1f}s - "
+          f"{len(index)} documents in {index.segment_count} segment(s) at {args.index}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,372 @@
+"""
+MODEL RESPONSE CASSETTES
+========================
+Record/replay of model calls, for reproducing production traffic locally
+(load tests, parser changes) without an API key or network access.
+
+- Record: every completed model call is appended to a JSONL cassette as
+  prompt hash, model name, response text and latency.
+- Replay: calls are answered from the cassette, at full speed or at the
+  recorded latencies (scaled); unknown prompts raise CassetteMiss.
+- Lookups use a memory-mapped open-addressing hash table next to the
+  cassette (<cassette>.idx), so they take O(1) regardless of size.
+
+Cassette line (the hash is always written first):
+    {"hash": "<32 hex>", "model": "...", "format": "text", "text": "...",
+     "latency": 1.234, "first_chunk_latency": 0.41, "recorded_at": "..."}
+
+Index file layout (little-endian), loaded with a read-only memory map:
+    b'CASSIDX1' | uint32 header length | JSON header | padding to 64 bytes
+    | uint64 [capacity, 2] slots of (key, line offset + 1), 0 = empty
+The index covers the first `indexed_bytes` of the cassette; lines appended
+later are indexed in memory when the cassette is opened.
+
+Usage:
+    python cassette.py index .cache/cassette.jsonl
+    python cassette.py stats .cache/cassette.jsonl
+"""
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+
+import numpy as np
+
+from model_router import RequestError
+
+MAGIC = b'CASSIDX1'
+ALIGNMENT = 64
+HASH_PREFIX = b'{"hash": "'
+STREAM_CHUNK_CHARS = 80
+
+
+class CassetteMiss(RequestError):
+    """The replayed cassette has no response for this prompt"""
+
+
+def response_format(generation_config=None):
+    """'json' when structured output was requested, else 'text'"""
+    if generation_config and generation_config.get('response_mime_type') == 'application/json':
+        return 'json'
+    return 'text'
+
+
+def prompt_hash(prompt, fmt='text'):
+    """Stable 128-bit hex key of a prompt and its requested output format"""
+    return hashlib.blake2b(f"{fmt}\0{prompt}".encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _slot_key(hex_hash):
+    return int(hex_hash[:16], 16)
+
+
+class CassetteResponse:
+    """Replayed response or stream chunk with the attributes the app reads"""
+
+    __slots__ = ('text', 'usage_metadata')
+
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+
+# ============================================
+# RECORDING
+# ============================================
+
+class CassetteRecorder:
+    """Appends completed model calls to a cassette; safe across threads and processes"""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    def record(self, key, model, fmt, text, latency, first_chunk_latency=None):
+        entry = {'hash': key, 'model': model, 'format': fmt, 'text': text, 'latency': round(latency, 4)}
+        if first_chunk_latency is not None:
+            entry['first_chunk_latency'] = round(first_chunk_latency, 4)
+        entry['recorded_at'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+        # One O_APPEND write per line keeps lines whole when several processes record
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        with self._lock:
+            os.write(self._fd, line)
+            self.recorded += 1
+
+    def wrap(self, name, model):
+        return RecordingModel(name, model, self)
+
+    def close(self):
+        os.close(self._fd)
+
+
+class RecordingModel:
+    """GenerativeModel proxy that records every successful call"""
+
+    def __init__(self, name, model, recorder):
+        self.name = name
+        self.model = model
+        self.recorder = recorder
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        fmt = response_format(kwargs.get('generation_config'))
+        started = time.perf_counter()
+        if stream:
+            return self._record_stream(prompt, fmt, started,
+                                       self.model.generate_content(prompt, stream=True, **kwargs))
+        response = self.model.generate_content(prompt, **kwargs)
+        text = response.text if response is not None else None
+        if text:
+            self.recorder.record(prompt_hash(prompt, fmt), self.name, fmt, text, time.perf_counter() - started)
+        return response
+
+    def _record_stream(self, prompt, fmt, started, chunks):
+        pieces, first_chunk_latency = [], None
+        for chunk in chunks:
+            if first_chunk_latency is None:
+                first_chunk_latency = time.perf_counter() - started
+            try:
+                pieces.append(chunk.text)
+            except ValueError:
+                pass
+            yield chunk
+        # Only complete streams are recorded
+        if pieces:
+            self.recorder.record(prompt_hash(prompt, fmt), self.name, fmt, ''.join(pieces),
+                                 time.perf_counter() - started, first_chunk_latency)
+
+
+# ============================================
+# INDEX
+# ============================================
+
+def _scan(buffer, start, end):
+    """(hex hash, line offset) for every line in buffer[start:end], which ends at a newline"""
+    position = start
+    while position < end:
+        newline = buffer.find(b'\n', position, end)
+        if newline < 0:
+            break
+        head = buffer[position:position + len(HASH_PREFIX) + 32]
+        if head.startswith(HASH_PREFIX):
+            key = head[len(HASH_PREFIX):].decode('ascii')
+        else:
+            try:
+                key = json.loads(buffer[position:newline])['hash']
+            except (ValueError, KeyError):
+                key = None
+        if key:
+            yield key, position
+        position = newline + 1
+
+
+def _complete_length(buffer):
+    """Bytes up to and including the last newline (a line still being written is left out)"""
+    return buffer.rfind(b'\n') + 1
+
+
+def _map(path):
+    """Read-only memory map of a file (empty bytes for an empty file)"""
+    with open(path, 'rb') as handle:
+        if not os.fstat(handle.fileno()).st_size:
+            return b''
+        return mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def build_table(keys, offsets):
+    """Open-addressing table (linear probing) of uint64 keys; later duplicates win"""
+    keys = np.asarray(keys, dtype=np.uint64)
+    offsets = np.asarray(offsets, dtype=np.uint64)
+    # Keep the last occurrence of each key
+    _, first = np.unique(keys[::-1], return_index=True)
+    keep = len(keys) - 1 - first
+    keys, offsets = keys[keep], offsets[keep]
+
+    capacity = 1 << max(4, int(2 * max(len(keys), 1) - 1).bit_length())
+    mask = np.uint64(capacity - 1)
+    table = np.zeros((capacity, 2), dtype=np.uint64)
+
+    slots = keys & mask
+    pending = np.arange(len(keys))
+    while pending.size:
+        wanted = slots[pending]
+        free = table[wanted, 1] == 0
+        candidates, candidate_slots = pending[free], wanted[free]
+        _, first_claim = np.unique(candidate_slots, return_index=True)
+        winners = candidates[first_claim]
+        table[slots[winners], 0] = keys[winners]
+        table[slots[winners], 1] = offsets[winners] + np.uint64(1)
+
+        placed = np.zeros(len(keys), dtype=bool)
+        placed[winners] = True
+        pending = pending[~placed[pending]]
+        slots[pending] = (slots[pending] + np.uint64(1)) & mask
+    return table
+
+
+def write_index(path, table, indexed_bytes, entries):
+    header = json.dumps({'capacity': int(table.shape[0]), 'indexed_bytes': int(indexed_bytes),
+                         'entries': int(entries)}).encode('utf-8')
+    offset = len(MAGIC) + 4 + len(header)
+    padding = (-offset) % ALIGNMENT
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as handle:
+        handle.write(MAGIC + struct.pack('<I', len(header)) + header + b'\0' * padding)
+        handle.write(np.ascontiguousarray(table, dtype='<u8').tobytes())
+    os.replace(temp_path, path)
+
+
+def read_index(path):
+    """(table memmap, header) or None when missing or unreadable"""
+    try:
+        with open(path, 'rb') as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                return None
+            (header_length,) = struct.unpack('<I', handle.read(4))
+            header = json.loads(handle.read(header_length).decode('utf-8'))
+    except (OSError, ValueError, struct.error):
+        return None
+    offset = len(MAGIC) + 4 + header_length
+    offset += (-offset) % ALIGNMENT
+    table = np.memmap(path, dtype='<u8', mode='r', offset=offset, shape=(header['capacity'], 2))
+    return table, header
+
+
+def build_index(cassette_path):
+    """(Re)build <cassette>.idx over the complete lines of the cassette; returns the entry count"""
+    data = _map(cassette_path)
+    length = _complete_length(data)
+    entries = list(_scan(data, 0, length))
+    table = build_table([_slot_key(key) for key, _ in entries], [offset for _, offset in entries])
+    write_index(cassette_path + '.idx', table, length, len(entries))
+    return len(entries)
+
+
+# ============================================
+# REPLAY
+# ============================================
+
+class CassettePlayer:
+    """Read-only view of a cassette with O(1) lookups by prompt hash"""
+
+    def __init__(self, path, latency_scale=0.0, chunk_chars=STREAM_CHUNK_CHARS):
+        self.path = path
+        self.latency_scale = latency_scale
+        self.chunk_chars = chunk_chars
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._data = _map(path)
+        length = _complete_length(self._data)
+
+        loaded = read_index(path + '.idx')
+        if loaded is None or loaded[1]['indexed_bytes'] > length:
+            build_index(path)
+            loaded = read_index(path + '.idx')
+        self._table, header = loaded
+        self._mask = self._table.shape[0] - 1
+        self.entries = header['entries']
+
+        # Lines appended after the index was written
+        self._recent = {}
+        for key, offset in _scan(self._data, header['indexed_bytes'], length):
+            self._recent[key] = offset
+        self.entries += len(self._recent)
+
+    def _line(self, offset):
+        end = self._data.find(b'\n', offset)
+        return json.loads(self._data[offset:end])
+
+    def lookup(self, key):
+        """Recorded entry for a prompt hash, or None"""
+        offset = self._recent.get(key)
+        if offset is None:
+            slot_key = _slot_key(key)
+            slot = slot_key & self._mask
+            while True:
+                stored = int(self._table[slot, 1])
+                if stored == 0:
+                    break
+                if int(self._table[slot, 0]) == slot_key:
+                    offset = stored - 1
+                    break
+                slot = (slot + 1) & self._mask
+
+        entry = self._line(offset) if offset is not None else None
+        if entry is not None and entry.get('hash') != key:
+            entry = None  # 64-bit slot key collision
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return entry
+
+    def model(self, name):
+        return ReplayModel(name, self)
+
+    def stats(self):
+        with self._lock:
+            return {'entries': self.entries, 'hits': self.hits, 'misses': self.misses}
+
+
+class ReplayModel:
+    """GenerativeModel stand-in answering from a cassette"""
+
+    def __init__(self, name, player):
+        self.name = name
+        self.player = player
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        entry = self.player.lookup(prompt_hash(prompt, response_format(kwargs.get('generation_config'))))
+        if entry is None:
+            raise CassetteMiss("No recorded response for this prompt in the cassette")
+        scale = self.player.latency_scale
+        if not stream:
+            if scale:
+                time.sleep(entry['latency'] * scale)
+            return CassetteResponse(entry['text'])
+        return self._replay_stream(entry, scale)
+
+    def _replay_stream(self, entry, scale):
+        text, size = entry['text'], self.player.chunk_chars
+        pieces = [text[start:start + size] for start in range(0, len(text), size)] or ['']
+        first = entry.get('first_chunk_latency', entry['latency'])
+        between = max(entry['latency'] - first, 0.0) / len(pieces)
+        if scale:
+            time.sleep(first * scale)
+        for position, piece in enumerate(pieces):
+            if scale and position:
+                time.sleep(between * scale)
+            yield CassetteResponse(piece)
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 2 or args[0] not in ('index', 'stats'):
+        print("usage: python cassette.py index|stats <cassette.jsonl>", file=sys.stderr)
+        return 2
+    command, path = args
+    if command == 'index':
+        started = time.perf_counter()
+        entries = build_index(path)
+        print(f"✅ Indexed {entries} responses in {time.perf_counter() - started:.1f}s → {path}.idx", file=sys.stderr)
+    else:
+        player = CassettePlayer(path)
+        print(json.dumps({'entries': player.entries, 'bytes': len(player._data),
+                          'unindexed_entries': len(player._recent)}))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
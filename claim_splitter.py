@@ -0,0 +1,138 @@
+"""
+ATOMIC CLAIM SPLITTING
+======================
+Splits an extracted article into short, check-worthy claims so each one
+gets its own verdict instead of one verdict for a mix of statements.
+
+- Sentences are split on the usual terminators and the Devanagari danda;
+  compound sentences are split again at semicolons and contrastive
+  conjunctions when both halves stand on their own.
+- Check-worthiness is scored locally (no API call): figures, dates, named
+  sources and reporting verbs, and named entities raise the score;
+  questions, opinions, hedges and leading pronouns lower it; newsroom
+  boilerplate is dropped.
+- aggregate() turns per-claim verdicts into an article-level verdict and
+  a 0-100 credibility score.
+"""
+
+import re
+
+from prompt_builder import WORD_PATTERN
+from verdict_cache import normalize_claim
+
+# Unlike prompt_builder.split_sentences, a full stop inside a number ("1.6 lakh") does not end a sentence
+SENTENCE_PATTERN = re.compile(r'[^\n]+?(?:[.!?।]+(?=\s|$)|\n|$)')
+CLAUSE_PATTERN = re.compile(r';\s+|,?\s+\b(?:but|while|whereas|however)\b\s+', re.IGNORECASE)
+FIGURE_PATTERN = re.compile(r'\d|₹|%|\b(?:crore|lakh|million|billion|percent)\b|करोड़|लाख|प्रतिशत', re.IGNORECASE)
+DATE_PATTERN = re.compile(
+    r'\b(?:january|february|march|april|may|june|july|august|september|october|november|december|'
+    r'monday|tuesday|wednesday|thursday|friday|saturday|sunday|yesterday|today|tomorrow)\b|'
+    r'सोमवार|मंगलवार|बुधवार|गुरुवार|शुक्रवार|शनिवार|रविवार', re.IGNORECASE)
+SOURCE_PATTERN = re.compile(
+    r'["“”]|\b(?:said|says|according to|announced|claimed|stated|confirmed|reported|told|declared|'
+    r'launched|approved|banned|arrested|passed|ordered|killed|died)\b|'
+    r'कहा|बताया|घोषणा|अनुसार|दावा|स्पष्ट किया|मंजूरी|गिरफ्तार', re.IGNORECASE)
+OPINION_PATTERN = re.compile(
+    r'\b(?:i|we) (?:think|believe|feel)\b|\bin (?:my|our) (?:opinion|view)\b|\b(?:should|must|ought to)\b',
+    re.IGNORECASE)
+HEDGE_PATTERN = re.compile(r'\b(?:may|might|could|perhaps|possibly|likely)\b', re.IGNORECASE)
+PRONOUN_START = re.compile(r'^(?:he|she|they|it|this|that|these|those|his|her|their)\b', re.IGNORECASE)
+BOILERPLATE_PATTERN = re.compile(
+    r'\b(?:click here|also read|read more|subscribe|follow us|download the app|sign up|newsletter|'
+    r'with inputs from|all rights reserved|copyright|advertisement)\b', re.IGNORECASE)
+
+MIN_CLAIM_WORDS = 6
+MAX_CLAIM_WORDS = 60
+MIN_CHECK_WORTHINESS = 0.25
+HEADLINE_BONUS = 0.2
+
+# Share of a claim's confidence that counts towards the article score
+CREDIBILITY = {'TRUE': 1.0, 'PARTIALLY_TRUE': 0.5, 'FALSE': 0.0}
+
+
+def _sentences(text):
+    return [sentence.strip() for sentence in SENTENCE_PATTERN.findall(text or '') if sentence.strip()]
+
+
+def _clauses(sentence):
+    """Split a compound sentence where every part is long enough to be a claim of its own"""
+    parts = [part.strip(' ,') for part in CLAUSE_PATTERN.split(sentence)]
+    if len(parts) > 1 and all(len(part.split()) >= MIN_CLAIM_WORDS for part in parts):
+        return parts
+    return [sentence]
+
+
+def check_worthiness(sentence):
+    """Heuristic 0-1 score of how much a sentence states a checkable fact"""
+    if sentence.rstrip().endswith('?') or BOILERPLATE_PATTERN.search(sentence):
+        return 0.0
+    words = WORD_PATTERN.findall(sentence)
+    score = 0.0
+    if FIGURE_PATTERN.search(sentence):
+        score += 0.3
+    if DATE_PATTERN.search(sentence):
+        score += 0.1
+    if SOURCE_PATTERN.search(sentence):
+        score += 0.25
+    # Capitalized words after the first one: people, places, parties, agencies
+    entities = sum(1 for word in words[1:] if word[0].isupper())
+    score += min(entities, 3) * 0.1
+    if OPINION_PATTERN.search(sentence):
+        score -= 0.3
+    if HEDGE_PATTERN.search(sentence):
+        score -= 0.1
+    if PRONOUN_START.match(sentence):
+        # Depends on an earlier sentence, so it is hard to check on its own
+        score -= 0.15
+    return max(0.0, min(score, 1.0))
+
+
+def split_claims(title, paragraphs, max_claims=8):
+    """
+    Up to `max_claims` check-worthy claims from an article, in reading order.
+    Headline sentences get a bonus, as the headline is what gets shared;
+    near-identical claims (same normalized text) are kept once.
+    """
+    candidates = []
+    seen = set()
+    headline = _sentences(title)
+    sentences = headline + [sentence for paragraph in paragraphs or () for sentence in _sentences(paragraph)]
+    for position, sentence in enumerate(sentences):
+        bonus = HEADLINE_BONUS if position < len(headline) else 0.0
+        for clause in _clauses(sentence):
+            count = len(clause.split())
+            if count < MIN_CLAIM_WORDS or count > MAX_CLAIM_WORDS:
+                continue
+            normalized = normalize_claim(clause)
+            if normalized in seen:
+                continue
+            seen.add(normalized)
+            score = check_worthiness(clause) + bonus
+            if score >= MIN_CHECK_WORTHINESS:
+                candidates.append((score, len(candidates), clause))
+
+    chosen = sorted(candidates, key=lambda item: (-item[0], item[1]))[:max_claims]
+    return [clause for _, _, clause in sorted(chosen, key=lambda item: item[1])]
+
+
+def aggregate(results):
+    """
+    Article-level verdict from per-claim results.
+    Returns (status, confidence, score): status is TRUE or FALSE when every
+    verified claim agrees, PARTIALLY_TRUE for a mix and UNVERIFIED when no
+    claim could be verified; score is the confidence-weighted credibility
+    of the verified claims (0-100, None without any); confidence is their
+    mean confidence scaled by the share of claims that were verified.
+    """
+    verified = [result for result in results
+                if result.get('success') and result.get('status') in CREDIBILITY]
+    if not verified:
+        return 'UNVERIFIED', 0, None
+
+    statuses = {result['status'] for result in verified}
+    status = statuses.pop() if len(statuses) == 1 else 'PARTIALLY_TRUE'
+
+    weights = [max(result.get('confidence') or 0, 1) for result in verified]
+    score = sum(weight * CREDIBILITY[result['status']] for weight, result in zip(weights, verified)) / sum(weights)
+    confidence = sum(result.get('confidence') or 0 for result in verified) / len(verified)
+    return status, round(confidence * len(verified) / len(results)), round(score * 100)
@@ -0,0 +1,12 @@
+#!/bin/sh
+# Container entry point for Indian News Verifier
+# APP_MODE=ui (default) serves the Streamlit app on 8501
+# APP_MODE=api serves the headless JSON verification service on $API_PORT
+set -e
+
+if [ "$APP_MODE" = "api" ]; then
+    exec uvicorn api_service:app --host 0.0.0.0 --port "${API_PORT:-8000}" \
+        --timeout-keep-alive "${API_KEEP_ALIVE:-30}"
+fi
+
+exec streamlit run main_beautiful.py --server.port=8501 --server.address=0.0.0.0 --server.headless=true
@@ -0,0 +1,431 @@
+"""
+FACT-CHECK RETRIEVAL INDEX
+==========================
+Local BM25 index over published fact-checks (Alt News, Boom Live, The Quint
+WebQoof, PIB Fact Check, ...) loaded from a crawl dump, so a claim that has
+already been checked is recognised before the model is asked.
+
+- The index is a directory of immutable segments plus a manifest.json.
+  Appending documents writes a new segment; compact() merges them.
+- Each segment is a set of .npy arrays opened with mmap_mode='r': sorted
+  64-bit term hashes, posting offsets, doc ids (uint32), term frequencies
+  (uint16) and document lengths, plus the documents themselves as JSON
+  lines addressed by byte offset. Startup reads only the manifest.
+- Queries score postings into a reusable dense buffer per segment and take
+  the top-k with argpartition; very common terms are skipped.
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import unicodedata
+
+import numpy as np
+
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have he her his i in is it its of on or she that the their '
+    'this to was were will with after over about into also than been but who what which said says '
+    'claim claims viral video photo image post posts shared social media fact check'.split()
+)
+_NUMBER_RE = re.compile(r'\d+(?:[.,]\d+)*')
+# Words that flip a statement; a claim and a fact-check must agree on them
+_NEGATIONS = frozenset([
+    'not', 'no', 'never', 'none', 'nobody', 'nothing', 'neither', 'nor',
+    'isnt', 'wasnt', 'arent', 'werent', 'dont', 'doesnt', 'didnt', 'hasnt', 'havent',
+    'cannot', 'cant', 'wont', 'deny', 'denies', 'denied',
+    'नहीं', 'ना', 'न',
+])
+# Word characters plus the Indic blocks (U+0900-U+0DFF), whose vowel signs are not \w
+_WORD_RE = re.compile(r'[\w\u0900-\u0dff]+')
+
+# Rating words used by Indian fact-checkers, mapped to verdict statuses
+RATING_STATUS = (
+    (re.compile(r'partly|partially|half|mixed|missing context|misleading|exaggerat|out of context', re.I),
+     'PARTIALLY_TRUE'),
+    (re.compile(r'false|fake|hoax|scam|fabricat|morphed|doctored|edited|satire|incorrect|misattribut|baseless'
+                r'|\bnot\s+(?:true|correct|accurate|genuine|real)\b|\buntrue\b|\binaccurate\b', re.I),
+     'FALSE'),
+    (re.compile(r'unverified|unproven|unsubstantiated|no evidence', re.I), 'UNVERIFIED'),
+    (re.compile(r'\btrue\b|\bcorrect\b|\baccurate\b|\bgenuine\b|\bverified\b', re.I), 'TRUE'),
+)
+
+K1 = 1.2
+B = 0.75
+
+
+def rating_status(rating):
+    """Map a fact-checker's rating text to a verdict status"""
+    for pattern, status in RATING_STATUS:
+        if rating and pattern.search(rating):
+            return status
+    return 'UNVERIFIED'
+
+
+def tokenize(text):
+    """Index terms of a text: case-folded words (Indic scripts kept whole) without stopwords"""
+    words = _WORD_RE.findall(unicodedata.normalize('NFKC', text or '').casefold())
+    return [word for word in words if len(word) > 1 and word not in STOPWORDS]
+
+
+def term_hash(term, _cache={}):
+    """Stable 64-bit hash of a term"""
+    value = _cache.get(term)
+    if value is None:
+        value = int.from_bytes(hashlib.blake2b(term.encode('utf-8'), digest_size=8).digest(), 'little')
+        if len(_cache) < 500000:
+            _cache[term] = value
+    return value
+
+
+def normalize_document(record):
+    """
+    Fact-check document from a crawl dump record. Accepts flat records
+    (claim, title, rating, url, source, published, text) and schema.org
+    ClaimReview objects (claimReviewed, reviewRating, author, datePublished).
+    """
+    rating = record.get('rating') or record.get('verdict')
+    review = record.get('reviewRating')
+    if not rating and isinstance(review, dict):
+        rating = review.get('alternateName') or review.get('name')
+    source = record.get('source') or record.get('publisher')
+    author = record.get('author')
+    if not source and isinstance(author, dict):
+        source = author.get('name')
+    if isinstance(source, dict):
+        source = source.get('name')
+    return {
+        'claim': record.get('claim') or record.get('claimReviewed') or '',
+        'title': record.get('title') or record.get('headline') or '',
+        'rating': rating or '',
+        'status': rating_status(rating or ''),
+        'url': record.get('url') or '',
+        'source': source or '',
+        'published': record.get('published') or record.get('datePublished') or '',
+        'text': ' '.join((record.get('text') or '').split()[:120]),
+    }
+
+
+class FactCheckMatch:
+    """
+    A retrieved fact-check with its BM25 score. `normalized` is the score
+    relative to an average-length document containing every query term
+    once, capped at 1.0.
+    """
+
+    __slots__ = ('document', 'score', 'normalized')
+
+    def __init__(self, document, score, normalized):
+        self.document = document
+        self.score = score
+        self.normalized = normalized
+
+    def __repr__(self):
+        return f"FactCheckMatch({self.document.get('title', '')[:40]!r}, normalized={self.normalized:.2f})"
+
+
+def _negated(text):
+    """Whether a text contains a negation word"""
+    words = _WORD_RE.findall(unicodedata.normalize('NFKC', text or '').casefold().replace("'", '').replace('\u2019', ''))
+    return not _NEGATIONS.isdisjoint(words)
+
+
+def is_strong_match(claim, match, threshold=0.8):
+    """
+    Whether a match is close enough to reuse its rating: normalized score at
+    or above `threshold`, a definite rating, the claim and the reviewed
+    statement agreeing on negation, and every number in the claim present in
+    the reviewed statement or headline.
+    """
+    document = match.document
+    if match.normalized < threshold or document.get('status') == 'UNVERIFIED':
+        return False
+    # Headlines often read "No, X is not..." - the reviewed claim itself is what must agree
+    reviewed = document.get('claim') or document.get('title', '')
+    if _negated(claim) != _negated(reviewed):
+        return False
+    checked_text = f"{document.get('claim', '')} {document.get('title', '')}"
+    return set(_NUMBER_RE.findall(claim)) <= set(_NUMBER_RE.findall(checked_text))
+
+
+class _Segment:
+    """One immutable, memory-mapped segment"""
+
+    def __init__(self, directory):
+        self.directory = directory
+
+        def load(name):
+            # Plain ndarray views of the maps avoid np.memmap's per-slice overhead
+            return np.load(os.path.join(directory, f"{name}.npy"), mmap_mode='r').view(np.ndarray)
+
+        self.terms = load('terms')
+        self.offsets = load('offsets')
+        self.doc_ids = load('doc_ids')
+        self.tfs = load('tfs')
+        self.doc_lengths = load('doc_lengths')
+        self.doc_offsets = load('doc_offsets')
+        self.size = len(self.doc_lengths)
+        self._docs = open(os.path.join(directory, 'docs.jsonl'), 'rb')
+        self._docs_lock = threading.Lock()
+        self._local = threading.local()
+        self._length_norm = None
+
+    def span(self, term):
+        """(start, end) of a term hash's postings, or None"""
+        position = int(self.terms.searchsorted(term))
+        if position >= len(self.terms) or self.terms[position] != term:
+            return None
+        return int(self.offsets[position]), int(self.offsets[position + 1])
+
+    def postings(self, span):
+        """(doc_ids, tfs) of a span, doc ids ascending"""
+        start, end = span
+        return self.doc_ids[start:end], self.tfs[start:end]
+
+    def length_norm(self, average_length):
+        """BM25 length normalization per document for the current average length"""
+        cached = self._length_norm
+        if cached is None or cached[0] != average_length:
+            norm = K1 * (1 - B + B * np.asarray(self.doc_lengths, dtype=np.float32) / average_length)
+            cached = self._length_norm = (average_length, norm)
+        return cached[1]
+
+    def scores_buffer(self):
+        """Per-thread dense score buffer, reused between queries"""
+        buffer = getattr(self._local, 'scores', None)
+        if buffer is None:
+            buffer = self._local.scores = np.zeros(self.size, dtype=np.float32)
+        return buffer
+
+    def document(self, doc_id):
+        start, end = self.doc_offsets[doc_id], self.doc_offsets[doc_id + 1]
+        with self._docs_lock:
+            self._docs.seek(int(start))
+            return json.loads(self._docs.read(int(end - start)).decode('utf-8'))
+
+    def iter_documents(self):
+        with open(os.path.join(self.directory, 'docs.jsonl'), encoding='utf-8') as handle:
+            for line in handle:
+                yield json.loads(line)
+
+    def close(self):
+        self._docs.close()
+
+
+def _write_segment(directory, documents):
+    """Build and write one segment from normalized documents; returns its doc count and token total"""
+    os.makedirs(directory)
+    doc_lengths = np.zeros(len(documents), dtype=np.uint16)
+    doc_offsets = np.zeros(len(documents) + 1, dtype=np.uint64)
+    term_hashes = []
+    term_docs = []
+
+    with open(os.path.join(directory, 'docs.jsonl'), 'wb') as handle:
+        for doc_id, document in enumerate(documents):
+            line = (json.dumps(document, ensure_ascii=False) + '\n').encode('utf-8')
+            handle.write(line)
+            doc_offsets[doc_id + 1] = doc_offsets[doc_id] + len(line)
+
+            terms = tokenize(f"{document['claim']} {document['title']} {document['text']}")
+            doc_lengths[doc_id] = min(len(terms), 65535)
+            term_hashes.extend(term_hash(term) for term in terms)
+            term_docs.append(np.full(len(terms), doc_id, dtype=np.uint32))
+
+    # Group (term, doc) pairs: sort by term then doc, count runs for term frequencies
+    hashes = np.array(term_hashes, dtype=np.uint64)
+    docs = np.concatenate(term_docs) if term_docs else np.zeros(0, dtype=np.uint32)
+    order = np.lexsort((docs, hashes))
+    hashes, docs = hashes[order], docs[order]
+    new_pair = np.ones(len(hashes), dtype=bool)
+    new_pair[1:] = (hashes[1:] != hashes[:-1]) | (docs[1:] != docs[:-1])
+    pair_starts = np.flatnonzero(new_pair)
+    tfs = np.diff(np.append(pair_starts, len(hashes))).clip(max=65535).astype(np.uint16)
+    pair_hashes, doc_ids = hashes[pair_starts], docs[pair_starts]
+
+    new_term = np.ones(len(pair_hashes), dtype=bool)
+    new_term[1:] = pair_hashes[1:] != pair_hashes[:-1]
+    term_starts = np.flatnonzero(new_term)
+    offsets = np.append(term_starts, len(pair_hashes)).astype(np.int64)
+
+    for name, array in (('terms', pair_hashes[term_starts]), ('offsets', offsets), ('doc_ids', doc_ids),
+                        ('tfs', tfs), ('doc_lengths', doc_lengths), ('doc_offsets', doc_offsets)):
+        np.save(os.path.join(directory, f"{name}.npy"), array)
+    return len(documents), int(doc_lengths.sum())
+
+
+class FactCheckIndex:
+    """
+    Segmented BM25 index over fact-check documents.
+    Queries are thread-safe; appends are serialized and swap segments in atomically.
+    Terms in more than `max_df_ratio` of documents are ignored; terms in more
+    than `common_df_ratio` only add to documents already matched by rarer terms.
+    """
+
+    def __init__(self, directory, max_df_ratio=0.2, common_df_ratio=0.01):
+        self.directory = directory
+        self.max_df_ratio = max_df_ratio
+        self.common_df_ratio = common_df_ratio
+        self._lock = threading.Lock()
+        self._segments = []
+        self._manifest = {'segments': []}
+        self._total_docs = 0
+        self._total_tokens = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_manifest()
+
+    # ---------- manifest ----------
+
+    def _manifest_path(self):
+        return os.path.join(self.directory, 'manifest.json')
+
+    def _load_manifest(self):
+        try:
+            with open(self._manifest_path(), encoding='utf-8') as handle:
+                manifest = json.load(handle)
+        except (OSError, ValueError):
+            return
+        # Keep already open segments, so appends do not re-map unchanged files
+        opened = {os.path.basename(segment.directory): segment for segment in self._segments}
+        self._segments = [opened.get(entry['name']) or _Segment(os.path.join(self.directory, entry['name']))
+                          for entry in manifest['segments']]
+        self._total_docs = sum(entry['docs'] for entry in manifest['segments'])
+        self._total_tokens = sum(entry['tokens'] for entry in manifest['segments'])
+        self._manifest = manifest
+
+    def _save_manifest(self, entries):
+        temp_path = f"{self._manifest_path()}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as handle:
+            json.dump({'segments': entries, 'updated_at': time.time()}, handle)
+        os.replace(temp_path, self._manifest_path())
+
+    def __len__(self):
+        return self._total_docs
+
+    @property
+    def segment_count(self):
+        return len(self._segments)
+
+    # ---------- writing ----------
+
+    def append(self, records):
+        """Add crawl dump records as a new segment; returns the number of documents added"""
+        documents = [normalize_document(record) for record in records]
+        documents = [document for document in documents if document['claim'] or document['title']]
+        if not documents:
+            return 0
+
+        with self._lock:
+            entries = list(self._manifest['segments'])
+            name = f"seg-{int(time.time() * 1000):x}-{len(entries):04d}"
+            docs, tokens = _write_segment(os.path.join(self.directory, name), documents)
+            entries.append({'name': name, 'docs': docs, 'tokens': tokens})
+            self._save_manifest(entries)
+            self._load_manifest()
+        return len(documents)
+
+    def compact(self):
+        """
+        Merge all segments into one, keeping the latest copy of each
+        fact-check (by URL); old segment directories are removed.
+        """
+        with self._lock:
+            old_entries = list(self._manifest['segments'])
+            if not old_entries:
+                return
+            latest = {}
+            for segment in self._segments:
+                for document in segment.iter_documents():
+                    latest[document['url'] or document['claim'] or document['title']] = document
+            documents = list(latest.values())
+            name = f"seg-{int(time.time() * 1000):x}-merged"
+            docs, tokens = _write_segment(os.path.join(self.directory, name), documents)
+            self._save_manifest([{'name': name, 'docs': docs, 'tokens': tokens}])
+            self._load_manifest()
+        # Queries still running keep their memory maps; the files go once they finish
+        for entry in old_entries:
+            shutil.rmtree(os.path.join(self.directory, entry['name']), ignore_errors=True)
+
+    # ---------- querying ----------
+
+    def search(self, query, k=5):
+        """Top-k FactCheckMatch objects for a claim, best first"""
+        segments = self._segments
+        total_docs = self._total_docs
+        if not segments or not total_docs:
+            return []
+        average_length = self._total_tokens / total_docs
+
+        # Global document frequencies, then rarest (highest idf) terms first
+        terms = []
+        ceiling = 0.0
+        for value in dict.fromkeys(term_hash(term) for term in tokenize(query)):
+            term = np.uint64(value)
+            spans = [segment.span(term) for segment in segments]
+            df = sum(end - start for start, end in filter(None, spans))
+            idf = float(np.log(1 + (total_docs - df + 0.5) / (df + 0.5)))
+            # Score of an average-length document containing every query term once,
+            # counting terms the index has never seen (at the highest idf) and
+            # terms too common to score
+            ceiling += idf
+            if 0 < df <= max(self.max_df_ratio * total_docs, 100):
+                terms.append((idf, df, spans))
+        if not terms:
+            return []
+        terms.sort(key=lambda item: -item[0])
+        common_df = max(self.common_df_ratio * total_docs, 1000)
+        has_rare = terms[0][1] <= common_df
+
+        candidates = []
+        for position, segment in enumerate(segments):
+            scores = segment.scores_buffer()
+            length_norm = segment.length_norm(average_length)
+            touched = []
+            matched = None
+            for idf, df, spans in terms:
+                if spans[position] is None:
+                    continue
+                doc_ids, tfs = segment.postings(spans[position])
+                if has_rare and df > common_df:
+                    # Common term: only refine documents that rarer terms already matched,
+                    # found by binary search in the doc-sorted postings
+                    if matched is None:
+                        matched = np.unique(np.concatenate(touched)) if touched else touched
+                    if not len(matched):
+                        break
+                    positions = np.searchsorted(doc_ids, matched).clip(max=len(doc_ids) - 1)
+                    hit = doc_ids[positions] == matched
+                    doc_ids, tfs = matched[hit], tfs[positions[hit]]
+                else:
+                    touched.append(doc_ids)
+                tf = tfs.astype(np.float32)
+                scores[doc_ids] += idf * tf * (K1 + 1) / (tf + length_norm[doc_ids])
+            if not touched:
+                continue
+            if matched is None:
+                matched = np.unique(np.concatenate(touched)) if len(touched) > 1 else touched[0]
+            touched = matched
+            touched_scores = scores[touched]
+            scores[touched] = 0.0  # leave the buffer clean for the next query
+            if len(touched) > k:
+                best = np.argpartition(-touched_scores, k)[:k]
+            else:
+                best = np.arange(len(touched))
+            candidates.extend((float(touched_scores[i]), segment, int(touched[i])) for i in best)
+
+        candidates.sort(key=lambda item: -item[0])
+        return [FactCheckMatch(segment.document(doc_id), score, min(score / ceiling, 1.0))
+                for score, segment, doc_id in candidates[:k]]
+
+    def strong_match(self, claim, threshold=0.8):
+        """Best match if its rating can be reused directly (see is_strong_match), else None"""
+        matches = self.search(claim, k=1)
+        if matches and is_strong_match(claim, matches[0], threshold):
+            return matches[0]
+        return None
+
+    def close(self):
+        for segment in self._segments:
+            segment.close()
@@ -0,0 +1,535 @@
+"""
+FEED MONITOR
+============
+Polls the RSS/Atom feeds and news sitemaps of trusted outlets and verifies
+new stories before anyone submits them, so their verdicts are already in
+the verdict cache when users submit the story's URL.
+
+- Feeds are discovered per outlet (feed links on the homepage, news
+  sitemaps listed in robots.txt) and can be added directly as a watchlist.
+- Feeds are fetched with conditional GETs (ETag / Last-Modified through the
+  fetcher's disk cache); a body whose hash has not changed since the last
+  poll is not parsed again.
+- Stories are deduplicated by canonical URL (fragment and tracking
+  parameters removed) and by a hash of the extracted article text, so a
+  syndicated story published under several URLs is verified once.
+- New stories are verified most widely covered first (similar headlines
+  across outlets), then newest first, and at most `budget_per_hour` per hour.
+- State lives in SQLite (WAL mode): a restart resumes where it left off and
+  several app processes can share the work, as each feed poll and each
+  story is claimed atomically. A claimed story's lease is renewed while it
+  is being verified; a verifier that lost its lease cannot record a result.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from verdict_cache import normalize_claim
+
+PENDING, RUNNING, VERIFIED, FAILED, SKIPPED = 'pending', 'running', 'verified', 'failed', 'skipped'
+STORY_STATES = (PENDING, RUNNING, VERIFIED, FAILED, SKIPPED)
+
+FEED_CONTENT_TYPES = ('application/rss+xml', 'application/atom+xml', 'application/rdf+xml',
+                      'application/xml', 'text/xml')
+URL_PATTERN = re.compile(r'https?://\S+')
+TRACKING_PARAM = re.compile(r'^(?:utm_\w+|fbclid|gclid|ref|cmpid|from)$', re.IGNORECASE)
+
+# Items of a sitemap index that are fetched per poll (newest first)
+MAX_CHILD_SITEMAPS = 2
+# Headlines sharing this share of their words count as the same story (trending)
+TRENDING_OVERLAP = 0.5
+TRENDING_CANDIDATES = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS outlets (
+    homepage TEXT PRIMARY KEY,
+    next_discovery_at REAL NOT NULL DEFAULT 0,
+    feeds INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS feeds (
+    url TEXT PRIMARY KEY,
+    outlet TEXT NOT NULL,
+    next_poll_at REAL NOT NULL DEFAULT 0,
+    body_hash TEXT,
+    polled_at REAL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS stories (
+    url TEXT PRIMARY KEY,
+    outlet TEXT NOT NULL,
+    title TEXT,
+    published REAL,
+    seen_at REAL NOT NULL,
+    state TEXT NOT NULL,
+    claimed_at REAL,
+    worker TEXT,
+    finished_at REAL,
+    content_hash TEXT,
+    status TEXT,
+    confidence INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_stories_state_seen ON stories (state, seen_at);
+CREATE INDEX IF NOT EXISTS idx_stories_content_hash ON stories (content_hash);
+CREATE INDEX IF NOT EXISTS idx_stories_finished_at ON stories (finished_at);
+"""
+
+
+class FeedItem:
+    """One story link from a feed or sitemap"""
+
+    __slots__ = ('url', 'title', 'published')
+
+    def __init__(self, url, title=None, published=None):
+        self.url = url
+        self.title = title
+        self.published = published
+
+
+def canonical_url(url):
+    """URL without fragment and tracking parameters, with a lower-case host"""
+    parts = urlsplit(url.strip())
+    query = urlencode([(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+                       if not TRACKING_PARAM.match(key)])
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+
+
+def outlet_homepages(sources):
+    """Homepage URLs from entries like "📺 NDTV - https://www.ndtv.com" """
+    return [match.group(0).rstrip('/') for source in sources for match in URL_PATTERN.finditer(source)]
+
+
+def parse_time(value):
+    """Epoch seconds from an RFC 822 (RSS) or ISO 8601 (Atom, sitemaps) date, or None"""
+    value = (value or '').strip()
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        try:
+            parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def _local(tag):
+    """Tag name without its namespace"""
+    return tag.rsplit('}', 1)[-1].lower() if isinstance(tag, str) else ''
+
+
+def _entry_fields(element):
+    """(link, title, date) of an RSS item, Atom entry or sitemap url element"""
+    link = title = date = None
+    for child in element.iter():
+        name = _local(child.tag)
+        if name in ('link', 'loc') and link is None:
+            href = child.get('href')
+            if href is not None and child.get('rel', 'alternate') != 'alternate':
+                continue
+            link = (href or child.text or '').strip() or None
+        elif name == 'title' and title is None:
+            title = (child.text or '').strip() or None
+        elif name in ('pubdate', 'published', 'publication_date', 'date', 'updated', 'lastmod') and date is None:
+            date = parse_time(child.text)
+    return link, title, date
+
+
+def parse_feed(body):
+    """
+    Parse RSS, RDF, Atom or a sitemap. Returns (items, sitemaps): story
+    links, and for a sitemap index the child sitemap URLs, newest first.
+    """
+    from lxml import etree
+
+    parser = etree.XMLParser(recover=True, resolve_entities=False, no_network=True, remove_comments=True)
+    try:
+        root = etree.fromstring(body, parser=parser)
+    except etree.XMLSyntaxError:
+        return [], []
+    if root is None:
+        return [], []
+
+    if _local(root.tag) == 'sitemapindex':
+        children = [_entry_fields(element) for element in root if _local(element.tag) == 'sitemap']
+        children.sort(key=lambda fields: fields[2] or 0, reverse=True)
+        return [], [link for link, _, _ in children if link]
+
+    items = []
+    for element in root.iter():
+        if _local(element.tag) in ('item', 'entry', 'url'):
+            link, title, date = _entry_fields(element)
+            if link and link.startswith(('http://', 'https://')):
+                items.append(FeedItem(link, title, date))
+    return items, []
+
+
+def discover_feeds(fetch, homepage):
+    """Feed links advertised on an outlet's homepage and news sitemaps listed in its robots.txt"""
+    from lxml import html
+
+    feeds = []
+    try:
+        page = fetch(homepage)
+        document = html.fromstring(page.body)
+        for link in document.iterfind('.//link'):
+            if (link.get('rel') or '').lower() == 'alternate' and \
+                    (link.get('type') or '').lower() in ('application/rss+xml', 'application/atom+xml'):
+                feeds.append(urljoin(page.final_url or homepage, link.get('href') or ''))
+    except Exception:
+        pass
+    try:
+        robots = fetch(urljoin(homepage + '/', '/robots.txt')).body.decode('utf-8', 'replace')
+        for line in robots.splitlines():
+            key, _, value = line.partition(':')
+            # Full sitemaps list every article ever published; news sitemaps only recent ones
+            if key.strip().lower() == 'sitemap' and 'news' in value.lower():
+                feeds.append(value.strip())
+    except Exception:
+        pass
+    return list(dict.fromkeys(feed for feed in feeds if feed.startswith(('http://', 'https://'))))
+
+
+def _title_words(title):
+    return frozenset(word for word in normalize_claim(title or '').split() if len(word) > 3)
+
+
+class FeedMonitor:
+    """
+    Background feed polling and pre-verification.
+
+    `fetch(url)` returns a fetcher page (body, final_url, from_cache) and
+    should revalidate on every call; `extract(url)` returns an extracted
+    article (title, paragraphs); `verify(article)` returns a result dict.
+    """
+
+    def __init__(self, path, fetch, extract, verify, homepages=(), feeds=(), poll_interval=300,
+                 budget_per_hour=30, max_age=24 * 3600, workers=1, max_items_per_feed=50,
+                 rediscover_interval=24 * 3600, lease=600, tick=5.0):
+        self.path = path
+        self.fetch = fetch
+        self.extract = extract
+        self.verify = verify
+        self.poll_interval = poll_interval
+        self.budget_per_hour = budget_per_hour
+        self.max_age = max_age
+        self.workers = workers
+        self.max_items_per_feed = max_items_per_feed
+        self.rediscover_interval = rediscover_interval
+        self.lease = lease
+        self.tick = tick
+        # Feeds rarely keep items longer than this, so older URLs cannot come back
+        self.retention = max(7 * 24 * 3600, 2 * max_age)
+
+        self._local = threading.local()
+        self._stopped = threading.Event()
+        self._threads = []
+        self._last_prune = 0.0
+        # Stories this process is verifying: url -> worker
+        self._held = {}
+        self._held_lock = threading.Lock()
+        self.polls = 0
+        self.not_modified = 0
+        self.unchanged = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        if 'worker' not in {row[1] for row in conn.execute('PRAGMA table_info(stories)')}:
+            # State files from before story leases were owned
+            conn.execute('ALTER TABLE stories ADD COLUMN worker TEXT')
+        conn.executemany('INSERT OR IGNORE INTO outlets (homepage) VALUES (?)', [(page,) for page in homepages])
+        conn.executemany('INSERT OR IGNORE INTO feeds (url, outlet) VALUES (?, ?)',
+                         [(feed, urlsplit(feed).netloc) for feed in feeds])
+
+    def _connection(self):
+        """Per-thread SQLite connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    # ---------- threads ----------
+
+    def start(self):
+        """Start the poller and verifier threads (once)"""
+        if self._threads:
+            return self
+        targets = [('feed-poller', self._poll_loop), ('feed-heartbeat', self._heartbeat)]
+        targets += [(f'feed-verifier-{number + 1}', self._verify_loop) for number in range(self.workers)]
+        for name, target in targets:
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout=None):
+        """Let the threads finish their current feed or story and exit"""
+        self._stopped.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _poll_loop(self):
+        while not self._stopped.is_set():
+            try:
+                self.poll_once()
+            except sqlite3.Error:
+                pass
+            self._stopped.wait(self.tick)
+
+    def _verify_loop(self):
+        worker = f"{os.getpid()}:{threading.current_thread().name}"
+        while not self._stopped.is_set():
+            try:
+                story = self._next_story(worker)
+                if story is not None:
+                    self._verify(worker, *story)
+                    continue
+            except sqlite3.Error:
+                pass
+            self._stopped.wait(self.tick)
+
+    def _heartbeat(self):
+        interval = min(self.lease / 3, 30.0)
+        while not self._stopped.wait(interval):
+            try:
+                self.renew_leases()
+            except sqlite3.Error:
+                pass
+
+    def renew_leases(self):
+        """Push the lease of every story this process is verifying forward; returns the number renewed"""
+        with self._held_lock:
+            held = list(self._held.items())
+        now = time.time()
+        conn = self._connection()
+        return sum(conn.execute('UPDATE stories SET claimed_at = ? WHERE url = ? AND worker = ? AND state = ?',
+                                (now, url, worker, RUNNING)).rowcount for url, worker in held)
+
+    # ---------- polling ----------
+
+    def poll_once(self):
+        """Discover feeds for due outlets and poll every due feed; returns the number of new stories"""
+        now = time.time()
+        conn = self._connection()
+        for (homepage,) in conn.execute(
+                'SELECT homepage FROM outlets WHERE next_discovery_at <= ?', (now,)).fetchall():
+            # Claiming by moving the due time lets several processes share one state file
+            if conn.execute('UPDATE outlets SET next_discovery_at = ? WHERE homepage = ? AND next_discovery_at <= ?',
+                            (now + self.rediscover_interval, homepage, now)).rowcount:
+                self._discover(homepage)
+
+        added = 0
+        for url, outlet, body_hash in conn.execute(
+                'SELECT url, outlet, body_hash FROM feeds WHERE next_poll_at <= ?', (now,)).fetchall():
+            if conn.execute('UPDATE feeds SET next_poll_at = ? WHERE url = ? AND next_poll_at <= ?',
+                            (now + self.poll_interval, url, now)).rowcount:
+                added += self._poll(url, outlet, body_hash)
+        self._prune(now)
+        return added
+
+    def _discover(self, homepage):
+        feeds = discover_feeds(self.fetch, homepage)
+        conn = self._connection()
+        conn.executemany('INSERT OR IGNORE INTO feeds (url, outlet) VALUES (?, ?)',
+                         [(feed, urlsplit(homepage).netloc) for feed in feeds])
+        conn.execute('UPDATE outlets SET feeds = ? WHERE homepage = ?', (len(feeds), homepage))
+
+    def _poll(self, url, outlet, body_hash):
+        """Fetch one feed and record its new stories"""
+        conn = self._connection()
+        self.polls += 1
+        try:
+            page = self.fetch(url)
+        except Exception as e:
+            conn.execute('UPDATE feeds SET polled_at = ?, error = ? WHERE url = ?', (time.time(), str(e)[:300], url))
+            return 0
+        if page.from_cache:
+            self.not_modified += 1
+
+        # Also catches servers without validators that resend the same body
+        digest = hashlib.sha256(page.body).hexdigest()
+        conn.execute('UPDATE feeds SET polled_at = ?, error = NULL, body_hash = ? WHERE url = ?',
+                     (time.time(), digest, url))
+        if digest == body_hash:
+            self.unchanged += 1
+            return 0
+
+        items, sitemaps = parse_feed(page.body)
+        for child in sitemaps[:MAX_CHILD_SITEMAPS]:
+            try:
+                items += parse_feed(self.fetch(child).body)[0]
+            except Exception:
+                continue
+        return self._add_stories(outlet, items)
+
+    def _add_stories(self, outlet, items):
+        """Insert stories not seen before (by canonical URL) that are recent enough"""
+        now = time.time()
+        cutoff = now - self.max_age
+        fresh = [item for item in items if item.published is None or item.published >= cutoff]
+        fresh.sort(key=lambda item: item.published or now, reverse=True)
+        conn = self._connection()
+        before = conn.total_changes
+        conn.executemany(
+            'INSERT OR IGNORE INTO stories (url, outlet, title, published, seen_at, state) VALUES (?, ?, ?, ?, ?, ?)',
+            [(canonical_url(item.url), outlet, item.title, item.published, now, PENDING)
+             for item in fresh[:self.max_items_per_feed]]
+        )
+        return conn.total_changes - before
+
+    # ---------- pre-verification ----------
+
+    def budget_used(self, now=None):
+        """Stories verified (or being verified) in the last hour"""
+        now = time.time() if now is None else now
+        conn = self._connection()
+        finished = conn.execute('SELECT COUNT(*) FROM stories WHERE finished_at >= ? AND state IN (?, ?)',
+                                (now - 3600, VERIFIED, FAILED)).fetchone()[0]
+        running = conn.execute('SELECT COUNT(*) FROM stories WHERE state = ?', (RUNNING,)).fetchone()[0]
+        return finished + running
+
+    def _next_story(self, worker):
+        """Claim the most trending pending story within the hourly budget for `worker`; returns (url, title) or None"""
+        now = time.time()
+        conn = self._connection()
+        conn.execute('UPDATE stories SET state = ? WHERE state = ? AND claimed_at < ?', (PENDING, RUNNING, now - self.lease))
+        conn.execute("UPDATE stories SET state = ?, error = 'too old' WHERE state = ? AND COALESCE(published, seen_at) < ?",
+                     (SKIPPED, PENDING, now - self.max_age))
+        if self.budget_used(now) >= self.budget_per_hour:
+            return None
+
+        candidates = conn.execute(
+            'SELECT url, outlet, title FROM stories WHERE state = ? '
+            'ORDER BY COALESCE(published, seen_at) DESC LIMIT ?', (PENDING, TRENDING_CANDIDATES)
+        ).fetchall()
+        for url, _, title in self._rank(candidates, now):
+            if conn.execute('UPDATE stories SET state = ?, claimed_at = ?, worker = ? WHERE url = ? AND state = ?',
+                            (RUNNING, now, worker, url, PENDING)).rowcount:
+                return url, title
+        return None
+
+    def _rank(self, candidates, now):
+        """Order candidates by the number of outlets carrying a similar headline, then by recency"""
+        recent = [(outlet, _title_words(title)) for outlet, title in self._connection().execute(
+            'SELECT outlet, title FROM stories WHERE seen_at >= ? AND title IS NOT NULL', (now - self.max_age,))]
+
+        def coverage(candidate):
+            words = _title_words(candidate[2])
+            if not words:
+                return 0
+            return len({outlet for outlet, other in recent
+                        if len(words & other) >= TRENDING_OVERLAP * max(len(words), len(other))})
+
+        ranked = sorted(enumerate(candidates), key=lambda item: (-coverage(item[1]), item[0]))
+        return [candidate for _, candidate in ranked]
+
+    def _verify(self, worker, url, title):
+        """Extract and verify one story, skipping text verified or being verified under another URL"""
+        with self._held_lock:
+            self._held[url] = worker
+        try:
+            try:
+                article = self.extract(url)
+            except Exception as e:
+                return self._finish(url, worker, SKIPPED, error=f"{type(e).__name__}: {e}"[:300])
+            if not article.paragraphs:
+                return self._finish(url, worker, SKIPPED, error='no article text')
+
+            content_hash = hashlib.sha256(
+                normalize_claim(' '.join([article.title or title or ''] + list(article.paragraphs))).encode('utf-8')
+            ).hexdigest()
+            duplicate = self._claim_content(url, worker, content_hash)
+            if duplicate is not None:
+                return self._finish(url, worker, SKIPPED, content_hash=content_hash, error=f'same text as {duplicate}')
+
+            try:
+                result = self.verify(article)
+            except Exception as e:
+                return self._finish(url, worker, FAILED, content_hash=content_hash,
+                                    error=f"{type(e).__name__}: {e}"[:300])
+            if not result.get('success'):
+                return self._finish(url, worker, FAILED, content_hash=content_hash,
+                                    error=(result.get('analysis') or '')[:300])
+            self._finish(url, worker, VERIFIED, content_hash=content_hash, status=result.get('status'),
+                         confidence=result.get('confidence'))
+        finally:
+            with self._held_lock:
+                self._held.pop(url, None)
+
+    def _claim_content(self, url, worker, content_hash):
+        """
+        Record the story's text hash unless the same text is verified or being
+        verified under another URL; returns that URL, or None once recorded
+        """
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            duplicate = conn.execute('SELECT url FROM stories WHERE content_hash = ? AND state IN (?, ?) AND url != ? '
+                                     'LIMIT 1', (content_hash, VERIFIED, RUNNING, url)).fetchone()
+            if duplicate is None:
+                conn.execute('UPDATE stories SET content_hash = ? WHERE url = ? AND worker = ? AND state = ?',
+                             (content_hash, url, worker, RUNNING))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return duplicate[0] if duplicate is not None else None
+
+    def _finish(self, url, worker, state, content_hash=None, status=None, confidence=None, error=None):
+        """Record the outcome if `worker` still holds the story's lease; returns whether it did"""
+        return self._connection().execute(
+            'UPDATE stories SET state = ?, finished_at = ?, content_hash = ?, status = ?, confidence = ?, error = ? '
+            'WHERE url = ? AND worker = ? AND state = ?',
+            (state, time.time(), content_hash, status, confidence, error, url, worker, RUNNING)
+        ).rowcount == 1
+
+    def _prune(self, now):
+        """Forget stories older than the retention period (at most once an hour)"""
+        if now - self._last_prune < 3600:
+            return
+        self._last_prune = now
+        self._connection().execute('DELETE FROM stories WHERE seen_at < ? AND state != ?',
+                                   (now - self.retention, RUNNING))
+
+    # ---------- reporting ----------
+
+    def recent(self, limit=10):
+        """Latest pre-verified stories as dicts (url, title, status, confidence, verified_at)"""
+        rows = self._connection().execute(
+            'SELECT url, title, status, confidence, finished_at FROM stories WHERE state = ? '
+            'ORDER BY finished_at DESC LIMIT ?', (VERIFIED, limit))
+        return [{'url': url, 'title': title, 'status': status, 'confidence': confidence,
+                 'verified_at': datetime.fromtimestamp(finished_at).isoformat(timespec='seconds')}
+                for url, title, status, confidence, finished_at in rows]
+
+    def stats(self):
+        """Feed and story counts, poll outcomes and budget use"""
+        conn = self._connection()
+        counts = dict(conn.execute('SELECT state, COUNT(*) FROM stories GROUP BY state').fetchall())
+        feeds, failing = conn.execute('SELECT COUNT(*), COUNT(error) FROM feeds').fetchone()
+        return {
+            'outlets': conn.execute('SELECT COUNT(*) FROM outlets').fetchone()[0],
+            'feeds': feeds,
+            'failing_feeds': failing,
+            'stories': {state: counts.get(state, 0) for state in STORY_STATES},
+            'polls': self.polls,
+            'not_modified': self.not_modified,
+            'unchanged': self.unchanged,
+            'budget_per_hour': self.budget_per_hour,
+            'budget_used': self.budget_used(),
+        }
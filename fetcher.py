@@ -0,0 +1,296 @@
+"""
+NEWS PAGE FETCHER
+=================
+Shared HTTP fetcher for the "News URL" input and other page downloads.
+
+- One pooled requests.Session with retries (429/5xx, honouring Retry-After)
+- Separate connect/read timeouts plus an overall download deadline
+- Streamed download capped at `max_bytes` (larger pages are truncated)
+  and `total_timeout`; a page cut short by the deadline is not cached, so
+  the next fetch downloads it again instead of revalidating the stub
+- Content-Type allow-list, so PDFs, images and videos are rejected early
+- On-disk HTTP cache: recent copies are served without touching the network,
+  older ones are revalidated with If-None-Match / If-Modified-Since
+- Per-domain concurrency limits, so one slow portal cannot take every worker
+- Only public hosts: every URL, including each redirect target, is resolved
+  before connecting and refused if it points at a loopback, private,
+  link-local (cloud metadata) or otherwise non-global address
+"""
+
+import hashlib
+import ipaddress
+import json
+import os
+import socket
+import threading
+import time
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+
+
+class FetchError(Exception):
+    """A page could not be fetched or was not acceptable"""
+
+
+class FetchedPage:
+    """Downloaded page body and the metadata the extractors need"""
+
+    __slots__ = ('url', 'final_url', 'status_code', 'content_type', 'body', 'from_cache', 'truncated')
+
+    def __init__(self, url, final_url, status_code, content_type, body, from_cache=False, truncated=False):
+        self.url = url
+        self.final_url = final_url
+        self.status_code = status_code
+        self.content_type = content_type
+        self.body = body
+        self.from_cache = from_cache
+        self.truncated = truncated
+
+
+def check_public_url(url):
+    """
+    Raise FetchError unless `url` is http(s) and every address its host
+    resolves to is globally routable.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise FetchError("Only http(s) URLs can be fetched")
+    try:
+        port = parts.port or (443 if parts.scheme == 'https' else 80)
+        addresses = socket.getaddrinfo(parts.hostname, port, proto=socket.IPPROTO_TCP)
+    except (ValueError, OSError):
+        raise FetchError(f"Could not resolve {parts.hostname}")
+    for *_, sockaddr in addresses:
+        address = ipaddress.ip_address(sockaddr[0].split('%', 1)[0])
+        if address.version == 6 and address.ipv4_mapped is not None:
+            address = address.ipv4_mapped
+        if not address.is_global or address.is_multicast:
+            raise FetchError(f"Refusing to fetch {parts.hostname}: it resolves to a non-public address")
+
+
+class HTTPDiskCache:
+    """
+    One metadata JSON file and one body file per URL.
+    Writes are atomic, so several processes can share the directory.
+    """
+
+    def __init__(self, directory, max_entries=2000):
+        self.directory = directory
+        self.max_entries = max_entries
+        self._writes = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, url):
+        digest = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        base = os.path.join(self.directory, digest)
+        return f"{base}.json", f"{base}.body"
+
+    def load(self, url):
+        """Return (meta, body) or None"""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding='utf-8') as handle:
+                meta = json.load(handle)
+            with open(body_path, 'rb') as handle:
+                body = handle.read()
+        except (OSError, ValueError):
+            return None
+        return meta, body
+
+    def store(self, url, meta, body):
+        """Write an entry atomically"""
+        meta_path, body_path = self._paths(url)
+        for path, data, mode in ((body_path, body, 'wb'), (meta_path, json.dumps(meta), 'w')):
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, mode) as handle:
+                handle.write(data)
+            os.replace(temp_path, path)
+
+        self._writes += 1
+        if self._writes % 100 == 0:
+            self.prune()
+
+    def touch(self, url, **updates):
+        """Update metadata fields of an existing entry"""
+        entry = self.load(url)
+        if entry is not None:
+            meta, body = entry
+            meta.update(updates)
+            self.store(url, meta, body)
+
+    def prune(self):
+        """Drop the oldest entries beyond max_entries"""
+        try:
+            metas = [entry for entry in os.scandir(self.directory) if entry.name.endswith('.json')]
+        except OSError:
+            return
+        if len(metas) <= self.max_entries:
+            return
+        metas.sort(key=lambda entry: entry.stat().st_mtime)
+        for entry in metas[:len(metas) - self.max_entries]:
+            for path in (entry.path, entry.path[:-len('.json')] + '.body'):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+class NewsFetcher:
+    """Pooled, bounded, cache-aware page fetcher; safe to share between threads"""
+
+    def __init__(self, cache_dir=None, max_bytes=2 * 1024 * 1024, connect_timeout=5.0, read_timeout=15.0,
+                 total_timeout=30.0, per_domain_limit=4, pool_size=32, retries=2, fresh_seconds=600,
+                 content_types=DEFAULT_CONTENT_TYPES, user_agent='Mozilla/5.0', max_redirects=5,
+                 allow_private_hosts=False):
+        self.max_bytes = max_bytes
+        self.timeout = (connect_timeout, read_timeout)
+        self.total_timeout = total_timeout
+        self.per_domain_limit = per_domain_limit
+        self.fresh_seconds = fresh_seconds
+        self.content_types = tuple(content_types)
+        self.max_redirects = max_redirects
+        self.allow_private_hosts = allow_private_hosts
+        self.cache = HTTPDiskCache(cache_dir) if cache_dir else None
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._domain_slots = {}
+        self._domain_lock = threading.Lock()
+
+    def fetch(self, url):
+        """Fetch a page, using the disk cache when possible; raises FetchError"""
+        cached = self.cache.load(url) if self.cache else None
+        if cached is not None:
+            meta, body = cached
+            if time.time() - meta.get('validated_at', 0) < self.fresh_seconds:
+                return self._page_from_cache(url, meta, body)
+
+        headers = {}
+        if cached is not None:
+            meta = cached[0]
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+        with self._domain_slot(url):
+            response = self._get(url, headers)
+            try:
+                if response.status_code == 304 and cached is not None:
+                    self.cache.touch(url, validated_at=time.time())
+                    return self._page_from_cache(url, *cached)
+
+                if response.status_code >= 400:
+                    raise FetchError(f"HTTP {response.status_code} from {urlsplit(url).netloc}")
+
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+                if content_type and not content_type.startswith(self.content_types):
+                    raise FetchError(f"Unsupported content type: {content_type}")
+
+                body, truncated, timed_out = self._read_capped(response)
+            finally:
+                response.close()
+
+        if (self.cache is not None and not timed_out
+                and 'no-store' not in response.headers.get('Cache-Control', '')):
+            self.cache.store(url, {
+                'final_url': response.url,
+                'status_code': response.status_code,
+                'content_type': content_type,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'truncated': truncated,
+                'validated_at': time.time()
+            }, body)
+
+        return FetchedPage(url, response.url, response.status_code, content_type, body, truncated=truncated)
+
+    def _get(self, url, headers):
+        """GET with redirects followed by hand, checking every hop's host before connecting"""
+        for _ in range(self.max_redirects + 1):
+            if not self.allow_private_hosts:
+                check_public_url(url)
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True,
+                                            allow_redirects=False)
+            except requests.RequestException as e:
+                raise FetchError(f"Request failed: {str(e)}")
+            if not response.is_redirect:
+                return response
+            url = urljoin(url, response.headers['Location'])
+            response.close()
+        raise FetchError(f"Too many redirects (more than {self.max_redirects})")
+
+    def _read_capped(self, response):
+        """
+        Stream the body up to max_bytes and total_timeout.
+        Returns (body, truncated, timed_out); timed_out means the deadline cut it short.
+        """
+        declared = response.headers.get('Content-Length')
+        if declared and declared.isdigit() and int(declared) > self.max_bytes * 4:
+            raise FetchError(f"Page too large ({int(declared) // 1024} KB)")
+
+        deadline = time.monotonic() + self.total_timeout
+        chunks = []
+        received = 0
+        for chunk in response.iter_content(chunk_size=16384):
+            chunks.append(chunk)
+            received += len(chunk)
+            if received >= self.max_bytes:
+                return b''.join(chunks)[:self.max_bytes], True, False
+            if time.monotonic() > deadline:
+                if not received:
+                    raise FetchError("Download timed out")
+                return b''.join(chunks), True, True
+        return b''.join(chunks), False, False
+
+    @staticmethod
+    def _page_from_cache(url, meta, body):
+        return FetchedPage(url, meta.get('final_url', url), meta.get('status_code', 200),
+                           meta.get('content_type', ''), body, from_cache=True,
+                           truncated=meta.get('truncated', False))
+
+    def _domain_slot(self, url):
+        """Semaphore limiting concurrent requests per host"""
+        host = urlsplit(url).netloc.lower()
+        with self._domain_lock:
+            slot = self._domain_slots.get(host)
+            if slot is None:
+                slot = self._domain_slots[host] = _DomainSlot(self.per_domain_limit, sum(self.timeout))
+        return slot
+
+
+class _DomainSlot:
+    """Context manager around a bounded semaphore with an acquire timeout"""
+
+    def __init__(self, limit, wait_seconds):
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._wait_seconds = wait_seconds
+
+    def __enter__(self):
+        if not self._semaphore.acquire(timeout=self._wait_seconds):
+            raise FetchError("Too many concurrent requests to this site, please retry")
+        return self
+
+    def __exit__(self, *exc_info):
+        self._semaphore.release()
+        return False
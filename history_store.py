@@ -0,0 +1,272 @@
+"""
+VERIFICATION HISTORY
+====================
+Append-only record of every verification, for audits and for warming the
+verdict caches after a restart or on a new host.
+
+- SQLite (WAL mode) with indexes on time, status and claim hash; rows are
+  only ever inserted.
+- Full-text search over claims with FTS5 (falls back to LIKE when the
+  SQLite build has no FTS5).
+- Exports stream NDJSON or CSV page by page (keyset pagination), so any
+  date range can be exported without loading it into memory.
+
+Command line:
+    python history_store.py export --since 2025-11-01 --format csv -o history.csv
+    python history_store.py search "free electricity"
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+
+from verdict_cache import claim_key
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    claim TEXT NOT NULL,
+    claim_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    confidence INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    model TEXT,
+    result TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_created_at ON history (created_at);
+CREATE INDEX IF NOT EXISTS idx_history_status_created_at ON history (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_history_claim_hash ON history (claim_hash, created_at);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(claim, content='history', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS history_fts_insert AFTER INSERT ON history BEGIN
+    INSERT INTO history_fts (rowid, claim) VALUES (new.id, new.claim);
+END;
+"""
+
+CSV_FIELDS = ('id', 'created_at', 'claim', 'claim_hash', 'status', 'confidence', 'source', 'model', 'analysis')
+
+
+def _iso(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat(timespec='seconds')
+
+
+def parse_time(value):
+    """Epoch seconds from an ISO date/datetime string or a number; None passes through"""
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+class HistoryStore:
+    """
+    Append-only verification history in SQLite.
+    Safe to use from many threads; each thread gets its own connection.
+    """
+
+    def __init__(self, path, page_size=1000):
+        self.path = path
+        self.page_size = page_size
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        try:
+            conn.executescript(_FTS_SCHEMA)
+            self.full_text = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5
+            self.full_text = False
+
+    def _connection(self):
+        """Per-thread SQLite connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def append(self, claim, result, source='model'):
+        """Record one verification result (errors included, with status ERROR)"""
+        self._connection().execute(
+            'INSERT INTO history (created_at, claim, claim_hash, status, confidence, source, model, result) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (time.time(), claim, claim_key(claim), result.get('status') or 'ERROR',
+             int(result.get('confidence') or 0), source, result.get('model'),
+             json.dumps(result, ensure_ascii=False))
+        )
+
+    # ---------- reading ----------
+
+    def search(self, query, limit=50, status=None):
+        """Most relevant records whose claim matches `query`, newest first among equals"""
+        words = [word.replace('"', '') for word in query.split() if word.replace('"', '')]
+        if not words:
+            return []
+        status_filter, params = ('AND h.status = ?', [status]) if status else ('', [])
+        conn = self._connection()
+        if self.full_text:
+            match = ' '.join(f'"{word}"' for word in words)
+            rows = conn.execute(
+                'SELECT h.id, h.created_at, h.claim, h.status, h.confidence, h.source '
+                'FROM history_fts JOIN history h ON h.id = history_fts.rowid '
+                f'WHERE history_fts MATCH ? {status_filter} '
+                'ORDER BY bm25(history_fts), h.id DESC LIMIT ?',
+                [match] + params + [limit]
+            )
+        else:
+            like = ' AND '.join('h.claim LIKE ?' for _ in words)
+            rows = conn.execute(
+                'SELECT h.id, h.created_at, h.claim, h.status, h.confidence, h.source '
+                f'FROM history h WHERE {like} {status_filter} ORDER BY h.id DESC LIMIT ?',
+                [f'%{word}%' for word in words] + params + [limit]
+            )
+        return [{'id': row[0], 'created_at': _iso(row[1]), 'claim': row[2], 'status': row[3],
+                 'confidence': row[4], 'source': row[5]} for row in rows]
+
+    def iter_records(self, since=None, until=None, status=None):
+        """
+        Yield every record in [since, until) oldest first, as dicts with the
+        parsed result. Reads one page at a time, so memory use stays flat
+        whatever the range.
+        """
+        since = parse_time(since)
+        until = parse_time(until)
+        position = (since if since is not None else float('-inf'), 0)
+        conditions, bounds = ['(created_at, id) > (?, ?)'], []
+        if until is not None:
+            conditions.append('created_at < ?')
+            bounds.append(until)
+        if status:
+            conditions.append('status = ?')
+            bounds.append(status)
+        sql = ('SELECT id, created_at, claim, claim_hash, status, confidence, source, model, result '
+               f'FROM history WHERE {" AND ".join(conditions)} ORDER BY created_at, id LIMIT ?')
+
+        while True:
+            # A fresh query per page: no read transaction is held between pages
+            rows = self._connection().execute(sql, [*position, *bounds, self.page_size]).fetchall()
+            for row in rows:
+                yield {
+                    'id': row[0],
+                    'created_at': _iso(row[1]),
+                    'claim': row[2],
+                    'claim_hash': row[3],
+                    'status': row[4],
+                    'confidence': row[5],
+                    'source': row[6],
+                    'model': row[7],
+                    'result': json.loads(row[8]),
+                }
+            if len(rows) < self.page_size:
+                return
+            position = (rows[-1][1], rows[-1][0])
+
+    def iter_ndjson(self, since=None, until=None, status=None):
+        """Export as NDJSON lines (one record per line)"""
+        for record in self.iter_records(since, until, status):
+            yield json.dumps(record, ensure_ascii=False) + '\n'
+
+    def iter_csv(self, since=None, until=None, status=None):
+        """Export as CSV text chunks, header first; the analysis text replaces the full result"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_FIELDS)
+        for count, record in enumerate(self.iter_records(since, until, status), 1):
+            record['analysis'] = record.pop('result').get('analysis', '')
+            writer.writerow([record[field] for field in CSV_FIELDS])
+            if count % self.page_size == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+
+    def iter_warm_verdicts(self, since=None):
+        """
+        Yield (claim, result, created_at) for the latest successful verdict
+        of each claim since `since`, oldest first: a warm source for the
+        verdict cache. Only model and fact-check verdicts are used: cache and
+        coalesced rows are copies, and triage answers must never come back
+        as training labels.
+        """
+        since = parse_time(since) or 0.0
+        rows = self._connection().execute(
+            'SELECT claim, result, created_at FROM history WHERE id IN ('
+            "SELECT MAX(id) FROM history WHERE created_at >= ? AND status != 'ERROR' "
+            "AND source IN ('model', 'fact_check') GROUP BY claim_hash"
+            ') ORDER BY id', (since,)
+        )
+        for claim, result, created_at in rows:
+            result = json.loads(result)
+            if result.get('success'):
+                yield claim, result, created_at
+
+    def stats(self):
+        """Record count and time span"""
+        count, first, last = self._connection().execute(
+            'SELECT COUNT(*), MIN(created_at), MAX(created_at) FROM history').fetchone()
+        return {
+            'records': count,
+            'first': _iso(first) if first is not None else None,
+            'last': _iso(last) if last is not None else None,
+            'full_text': self.full_text,
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search or export the verification history")
+    parser.add_argument('--path', default=os.getenv('HISTORY_PATH', os.path.join('.cache', 'history.sqlite3')))
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    export = commands.add_parser('export', help="Stream records as NDJSON or CSV")
+    export.add_argument('--since', help="ISO date/time (inclusive)")
+    export.add_argument('--until', help="ISO date/time (exclusive)")
+    export.add_argument('--status', help="Only this verdict status, e.g. FALSE")
+    export.add_argument('--format', choices=('ndjson', 'csv'), default='ndjson')
+    export.add_argument('-o', '--output', help="Output file (default: stdout)")
+
+    search = commands.add_parser('search', help="Full-text search over claims")
+    search.add_argument('query')
+    search.add_argument('--status')
+    search.add_argument('--limit', type=int, default=20)
+
+    args = parser.parse_args(argv)
+    if not os.path.exists(args.path):
+        print(f"❌ No history at {args.path}", file=sys.stderr)
+        return 1
+    store = HistoryStore(args.path)
+
+    if args.command == 'search':
+        for record in store.search(args.query, limit=args.limit, status=args.status):
+            print(json.dumps(record, ensure_ascii=False))
+        return 0
+
+    chunks = (store.iter_csv if args.format == 'csv' else store.iter_ndjson)(args.since, args.until, args.status)
+    output = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    try:
+        for chunk in chunks:
+            output.write(chunk)
+    finally:
+        if args.output:
+            output.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
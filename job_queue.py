@@ -0,0 +1,310 @@
+"""
+VERIFICATION JOB QUEUE
+======================
+Local job queue so verifications run outside the Streamlit script thread.
+
+- Jobs live in SQLite (WAL mode): a rerun, a reconnect or another app
+  process on the host can look a job up by id and read its stored result.
+- Jobs are deduplicated by a caller-supplied key (the normalized claim or
+  the URL): submitting the same claim again returns the queued, running or
+  recently finished job instead of starting a new one. Failed jobs are
+  retried on the next submission.
+- A pool of worker threads claims queued jobs one at a time; long-running
+  jobs publish partial progress that pollers can render.
+- Running jobs hold a lease that a heartbeat thread renews while their
+  worker is alive. A job whose worker stopped (the process exited mid-job)
+  is handed to another worker once its lease runs out; a worker that lost
+  its lease can no longer write progress or a result.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+FINISHED_STATES = (DONE, FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL,
+    progress TEXT,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    heartbeat REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_state_created ON jobs (state, created_at);
+"""
+
+
+def job_id(kind, key):
+    """Stable job id for a deduplication key"""
+    return f"{kind}-" + hashlib.sha256(f"{kind}\0{key}".encode('utf-8')).hexdigest()[:32]
+
+
+class JobQueue:
+    """
+    SQLite-backed job queue with a worker thread pool.
+
+    `handler(kind, payload, progress)` does the work and returns a
+    JSON-serializable result dict; it may call `progress(update)` with a
+    JSON-serializable snapshot while it runs. A result with success False
+    marks the job failed, as does an exception. `clock` returns wall-clock
+    seconds (injectable for tests).
+    """
+
+    def __init__(self, path, handler, workers=2, retention=24 * 3600, lease=300,
+                 max_attempts=3, poll_interval=1.0, progress_interval=0.25, clock=time.time):
+        self.path = path
+        self.handler = handler
+        self.workers = workers
+        self.retention = retention
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.progress_interval = progress_interval
+        self.clock = clock
+
+        self._local = threading.local()
+        self._wakeup = threading.Condition()
+        self._stopped = threading.Event()
+        self._threads = []
+        self._last_prune = 0.0
+        # Jobs this process is running: id -> worker
+        self._held = {}
+        self._held_lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self):
+        """Per-thread SQLite connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    # ---------- submitting and reading ----------
+
+    def submit(self, kind, payload, key=None):
+        """
+        Queue a job and return its id. An identical job that is queued,
+        running or finished successfully within `retention` seconds is
+        reused instead.
+        """
+        identifier = job_id(kind, payload if key is None else key)
+        now = self.clock()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute('SELECT state, finished_at FROM jobs WHERE id = ?', (identifier,)).fetchone()
+            reusable = row is not None and (
+                row[0] in (QUEUED, RUNNING) or (row[0] == DONE and row[1] > now - self.retention))
+            if not reusable:
+                conn.execute(
+                    'INSERT OR REPLACE INTO jobs (id, kind, payload, state, attempts, created_at) '
+                    'VALUES (?, ?, ?, ?, 0, ?)',
+                    (identifier, kind, json.dumps(payload, ensure_ascii=False), QUEUED, now)
+                )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+        if not reusable:
+            with self._wakeup:
+                self._wakeup.notify()
+        return identifier
+
+    def get(self, identifier):
+        """
+        Job as a dict (id, kind, payload, state, progress, result, error,
+        timestamps and `ahead`, the number of jobs queued before it), or None
+        """
+        conn = self._connection()
+        row = conn.execute(
+            'SELECT id, kind, payload, state, progress, result, error, attempts, '
+            'created_at, started_at, finished_at FROM jobs WHERE id = ?', (identifier,)
+        ).fetchone()
+        if row is None:
+            return None
+        job = {
+            'id': row[0],
+            'kind': row[1],
+            'payload': json.loads(row[2]),
+            'state': row[3],
+            'progress': json.loads(row[4]) if row[4] else None,
+            'result': json.loads(row[5]) if row[5] else None,
+            'error': row[6],
+            'attempts': row[7],
+            'created_at': row[8],
+            'started_at': row[9],
+            'finished_at': row[10],
+            'ahead': 0,
+        }
+        if job['state'] == QUEUED:
+            job['ahead'] = conn.execute(
+                'SELECT COUNT(*) FROM jobs WHERE state = ? AND created_at < ?', (QUEUED, job['created_at'])
+            ).fetchone()[0]
+        return job
+
+    def stats(self):
+        """Number of jobs in each state"""
+        counts = dict(self._connection().execute('SELECT state, COUNT(*) FROM jobs GROUP BY state').fetchall())
+        return {state: counts.get(state, 0) for state in (QUEUED, RUNNING, DONE, FAILED)}
+
+    # ---------- workers ----------
+
+    def start(self):
+        """Start the worker threads (once)"""
+        if self._threads:
+            return self
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'job-worker-{number + 1}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat, name='job-heartbeat', daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+        return self
+
+    def stop(self, timeout=None):
+        """Let the workers finish their current job and exit"""
+        self._stopped.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _work(self):
+        worker = f"{os.getpid()}:{threading.current_thread().name}"
+        while not self._stopped.is_set():
+            job = self._claim(worker)
+            if job is None:
+                # Other processes sharing the database submit without notifying us, so poll too
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+                continue
+            self._run(worker, *job)
+
+    def _heartbeat(self):
+        """Renew the leases of running jobs every third of the lease, until stopped and idle"""
+        interval = min(self.lease / 3, 10.0)
+        while True:
+            if self._stopped.wait(interval):
+                # Stopping: keep renewing until the workers' last jobs finish
+                if not self._held:
+                    return
+                time.sleep(min(interval, 0.5))
+            self.renew_leases()
+
+    def renew_leases(self):
+        """Push the lease of every job this process is running forward; returns the number renewed"""
+        with self._held_lock:
+            held = list(self._held.items())
+        if not held:
+            return 0
+        now = self.clock()
+        conn = self._connection()
+        renewed = 0
+        for identifier, worker in held:
+            renewed += conn.execute(
+                'UPDATE jobs SET heartbeat = ? WHERE id = ? AND worker = ? AND state = ?',
+                (now, identifier, worker, RUNNING)
+            ).rowcount
+        return renewed
+
+    def _claim(self, worker):
+        """Mark the oldest queued job as running and return (id, kind, payload), or None"""
+        now = self.clock()
+        conn = self._connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            self._recover_stale(conn, now)
+            row = conn.execute(
+                'SELECT id, kind, payload FROM jobs WHERE state = ? ORDER BY created_at LIMIT 1', (QUEUED,)
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    'UPDATE jobs SET state = ?, worker = ?, started_at = ?, heartbeat = ?, '
+                    'attempts = attempts + 1 WHERE id = ?',
+                    (RUNNING, worker, now, now, row[0])
+                )
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        if row is None:
+            self._prune(now)
+            return None
+        return row[0], row[1], json.loads(row[2])
+
+    def _recover_stale(self, conn, now):
+        """Requeue running jobs whose lease expired; give up after max_attempts"""
+        expired = now - self.lease
+        conn.execute(
+            'UPDATE jobs SET state = ?, finished_at = ?, error = ? '
+            'WHERE state = ? AND heartbeat < ? AND attempts >= ?',
+            (FAILED, now, "The worker stopped before finishing", RUNNING, expired, self.max_attempts)
+        )
+        conn.execute('UPDATE jobs SET state = ? WHERE state = ? AND heartbeat < ?', (QUEUED, RUNNING, expired))
+
+    def _run(self, worker, identifier, kind, payload):
+        last_write = [0.0]
+
+        def progress(update):
+            now = time.monotonic()
+            if now - last_write[0] < self.progress_interval:
+                return
+            last_write[0] = now
+            self._connection().execute(
+                'UPDATE jobs SET progress = ?, heartbeat = ? WHERE id = ? AND worker = ? AND state = ?',
+                (json.dumps(update, ensure_ascii=False), self.clock(), identifier, worker, RUNNING)
+            )
+
+        with self._held_lock:
+            self._held[identifier] = worker
+        try:
+            try:
+                result = self.handler(kind, payload, progress)
+            except Exception as e:
+                self._finish(identifier, worker, FAILED, None, f"{type(e).__name__}: {e}")
+                return
+            state = DONE if result.get('success', True) else FAILED
+            self._finish(identifier, worker, state, result,
+                         None if state == DONE else result.get('error') or result.get('analysis'))
+        finally:
+            with self._held_lock:
+                self._held.pop(identifier, None)
+
+    def _finish(self, identifier, worker, state, result, error):
+        """Store the outcome if `worker` still holds the job; returns whether it did"""
+        return self._connection().execute(
+            'UPDATE jobs SET state = ?, result = ?, error = ?, progress = NULL, finished_at = ? '
+            'WHERE id = ? AND worker = ? AND state = ?',
+            (state, json.dumps(result, ensure_ascii=False) if result is not None else None,
+             error, self.clock(), identifier, worker, RUNNING)
+        ).rowcount == 1
+
+    def _prune(self, now):
+        """Drop finished jobs older than the retention period (at most once a minute)"""
+        if now - self._last_prune < 60:
+            return
+        self._last_prune = now
+        self._connection().execute(
+            'DELETE FROM jobs WHERE state IN (?, ?) AND finished_at < ?', (DONE, FAILED, now - self.retention)
+        )
@@ -8,18 +8,56 @@ Purpose: Fight fake news with AI-powered fact checking focused on Indian context
 """
 
 import streamlit as st
-import google.generativeai as genai
 import json
 from datetime import datetime
 import time
-import requests
-from bs4 import BeautifulSoup
+import threading
+import itertools
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import os
+import hmac
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from dotenv import load_dotenv
+from verdict_cache import VerdictCache, claim_key
+from history_store import HistoryStore
+from response_parser import (
+    StreamingResponseParser, SECTION_NAMES, parse_response, parse_json_response, calibrate_confidence
+)
+from model_router import ModelRouter, EmptyResponse
+from rate_limiter import RateLimiter, QuotaWaitTimeout, INTERACTIVE, BATCH
+from prompt_builder import PromptBuilder, TokenUsage, SYSTEM_INSTRUCTION, compact_article
+from single_flight import SingleFlight, FlightTimeout
+from job_queue import JobQueue, QUEUED, FINISHED_STATES
+from metrics import METRICS, result_source
+
+# Heavy or optional dependencies (google.generativeai, requests, lxml, numpy and the
+# modules built on them) are imported where first used, so the page paints without them.
 
 # Load environment variables
 load_dotenv()
 
+def _read_secret(name, default=''):
+    """Read a setting from Streamlit secrets, falling back to the environment"""
+    try:
+        return st.secrets.get(name, os.getenv(name, default))
+    except Exception:
+        # No secrets.toml (local runs, CLI and service processes)
+        return os.getenv(name, default)
+
+
+class _Secret:
+    """AppConfig attribute read from secrets on first access instead of at import"""
+    
+    def __init__(self, name, default=''):
+        self.name = name
+        self.default = default
+    
+    def __get__(self, instance, owner):
+        value = _read_secret(self.name, self.default)
+        # Replace the descriptor so later reads are plain attribute lookups
+        setattr(owner, self.name, value)
+        return value
+
 # ============================================
 # CONFIGURATION SECTION
 # ============================================
@@ -28,13 +66,155 @@ class AppConfig:
     """Application configuration and settings"""
     
     # API Configuration - Load from environment variables or Streamlit secrets
-    GEMINI_API_KEY = st.secrets.get('GEMINI_API_KEY', os.getenv('GEMINI_API_KEY', ''))
+    GEMINI_API_KEY = _Secret('GEMINI_API_KEY')
     
     # Application Settings
     APP_TITLE = "🇮🇳 Indian News Verifier"
     APP_SUBTITLE = "AI-Powered Fake News Detection for India"
     VERSION = "2.0"
     
+    # Engine Settings - seconds between model health probes of the shared engine
+    ENGINE_PROBE_INTERVAL = int(os.getenv('ENGINE_PROBE_INTERVAL', '900'))
+    
+    # Model Routing - models in order of preference, circuit breaker and optional hedged requests
+    MODEL_OPTIONS = [name.strip() for name in os.getenv(
+        'MODEL_OPTIONS', 'gemini-2.5-flash,gemini-flash-latest,models/gemini-2.5-flash,models/gemini-flash-latest'
+    ).split(',') if name.strip()]
+    ROUTER_FAILURE_THRESHOLD = int(os.getenv('ROUTER_FAILURE_THRESHOLD', '3'))
+    ROUTER_COOLDOWN = float(os.getenv('ROUTER_COOLDOWN', '30'))
+    ROUTER_HEDGE = os.getenv('ROUTER_HEDGE', '0') == '1'
+    ROUTER_HEDGE_MIN_DELAY = float(os.getenv('ROUTER_HEDGE_MIN_DELAY', '0.5'))
+    ROUTER_HEDGE_MAX_DELAY = float(os.getenv('ROUTER_HEDGE_MAX_DELAY', '8'))
+    
+    # Verdict Cache - SQLite file shared by every app process on the host (empty path disables it)
+    VERDICT_CACHE_PATH = os.getenv('VERDICT_CACHE_PATH', os.path.join('.cache', 'verdicts.sqlite3'))
+    VERDICT_CACHE_MAX_ENTRIES = int(os.getenv('VERDICT_CACHE_MAX_ENTRIES', '50000'))
+    # Seconds a process serves a verdict from memory before re-reading it (and seeing clears/evictions)
+    VERDICT_CACHE_MEMORY_TTL = float(os.getenv('VERDICT_CACHE_MEMORY_TTL', '30'))
+    VERDICT_CACHE_TTL = {
+        'TRUE': int(os.getenv('VERDICT_CACHE_TTL_TRUE', str(7 * 24 * 3600))),
+        'FALSE': int(os.getenv('VERDICT_CACHE_TTL_FALSE', str(7 * 24 * 3600))),
+        'PARTIALLY_TRUE': int(os.getenv('VERDICT_CACHE_TTL_PARTIALLY_TRUE', str(3 * 24 * 3600))),
+        'UNVERIFIED': int(os.getenv('VERDICT_CACHE_TTL_UNVERIFIED', str(6 * 3600)))
+    }
+    
+    # Verification History - append-only audit log of every result (empty path disables it; see
+    # history_store.py for search and export). Verdicts from the last HISTORY_WARM_DAYS days that the
+    # verdict cache no longer holds are loaded back into it at startup (0 disables warming).
+    HISTORY_PATH = os.getenv('HISTORY_PATH', os.path.join('.cache', 'history.sqlite3'))
+    HISTORY_WARM_DAYS = float(os.getenv('HISTORY_WARM_DAYS', '7'))
+    
+    # Near-Duplicate Index - reuse verdicts for reworded claims (capacity 0 disables it)
+    NEAR_DUP_THRESHOLD = float(os.getenv('NEAR_DUP_THRESHOLD', '0.8'))
+    NEAR_DUP_CAPACITY = int(os.getenv('NEAR_DUP_CAPACITY', '100000'))
+    NEAR_DUP_SNAPSHOT_PATH = os.getenv('NEAR_DUP_SNAPSHOT_PATH', os.path.join('.cache', 'near_duplicates.npz'))
+    NEAR_DUP_SNAPSHOT_EVERY = int(os.getenv('NEAR_DUP_SNAPSHOT_EVERY', '200'))
+    
+    # Rate Limits - process-wide AI quota: requests and tokens per minute (0 leaves either
+    # unlimited). Calls reserve their prompt estimate plus RATE_LIMIT_OUTPUT_TOKENS and wait at most
+    # RATE_LIMIT_MAX_WAIT seconds in line, interactive before batch. 429/quota errors pause all
+    # calls (the API's retry-after hint, else RATE_LIMIT_BACKOFF_BASE doubling up to _MAX, jittered)
+    # and are retried up to RATE_LIMIT_MAX_RETRIES times.
+    RATE_LIMIT_RPM = int(os.getenv('RATE_LIMIT_RPM', '0'))
+    RATE_LIMIT_TPM = int(os.getenv('RATE_LIMIT_TPM', '0'))
+    RATE_LIMIT_OUTPUT_TOKENS = int(os.getenv('RATE_LIMIT_OUTPUT_TOKENS', '700'))
+    RATE_LIMIT_MAX_WAIT = float(os.getenv('RATE_LIMIT_MAX_WAIT', '120'))
+    RATE_LIMIT_MAX_RETRIES = int(os.getenv('RATE_LIMIT_MAX_RETRIES', '4'))
+    RATE_LIMIT_BACKOFF_BASE = float(os.getenv('RATE_LIMIT_BACKOFF_BASE', '1'))
+    RATE_LIMIT_BACKOFF_MAX = float(os.getenv('RATE_LIMIT_BACKOFF_MAX', '60'))
+    
+    # Batch Verification - concurrent claims and per-claim timeout in seconds
+    BATCH_MAX_WORKERS = int(os.getenv('BATCH_MAX_WORKERS', '8'))
+    BATCH_CLAIM_TIMEOUT = float(os.getenv('BATCH_CLAIM_TIMEOUT', '60'))
+    
+    # Request Coalescing - identical in-flight claims/URLs share one call; seconds a
+    # waiter without its own timeout waits for the in-flight call
+    COALESCE_WAIT_TIMEOUT = float(os.getenv('COALESCE_WAIT_TIMEOUT', '120'))
+    
+    # Job Queue - the UI submits verifications to JOB_WORKERS background workers and polls them;
+    # jobs and results stay in SQLite for JOB_RETENTION seconds, so reruns and reconnects reuse
+    # them. A job whose worker stopped is retried after JOB_LEASE seconds without a heartbeat.
+    JOB_QUEUE_PATH = os.getenv('JOB_QUEUE_PATH', os.path.join('.cache', 'jobs.sqlite3'))
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+    JOB_RETENTION = int(os.getenv('JOB_RETENTION', '3600'))
+    JOB_LEASE = int(os.getenv('JOB_LEASE', '300'))
+    JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '0.3'))
+    
+    # URL Fetching - timeouts in seconds, download cap in bytes
+    FETCH_CACHE_DIR = os.getenv('FETCH_CACHE_DIR', os.path.join('.cache', 'http'))
+    FETCH_MAX_BYTES = int(os.getenv('FETCH_MAX_BYTES', str(2 * 1024 * 1024)))
+    FETCH_CONNECT_TIMEOUT = float(os.getenv('FETCH_CONNECT_TIMEOUT', '5'))
+    FETCH_READ_TIMEOUT = float(os.getenv('FETCH_READ_TIMEOUT', '15'))
+    FETCH_TOTAL_TIMEOUT = float(os.getenv('FETCH_TOTAL_TIMEOUT', '30'))
+    FETCH_PER_DOMAIN_LIMIT = int(os.getenv('FETCH_PER_DOMAIN_LIMIT', '4'))
+    FETCH_FRESH_SECONDS = int(os.getenv('FETCH_FRESH_SECONDS', '600'))
+    # Private, loopback and link-local hosts are refused unless this is 1 (local testing only)
+    FETCH_ALLOW_PRIVATE_HOSTS = os.getenv('FETCH_ALLOW_PRIVATE_HOSTS', '0') == '1'
+    
+    # Feed Monitor - polls the RSS/Atom feeds and news sitemaps of TRUSTED_SOURCES (found on their
+    # homepages and in robots.txt unless MONITOR_DISCOVER=0) and the MONITOR_FEEDS watchlist every
+    # MONITOR_POLL_INTERVAL seconds, and verifies new stories at batch priority so their verdicts are
+    # cached before anyone asks. At most MONITOR_BUDGET_PER_HOUR stories are verified per hour (0
+    # disables the monitor); stories older than MONITOR_MAX_AGE seconds are ignored.
+    MONITOR_STATE_PATH = os.getenv('MONITOR_STATE_PATH', os.path.join('.cache', 'monitor.sqlite3'))
+    MONITOR_FEEDS = [feed.strip() for feed in os.getenv('MONITOR_FEEDS', '').split(',') if feed.strip()]
+    MONITOR_DISCOVER = os.getenv('MONITOR_DISCOVER', '1') != '0'
+    MONITOR_BUDGET_PER_HOUR = int(os.getenv('MONITOR_BUDGET_PER_HOUR', '0'))
+    MONITOR_POLL_INTERVAL = int(os.getenv('MONITOR_POLL_INTERVAL', '300'))
+    MONITOR_MAX_AGE = int(os.getenv('MONITOR_MAX_AGE', str(24 * 3600)))
+    MONITOR_WORKERS = int(os.getenv('MONITOR_WORKERS', '1'))
+    
+    # Streaming - render analysis sections as the model writes them
+    STREAM_RESPONSES = os.getenv('STREAM_RESPONSES', '1') != '0'
+    
+    # Structured Output - ask for JSON on non-streaming calls (batch, API) to skip text parsing
+    STRUCTURED_OUTPUT = os.getenv('STRUCTURED_OUTPUT', '0') == '1'
+    
+    # Cassettes - CASSETTE_MODE=record appends every model call to CASSETTE_PATH, =replay answers
+    # from it offline (no API key needed, see cassette.py). CASSETTE_LATENCY scales the recorded
+    # latencies on replay: 0 replays at full speed, 1 at the recorded pace.
+    CASSETTE_MODE = os.getenv('CASSETTE_MODE', 'off').strip().lower()
+    CASSETTE_PATH = os.getenv('CASSETTE_PATH', os.path.join('.cache', 'cassette.jsonl'))
+    CASSETTE_LATENCY = float(os.getenv('CASSETTE_LATENCY', '0'))
+    
+    # Fact-Check Index - published fact-checks consulted before the AI (see build_factcheck_index.py);
+    # a normalized match score at or above FACTCHECK_STRONG_MATCH reuses the published rating
+    FACTCHECK_INDEX_DIR = os.getenv('FACTCHECK_INDEX_DIR', os.path.join('.cache', 'factchecks'))
+    FACTCHECK_STRONG_MATCH = float(os.getenv('FACTCHECK_STRONG_MATCH', '0.8'))
+    FACTCHECK_EVIDENCE_MIN = float(os.getenv('FACTCHECK_EVIDENCE_MIN', '0.3'))
+    FACTCHECK_EVIDENCE_K = int(os.getenv('FACTCHECK_EVIDENCE_K', '3'))
+    
+    # Triage Pre-Filter - local model answering confident claims without the LLM (see train_triage.py);
+    # used only when the model file exists. TRIAGE_THRESHOLD overrides the calibrated threshold.
+    TRIAGE_MODEL_PATH = os.getenv('TRIAGE_MODEL_PATH', os.path.join('.cache', 'triage.model'))
+    TRIAGE_THRESHOLD = os.getenv('TRIAGE_THRESHOLD', '')
+    TRIAGE_BATCH_SIZE = int(os.getenv('TRIAGE_BATCH_SIZE', '256'))
+    
+    # Article Claims - articles from URLs are split into up to ARTICLE_MAX_CLAIMS check-worthy
+    # claims, verified in parallel and scored together (0 gives one verdict per article)
+    ARTICLE_MAX_CLAIMS = int(os.getenv('ARTICLE_MAX_CLAIMS', '8'))
+    
+    # Prompt Budgets - estimated tokens for a typed claim and for text extracted from a URL
+    PROMPT_CLAIM_TOKENS = int(os.getenv('PROMPT_CLAIM_TOKENS', '600'))
+    PROMPT_ARTICLE_TOKENS = int(os.getenv('PROMPT_ARTICLE_TOKENS', '250'))
+    PROMPT_EVIDENCE_TOKENS = int(os.getenv('PROMPT_EVIDENCE_TOKENS', '250'))
+    # Count each prompt with the model's tokenizer before sending (one count_tokens call);
+    # 0 uses the local estimate only
+    PROMPT_COUNT_TOKENS = os.getenv('PROMPT_COUNT_TOKENS', '1') == '1'
+    PROMPT_COUNT_TIMEOUT = float(os.getenv('PROMPT_COUNT_TIMEOUT', '5'))
+    
+    # HTTP API Service - see api_service.py
+    API_PORT = int(os.getenv('API_PORT', '8000'))
+    API_KEEP_ALIVE = int(os.getenv('API_KEEP_ALIVE', '30'))
+    API_MAX_BATCH = int(os.getenv('API_MAX_BATCH', '100'))
+    
+    # Metrics - Prometheus text on http://METRICS_HOST:METRICS_PORT/metrics from the UI process
+    # (0 disables; the API service always serves /metrics). ADMIN_TOKEN unlocks the sidebar
+    # metrics panel and the one-shot profiler (empty disables both).
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT = int(os.getenv('METRICS_PORT', '0'))
+    ADMIN_TOKEN = _Secret('ADMIN_TOKEN')
+    
     # UI Theme Colors
     COLORS = {
         'primary': '#FF6B35',
@@ -70,179 +250,1136 @@ class IndianNewsVerifier:
     def __init__(self):
         """Initialize the verification engine"""
         self.model = None
+        self.model_name = None
         self.is_ready = False
+        self.setup_error = None
+        self.cache = self._setup_verdict_cache()
+        self.history = self._setup_history()
+        warmed = self._warm_from_history()
+        self.near_duplicates = self._setup_near_duplicate_index(warmed)
+        self.fact_checks = self._setup_factcheck_index()
+        self.triage = self._setup_triage_model()
+        self.triaged_claims = 0
+        self.prompts = PromptBuilder(
+            AppConfig.PROMPT_CLAIM_TOKENS,
+            AppConfig.PROMPT_EVIDENCE_TOKENS,
+            count_tokens=self._count_prompt_tokens if AppConfig.PROMPT_COUNT_TOKENS else None
+        )
+        self.token_usage = TokenUsage()
+        self.flights = SingleFlight()
+        self.cassette = None
+        self.router = ModelRouter(
+            [],
+            failure_threshold=AppConfig.ROUTER_FAILURE_THRESHOLD,
+            cooldown=AppConfig.ROUTER_COOLDOWN,
+            hedge=AppConfig.ROUTER_HEDGE,
+            hedge_min_delay=AppConfig.ROUTER_HEDGE_MIN_DELAY,
+            hedge_max_delay=AppConfig.ROUTER_HEDGE_MAX_DELAY
+        )
+        self.limiter = RateLimiter(
+            requests_per_minute=AppConfig.RATE_LIMIT_RPM,
+            tokens_per_minute=AppConfig.RATE_LIMIT_TPM,
+            max_wait=AppConfig.RATE_LIMIT_MAX_WAIT,
+            max_retries=AppConfig.RATE_LIMIT_MAX_RETRIES,
+            backoff_base=AppConfig.RATE_LIMIT_BACKOFF_BASE,
+            backoff_max=AppConfig.RATE_LIMIT_BACKOFF_MAX
+        )
+        self._unsaved_claims = 0
+        self._lock = threading.Lock()
         self._setup_gemini_ai()
     
+    def _setup_verdict_cache(self):
+        """Open the shared verdict cache; verification still works without it"""
+        if not AppConfig.VERDICT_CACHE_PATH:
+            return None
+        try:
+            return VerdictCache(
+                AppConfig.VERDICT_CACHE_PATH,
+                max_entries=AppConfig.VERDICT_CACHE_MAX_ENTRIES,
+                ttl_by_status=AppConfig.VERDICT_CACHE_TTL,
+                memory_ttl=AppConfig.VERDICT_CACHE_MEMORY_TTL
+            )
+        except Exception:
+            return None
+    
+    def _setup_history(self):
+        """Open the verification history; verification still works without it"""
+        if not AppConfig.HISTORY_PATH:
+            return None
+        try:
+            return HistoryStore(AppConfig.HISTORY_PATH)
+        except Exception:
+            return None
+    
+    def _warm_from_history(self):
+        """
+        Fill the verdict cache with recent verdicts from the history that it no
+        longer holds (a new host, a deleted cache file); returns the added (key, claim)
+        """
+        if self.cache is None or self.history is None or AppConfig.HISTORY_WARM_DAYS <= 0:
+            return []
+        try:
+            return self.cache.warm(self.history.iter_warm_verdicts(time.time() - AppConfig.HISTORY_WARM_DAYS * 86400))
+        except Exception:
+            return []
+    
+    def _setup_near_duplicate_index(self, warmed=()):
+        """
+        Restore the near-duplicate index from its snapshot, or rebuild it from the verdict cache;
+        `warmed` are (key, claim) pairs just loaded into the cache that a snapshot cannot know about
+        """
+        if self.cache is None or AppConfig.NEAR_DUP_CAPACITY <= 0:
+            return None
+        try:
+            from near_duplicate import NearDuplicateIndex, SnapshotMismatch
+            
+            settings = {'capacity': AppConfig.NEAR_DUP_CAPACITY, 'threshold': AppConfig.NEAR_DUP_THRESHOLD}
+            snapshot = AppConfig.NEAR_DUP_SNAPSHOT_PATH
+            if snapshot and os.path.exists(snapshot):
+                try:
+                    index = NearDuplicateIndex.load(snapshot, **settings)
+                except SnapshotMismatch:
+                    # NEAR_DUP_CAPACITY changed since the snapshot: rebuild, the next save replaces it
+                    index = None
+                if index is not None:
+                    for key, claim in warmed:
+                        index.add(key, claim)
+                    return index
+            
+            index = NearDuplicateIndex(**settings)
+            for key, claim in self.cache.iter_claims():
+                index.add(key, claim)
+            return index
+        except Exception:
+            return None
+    
+    def _setup_factcheck_index(self):
+        """Open the fact-check index if one has been built; None disables retrieval"""
+        directory = AppConfig.FACTCHECK_INDEX_DIR
+        if not directory or not os.path.exists(os.path.join(directory, 'manifest.json')):
+            return None
+        try:
+            from factcheck_index import FactCheckIndex
+            return FactCheckIndex(directory)
+        except Exception:
+            return None
+    
+    def _setup_triage_model(self):
+        """Memory-map the triage model if one has been trained; None disables triage"""
+        path = AppConfig.TRIAGE_MODEL_PATH
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            from triage import TriageModel
+            model = TriageModel.load(path)
+            if AppConfig.TRIAGE_THRESHOLD:
+                model.threshold = float(AppConfig.TRIAGE_THRESHOLD)
+            return model
+        except Exception:
+            return None
+    
     def _setup_gemini_ai(self):
-        """Private method to setup Advanced AI with error handling"""
+        """
+        Private method to setup Advanced AI with error handling.
+        The engine is shared by every session, so problems are recorded in
+        `setup_error` for the UI to report instead of being rendered here.
+        """
         try:
+            if AppConfig.CASSETTE_MODE == 'replay':
+                self._setup_replay()
+                return
+            
             if not AppConfig.GEMINI_API_KEY:
-                st.error("🚫 No API key found!")
-                st.warning("📝 **For Streamlit Cloud:** Add GEMINI_API_KEY in your app's Secrets (⚙️ Settings → Secrets)")
-                st.info("💡 **For local development:** Create a .env file with: GEMINI_API_KEY=your_api_key_here")
-                st.code("GEMINI_API_KEY = \"your_api_key_here\"", language="toml")
+                self.setup_error = "missing_api_key"
                 return
             
-            # Configure AI API
+            # Configure AI API (the SDK is the slowest import, so it loads with the engine)
+            import google.generativeai as genai
             genai.configure(api_key=AppConfig.GEMINI_API_KEY)
             
-            # Try multiple model versions for reliability
-            model_options = [
-                'gemini-2.5-flash',
-                'gemini-flash-latest',
-                'models/gemini-2.5-flash',
-                'models/gemini-flash-latest'
-            ]
+            # Every configured model goes behind the router for failover; static
+            # instructions are sent as the system instruction, set once per model
+            models = [(model_name, genai.GenerativeModel(model_name, system_instruction=SYSTEM_INSTRUCTION))
+                      for model_name in AppConfig.MODEL_OPTIONS]
+            if AppConfig.CASSETTE_MODE == 'record':
+                if self.cassette is None:
+                    from cassette import CassetteRecorder
+                    self.cassette = CassetteRecorder(AppConfig.CASSETTE_PATH)
+                # The startup probes below use the bare models and are not recorded
+                self.router.set_models([(name, self.cassette.wrap(name, model)) for name, model in models])
+            else:
+                self.router.set_models(models)
             
-            for model_name in model_options:
+            # Probe in order of preference until one model answers
+            for model_name, model in models:
+                started = time.perf_counter()
                 try:
-                    self.model = genai.GenerativeModel(model_name)
-                    
                     # Test the model
-                    test_response = self.model.generate_content("Test")
-                    
-                    if test_response and test_response.text:
-                        self.is_ready = True
-                        st.success(f"✅ AI Engine Ready!")
-                        break
-                        
+                    test_response = model.generate_content("Test")
+                    ok = bool(test_response and test_response.text)
                 except Exception:
-                    continue
+                    ok = False
+                self.router.record(model_name, time.perf_counter() - started, ok)
+                
+                if ok:
+                    # Swap in the probed model only once it is known to work
+                    self.model = model
+                    self.model_name = model_name
+                    self.is_ready = True
+                    self.setup_error = None
+                    return
             
-            if not self.is_ready:
-                st.error("❌ Could not initialize AI engine")
+            self.is_ready = False
+            self.setup_error = "Could not initialize AI engine"
                 
         except Exception as e:
-            st.error(f"🚫 Setup Error: {str(e)}")
+            self.is_ready = False
+            self.setup_error = f"Setup Error: {str(e)}"
     
-    def verify_news(self, news_claim):
+    def _setup_replay(self):
+        """Answer every model call from the recorded cassette; nothing goes over the network"""
+        if self.cassette is None:
+            from cassette import CassettePlayer
+            self.cassette = CassettePlayer(AppConfig.CASSETTE_PATH, latency_scale=AppConfig.CASSETTE_LATENCY)
+        models = [(model_name, self.cassette.model(model_name)) for model_name in AppConfig.MODEL_OPTIONS]
+        self.router.set_models(models)
+        self.model_name, self.model = models[0]
+        self.is_ready = True
+        self.setup_error = None
+    
+    def refresh(self):
+        """Re-probe the configured models and switch to the first healthy one"""
+        self._setup_gemini_ai()
+    
+    def _count_prompt_tokens(self, text):
+        """Prompt tokens counted by the current model (system instruction included); None when it cannot count"""
+        model = self.model
+        if model is None or not hasattr(model, 'count_tokens'):
+            return None
+        return model.count_tokens(text, request_options={'timeout': AppConfig.PROMPT_COUNT_TIMEOUT}).total_tokens
+    
+    def verify_news(self, news_claim, timeout=None, triage=None, priority=INTERACTIVE):
         """
         Main verification method
-        Returns comprehensive analysis of the news claim
+        Returns comprehensive analysis of the news claim.
+        `triage` is an optional precomputed TriageDecision (batch scoring).
+        `priority` orders the model call in the rate limiter queue.
+        Concurrent calls for the same normalized claim share one analysis.
         """
+        started = time.perf_counter()
+        flight, leader = self.flights.join(claim_key(news_claim))
+        if not leader:
+            result = self._await_flight(flight, timeout)
+        else:
+            result = None
+            try:
+                with METRICS.maybe_profile(news_claim[:80]):
+                    result = self._verify_news(news_claim, timeout, triage, priority)
+            finally:
+                # Waiters get a snapshot so the caller may keep editing its own copy
+                self.flights.finish(flight, result=dict(result) if result is not None else None,
+                                    error=None if result is not None else RuntimeError("Verification was interrupted"))
+        
+        METRICS.observe('total', time.perf_counter() - started)
+        METRICS.record_result(result)
+        self._record_history(news_claim, result)
+        return result
+    
+    def _verify_news(self, news_claim, timeout=None, triage=None, priority=INTERACTIVE):
+        """Uncoalesced verification: cache, fact-checks, triage, then the AI"""
+        # Serve repeated and reworded claims from the verdict cache
+        with METRICS.stage('cache'):
+            cached = self._lookup_cached(news_claim)
+        if cached is not None:
+            return cached
+        
+        # Reuse a published fact-check of the same claim; weaker matches become evidence
+        with METRICS.stage('fact_check'):
+            checked, evidence = self._consult_fact_checks(news_claim)
+        if checked is not None:
+            return checked
+        
+        # Answer claims the local triage model is confident about
+        with METRICS.stage('triage'):
+            triaged = self._triage(news_claim, triage)
+        if triaged is not None:
+            return triaged
+        
         if not self.is_ready:
-            return self._create_error_response("AI engine not ready")
+            return self._create_error_response("AI engine not ready", 'not_ready')
         
         try:
+            structured = AppConfig.STRUCTURED_OUTPUT
+            
             # Create comprehensive analysis prompt
-            analysis_prompt = self._create_analysis_prompt(news_claim)
+            with METRICS.stage('prompt'):
+                analysis_prompt = self._create_analysis_prompt(news_claim, structured=structured, evidence=evidence)
             
             # Get AI response
-            response = self.model.generate_content(analysis_prompt)
+            options = {}
+            if timeout:
+                options['request_options'] = {'timeout': timeout}
+            if structured:
+                options['generation_config'] = {'response_mime_type': 'application/json'}
+            (response, model_name), permit, model_seconds = self._call_model(
+                self.router.generate_content, analysis_prompt, options, priority, timeout)
+            METRICS.observe('model', model_seconds)
             
             if not response or not response.text:
-                return self._create_error_response("No response from AI")
+                return self._create_error_response("No response from AI", 'empty_response')
             
             # Parse and structure the response
-            return self._parse_ai_response(response.text)
+            with METRICS.stage('parse'):
+                result = self._parse_ai_response(response.text, structured=structured)
+            result['model'] = model_name
+            result['usage'] = self.token_usage.record(response, analysis_prompt.estimated_tokens)
+            permit.settle(result['usage']['input_tokens'] + result['usage']['output_tokens'])
+            
+            if result['success']:
+                self._remember_verdict(news_claim, result)
+            
+            return result
             
+        except QuotaWaitTimeout as e:
+            return self._create_error_response(str(e), 'rate_limited')
+        except EmptyResponse as e:
+            return self._create_error_response(f"No response from AI ({e})", 'empty_response')
         except Exception as e:
-            return self._create_error_response(f"Analysis failed: {str(e)}")
+            return self._create_error_response(f"Analysis failed: {str(e)}", type(e).__name__)
     
-    def _create_analysis_prompt(self, news_claim):
-        """Create a comprehensive prompt for Indian news analysis"""
-        return f"""
-        🇮🇳 INDIAN NEWS FACT-CHECK ANALYSIS
-        =====================================
+    def _call_model(self, call, prompt, options, priority=INTERACTIVE, timeout=None):
+        """
+        Send a routed model call through the rate limiter.
+        Returns (call's result, Permit, seconds spent in the call itself); the
+        time spent waiting for quota and backing off is the 'quota_wait' stage.
+        Settle the permit with the real token count once it is known.
+        """
+        tokens = prompt.estimated_tokens + AppConfig.RATE_LIMIT_OUTPUT_TOKENS
+        in_call = [0.0]
         
-        You are an expert Indian news fact-checker with deep knowledge of:
-        - Indian politics, government, and current affairs
-        - Indian media landscape and reliable sources
-        - Indian cultural and social context
-        - Common misinformation patterns in India
+        def send():
+            sent = time.perf_counter()
+            try:
+                return call(prompt.text, **options)
+            finally:
+                in_call[0] += time.perf_counter() - sent
         
-        NEWS CLAIM TO ANALYZE:
-        "{news_claim}"
+        started = time.perf_counter()
+        try:
+            value, permit = self.limiter.call(send, tokens, priority=priority, timeout=timeout)
+        finally:
+            METRICS.observe('quota_wait', time.perf_counter() - started - in_call[0])
+        return value, permit, in_call[0]
+    
+    def verify_news_stream(self, news_claim, timeout=None):
+        """
+        Streaming form of verify_news
+        Yields {'type': 'update', ...} events as the status, confidence and
+        each analysis section appear in the streamed output, then a final
+        {'type': 'result', 'result': {...}} event. The result carries
+        'timings' with time to first verdict and total time in milliseconds.
+        A claim already in flight yields only the shared final result.
+        """
+        started = time.perf_counter()
+        flight, leader = self.flights.join(claim_key(news_claim))
+        if not leader:
+            result = self._await_flight(flight, timeout)
+            METRICS.observe('total', time.perf_counter() - started)
+            METRICS.record_result(result)
+            self._record_history(news_claim, result)
+            yield {'type': 'result', 'result': result}
+            return
+        
+        result = None
+        try:
+            with METRICS.maybe_profile(news_claim[:80]):
+                for event in self._verify_news_stream(news_claim, timeout):
+                    if event['type'] == 'result':
+                        result = event['result']
+                        self.flights.finish(flight, result=dict(result))
+                        METRICS.observe('total', time.perf_counter() - started)
+                        METRICS.record_result(result)
+                        self._record_history(news_claim, result)
+                    yield event
+        finally:
+            if result is None:
+                # The reader stopped early or the stream failed: release the waiters
+                self.flights.finish(flight, error=RuntimeError("Verification was interrupted"))
+    
+    def _await_flight(self, flight, timeout=None):
+        """Result of an identical in-flight verification, as an independent copy"""
+        try:
+            shared = flight.wait(timeout or AppConfig.COALESCE_WAIT_TIMEOUT)
+        except FlightTimeout as e:
+            return self._create_error_response(str(e), 'FlightTimeout')
+        except Exception as e:
+            return self._create_error_response(f"Analysis failed: {str(e)}", type(e).__name__)
+        result = dict(shared)
+        result['coalesced'] = True
+        return result
+    
+    def _verify_news_stream(self, news_claim, timeout=None):
+        """Uncoalesced streaming verification"""
+        started = time.perf_counter()
+        
+        def elapsed_ms():
+            return round((time.perf_counter() - started) * 1000, 1)
+        
+        with METRICS.stage('cache'):
+            cached = self._lookup_cached(news_claim)
+        if cached is not None:
+            cached['timings'] = {'first_verdict_ms': elapsed_ms(), 'total_ms': elapsed_ms()}
+            yield {'type': 'result', 'result': cached}
+            return
         
-        Please provide analysis in this EXACT format:
+        with METRICS.stage('fact_check'):
+            checked, evidence = self._consult_fact_checks(news_claim)
+        if checked is None:
+            with METRICS.stage('triage'):
+                checked = self._triage(news_claim)
+        if checked is not None:
+            checked['timings'] = {'first_verdict_ms': elapsed_ms(), 'total_ms': elapsed_ms()}
+            yield {'type': 'result', 'result': checked}
+            return
+        
+        if not self.is_ready:
+            yield {'type': 'result', 'result': self._create_error_response("AI engine not ready", 'not_ready')}
+            return
+        
+        parser = StreamingResponseParser()
+        first_verdict_ms = None
+        
+        try:
+            with METRICS.stage('prompt'):
+                analysis_prompt = self._create_analysis_prompt(news_claim, evidence=evidence)
+            options = {'request_options': {'timeout': timeout}} if timeout else {}
+            
+            # Model time excludes the time the reader spends rendering each update
+            (stream, model_name), permit, model_seconds = self._call_model(
+                self.router.stream_content, analysis_prompt, options, INTERACTIVE, timeout)
+            chunks = iter(stream)
+            
+            last_chunk = None
+            while True:
+                waited = time.perf_counter()
+                chunk = next(chunks, None)
+                model_seconds += time.perf_counter() - waited
+                if chunk is None:
+                    break
+                # The final chunk carries the usage totals
+                last_chunk = chunk
+                try:
+                    chunk_text = chunk.text
+                except ValueError:
+                    # Chunks without text parts (e.g. safety metadata only)
+                    continue
+                changed = parser.feed(chunk_text)
+                if changed:
+                    if first_verdict_ms is None and parser.status is not None:
+                        first_verdict_ms = elapsed_ms()
+                    yield self._stream_update(parser, changed)
+            
+            METRICS.observe('model', model_seconds)
+            
+            changed = parser.finish()
+            if changed:
+                yield self._stream_update(parser, changed)
+            
+            if not parser.text.strip():
+                yield {'type': 'result', 'result': self._create_error_response("No response from AI", 'empty_response')}
+                return
+            
+            with METRICS.stage('parse'):
+                result = self._parse_ai_response(parser.text)
+            result['model'] = model_name
+            result['usage'] = self.token_usage.record(last_chunk, analysis_prompt.estimated_tokens)
+            permit.settle(result['usage']['input_tokens'] + result['usage']['output_tokens'])
+            if result['success']:
+                self._remember_verdict(news_claim, result)
+            result['timings'] = {
+                'first_verdict_ms': first_verdict_ms if first_verdict_ms is not None else elapsed_ms(),
+                'total_ms': elapsed_ms()
+            }
+            yield {'type': 'result', 'result': result}
+            
+        except QuotaWaitTimeout as e:
+            yield {'type': 'result', 'result': self._create_error_response(str(e), 'rate_limited')}
+        except EmptyResponse as e:
+            yield {'type': 'result', 'result': self._create_error_response(f"No response from AI ({e})", 'empty_response')}
+        except Exception as e:
+            yield {'type': 'result', 'result': self._create_error_response(f"Analysis failed: {str(e)}", type(e).__name__)}
+    
+    @staticmethod
+    def _stream_update(parser, changed):
+        """Snapshot of the partially parsed response for UI updates"""
+        return {
+            'type': 'update',
+            'changed': sorted(changed),
+            'status': parser.status,
+            'confidence': parser.confidence,
+            'sections': dict(parser.sections),
+            'current_section': parser.current_section
+        }
+    
+    def _lookup_cached(self, news_claim):
+        """Exact verdict cache hit first, then a near-duplicate of a verified claim"""
+        if self.cache is None:
+            return None
         
-        VERIFICATION_STATUS: [TRUE/FALSE/PARTIALLY_TRUE/UNVERIFIED]
-        CONFIDENCE_SCORE: [0-100]
+        cached = self.cache.get(news_claim)
+        if cached is not None or self.near_duplicates is None:
+            return cached
         
-        DETAILED_ANALYSIS:
-        [Provide thorough explanation of why this claim is true/false]
+        match = self.near_duplicates.lookup(news_claim)
+        if match is None:
+            return None
         
-        INDIAN_CONTEXT:
-        [Explain relevance to Indian politics, society, current events]
+        cached = self.cache.get_by_key(match.key)
+        if cached is not None:
+            cached['near_duplicate'] = True
+            cached['similarity'] = round(match.similarity, 3)
+        return cached
+    
+    def _consult_fact_checks(self, news_claim):
+        """
+        Look the claim up in the fact-check index.
+        Returns (verdict, evidence): a verdict built from a strong match, or
+        None plus the documents of weaker matches for the prompt.
+        """
+        if self.fact_checks is None:
+            return None, []
+        from factcheck_index import is_strong_match
+        try:
+            matches = self.fact_checks.search(news_claim, k=AppConfig.FACTCHECK_EVIDENCE_K)
+        except Exception:
+            return None, []
+        
+        if matches and is_strong_match(news_claim, matches[0], AppConfig.FACTCHECK_STRONG_MATCH):
+            document = matches[0].document
+            status, confidence = calibrate_confidence(document['status'], None)
+            result = {
+                'status': status,
+                'confidence': confidence,
+                'analysis': (f"📰 This claim has already been fact-checked by {document['source'] or 'a fact-checker'}: "
+                             f"\"{document['title'] or document['claim']}\" - rated {document['rating']}."
+                             + (f"\n\nRead the full fact-check: {document['url']}" if document['url'] else "")),
+                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'sources': ([f"🔍 {document['source'] or 'Fact-check'} - {document['url']}"] if document['url'] else [])
+                           + AppConfig.TRUSTED_SOURCES[:3],
+                'success': True,
+                'fact_check': {
+                    'title': document['title'],
+                    'url': document['url'],
+                    'source': document['source'],
+                    'rating': document['rating'],
+                    'published': document['published'],
+                    'score': round(matches[0].normalized, 3)
+                }
+            }
+            self._remember_verdict(news_claim, result)
+            return result, []
+        
+        evidence = [match.document for match in matches if match.normalized >= AppConfig.FACTCHECK_EVIDENCE_MIN]
+        return None, evidence
+    
+    def _triage(self, news_claim, decision=None):
+        """
+        Local verdict when the triage model clears its threshold, else None.
+        Triage verdicts are not cached, so they never feed back into training data.
+        """
+        if self.triage is None:
+            return None
+        if decision is None:
+            decision = self.triage.decide(news_claim)
+        if not decision.confident:
+            return None
+        
+        with self._lock:
+            self.triaged_claims += 1
+        _, confidence = calibrate_confidence(decision.status, int(decision.probability * 100))
+        return {
+            'status': decision.status,
+            'confidence': confidence,
+            'analysis': (f"⚡ Answered by the local triage model ({decision.probability:.0%} probability) "
+                         f"without a full AI analysis. Re-check with the sources below before sharing."),
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'sources': AppConfig.TRUSTED_SOURCES[:4],
+            'success': True,
+            'triage': True
+        }
+    
+    def _record_history(self, news_claim, result):
+        """Append the result to the verification history (audit trail)"""
+        if self.history is None:
+            return
+        try:
+            self.history.append(news_claim, result, source=result_source(result) if result.get('success') else 'error')
+        except Exception:
+            # A locked or full history database must not fail the verification
+            pass
+    
+    def _remember_verdict(self, news_claim, result):
+        """Store a fresh verdict in the cache and the near-duplicate index"""
+        if self.cache is None:
+            return
+        
+        self.cache.set(news_claim, result)
+        
+        if self.near_duplicates is not None:
+            self.near_duplicates.add(claim_key(news_claim), news_claim)
+            with self._lock:
+                self._unsaved_claims += 1
+                snapshot_due = self._unsaved_claims >= AppConfig.NEAR_DUP_SNAPSHOT_EVERY
+                if snapshot_due:
+                    self._unsaved_claims = 0
+            if AppConfig.NEAR_DUP_SNAPSHOT_PATH and snapshot_due:
+                # Snapshot off the request path
+                threading.Thread(
+                    target=self.near_duplicates.save,
+                    args=(AppConfig.NEAR_DUP_SNAPSHOT_PATH,),
+                    daemon=True
+                ).start()
+    
+    def verify_many(self, claims, max_workers=None, timeout=None, priority=BATCH):
+        """
+        Verify many claims concurrently
+        Returns one result per claim, in input order
+        """
+        claims = list(claims)
+        results = [None] * len(claims)
+        for index, result in self.iter_verify(claims, max_workers=max_workers, timeout=timeout, priority=priority):
+            results[index] = result
+        return results
+    
+    def iter_verify(self, claims, max_workers=None, timeout=None, priority=BATCH):
+        """
+        Generator form of verify_many
+        Yields (index, result) pairs as soon as each claim finishes. Claims are
+        read lazily with at most 2 x max_workers in flight, so very large inputs
+        can be streamed. A claim exceeding `timeout` seconds yields an error
+        result; the model call itself is also given the same timeout.
+        `priority` places the model calls in the rate limiter queue (batch by default).
+        """
+        max_workers = max_workers or AppConfig.BATCH_MAX_WORKERS
+        timeout = AppConfig.BATCH_CLAIM_TIMEOUT if timeout is None else timeout
+        claim_iter = self._iter_triaged(claims)
+        pending = {}
+        started = {}
+        
+        def run(index, claim, decision):
+            # Timeouts count from when a worker picks the claim up, not from submission
+            started[index] = time.monotonic()
+            return self.verify_news(claim, timeout=timeout, triage=decision, priority=priority)
+        
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='verify')
+        try:
+            while True:
+                # Keep the pool fed without reading the whole input up front
+                while len(pending) < max_workers * 2:
+                    try:
+                        index, claim, decision = next(claim_iter)
+                    except StopIteration:
+                        break
+                    pending[executor.submit(run, index, claim, decision)] = index
+                
+                if not pending:
+                    return
+                
+                wait_for = None
+                if timeout:
+                    running = [started[index] for index in pending.values() if index in started]
+                    oldest = min(running) if running else time.monotonic()
+                    wait_for = max(0.0, oldest + timeout - time.monotonic())
+                done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    index = pending.pop(future)
+                    started.pop(index, None)
+                    try:
+                        yield index, future.result()
+                    except Exception as e:
+                        yield index, self._create_error_response(f"Analysis failed: {str(e)}", type(e).__name__)
+                
+                if timeout:
+                    now = time.monotonic()
+                    for future, index in list(pending.items()):
+                        if index in started and now - started[index] >= timeout:
+                            # Abandon the claim; a still-running call finishes in the background
+                            del pending[future]
+                            started.pop(index, None)
+                            timed_out = self._create_error_response(f"Analysis timed out after {timeout:g}s", 'timeout')
+                            METRICS.record_result(timed_out)
+                            yield index, timed_out
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+    
+    def verify_article(self, title, paragraphs, timeout=None, progress=None, priority=INTERACTIVE):
+        """
+        Verify an article claim by claim.
+        The article is split into check-worthy claims that are all verified
+        at once, so it takes about as long as its slowest claim; each claim
+        is cached and coalesced on its own, so claims shared with other
+        articles are analyzed once. Returns an article-level result with the
+        per-claim results under 'claims'. `progress(done, total)` is called
+        as claims finish. Articles with fewer than two claims are verified
+        as a single text.
+        """
+        from claim_splitter import split_claims, aggregate
         
-        EVIDENCE_CHECK:
-        [What evidence supports or contradicts this claim]
+        with METRICS.stage('split'):
+            claims = split_claims(title, paragraphs, AppConfig.ARTICLE_MAX_CLAIMS)
+        if len(claims) < 2:
+            return self.verify_news(compact_article(title, paragraphs, AppConfig.PROMPT_ARTICLE_TOKENS), timeout,
+                                    priority=priority)
         
-        RECOMMENDED_SOURCES:
-        [List specific Indian news sources to verify this claim]
+        results = [None] * len(claims)
+        verified = self.iter_verify(claims, max_workers=len(claims), timeout=timeout, priority=priority)
+        for done, (index, result) in enumerate(verified, 1):
+            results[index] = dict(result, claim=claims[index])
+            if progress is not None:
+                progress(done, len(claims))
         
-        RED_FLAGS:
-        [Any warning signs or suspicious elements in this claim]
+        if not any(result['success'] for result in results):
+            return results[0]
         
-        CONCLUSION:
-        [Final assessment with reasoning]
+        status, confidence, score = aggregate(results)
+        lines = [f"Checked {len(claims)} claims from the article:"]
+        lines += [f"- {result['status']} ({result['confidence']}%): {result['claim']}" for result in results]
+        return {
+            'status': status,
+            'confidence': confidence,
+            'analysis': '\n'.join(lines),
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'sources': list(dict.fromkeys(source for result in results for source in result.get('sources') or [])),
+            'success': True,
+            'article_score': score,
+            'claims': results
+        }
+    
+    def _iter_triaged(self, claims):
+        """Yield (index, claim, decision), scoring claims with the triage model in vectorized chunks"""
+        claim_iter = enumerate(claims)
+        while True:
+            chunk = list(itertools.islice(claim_iter, AppConfig.TRIAGE_BATCH_SIZE))
+            if not chunk:
+                return
+            if self.triage is None:
+                decisions = [None] * len(chunk)
+            else:
+                decisions = self.triage.decide_many([claim for _, claim in chunk])
+            for (index, claim), decision in zip(chunk, decisions):
+                yield index, claim, decision
+    
+    def _create_analysis_prompt(self, news_claim, structured=False, evidence=None):
+        """
+        Compact per-request prompt for Indian news analysis.
+        The role and answer format are in the model's system instruction;
+        the returned BuiltPrompt carries the text and its token estimate.
         """
+        return self.prompts.build(news_claim, structured=structured, evidence=evidence)
     
-    def _parse_ai_response(self, ai_text):
+    def _parse_ai_response(self, ai_text, structured=False):
         """Parse AI response into structured format"""
         try:
-            # Extract verification status
-            status = "UNVERIFIED"
-            confidence = 50
-            
-            # Look for status in AI response
-            if "VERIFICATION_STATUS: TRUE" in ai_text:
-                status = "TRUE"
-                confidence = 85
-            elif "VERIFICATION_STATUS: FALSE" in ai_text:
-                status = "FALSE" 
-                confidence = 90
-            elif "VERIFICATION_STATUS: PARTIALLY_TRUE" in ai_text:
-                status = "PARTIALLY_TRUE"
-                confidence = 70
-            elif "VERIFICATION_STATUS: UNVERIFIED" in ai_text:
-                status = "UNVERIFIED"
-                confidence = 30
-            
-            # Try to extract confidence score from AI response
-            import re
-            conf_match = re.search(r'CONFIDENCE_SCORE:\s*(\d+)', ai_text)
-            if conf_match:
-                extracted_confidence = int(conf_match.group(1))
-                # Only use extracted confidence if it makes sense with the status
-                if status == "UNVERIFIED" and extracted_confidence > 50:
-                    confidence = min(extracted_confidence, 50)  # Cap at 50% for unverified
-                elif status in ["TRUE", "FALSE", "PARTIALLY_TRUE"]:
-                    confidence = extracted_confidence
-            
-            # Ensure logical confidence ranges
-            if status == "UNVERIFIED" and confidence > 50:
-                confidence = 30
-            elif status == "TRUE" and confidence < 60:
-                confidence = 75
-            elif status == "FALSE" and confidence < 70:
-                confidence = 80
-            elif status == "PARTIALLY_TRUE" and confidence < 50:
-                confidence = 65
+            parsed = parse_json_response(ai_text) if structured else parse_response(ai_text)
             
             return {
-                'status': status,
-                'confidence': confidence,
-                'analysis': ai_text,
+                'status': parsed.status,
+                'confidence': parsed.confidence,
+                'analysis': parsed.raw_text,
+                'sections': parsed.sections(),
                 'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 'sources': AppConfig.TRUSTED_SOURCES[:4],  # Top 4 sources
                 'success': True
             }
             
         except Exception as e:
-            return self._create_error_response(f"Parse error: {str(e)}")
+            return self._create_error_response(f"Parse error: {str(e)}", 'parse_error')
     
-    def _create_error_response(self, error_message):
-        """Create standardized error response"""
+    def _create_error_response(self, error_message, error_type='error'):
+        """Create standardized error response; `error_type` labels the failure in metrics"""
         return {
             'status': 'ERROR',
             'confidence': 0,
             'analysis': f"❌ {error_message}",
             'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
             'sources': [],
-            'success': False
+            'success': False,
+            'error_type': error_type
         }
 
+# ============================================
+# URL TEXT EXTRACTION
+# ============================================
+
+class NewsURLExtractor:
+    """Extract claim text from a news article URL"""
+    
+    @staticmethod
+    def extract_article(url):
+        """
+        Download a page and extract its article body and metadata.
+        Concurrent requests for the same URL share one download.
+        Raises FetchError when the page cannot be downloaded.
+        """
+        try:
+            article, _ = get_url_flights().do(url.split('#', 1)[0], NewsURLExtractor._fetch_article, url,
+                                              timeout=AppConfig.COALESCE_WAIT_TIMEOUT)
+        except FlightTimeout as e:
+            from fetcher import FetchError
+            METRICS.count_error('FlightTimeout')
+            raise FetchError(str(e))
+        except Exception as e:
+            METRICS.count_error(type(e).__name__)
+            raise
+        return article
+    
+    @staticmethod
+    def _fetch_article(url):
+        with METRICS.stage('fetch'):
+            page = get_shared_fetcher().fetch(url)
+        with METRICS.stage('extract'):
+            return get_shared_extractor().extract(page.body)
+    
+    @staticmethod
+    def claim_from(article):
+        """Headline plus the body sentences most relevant to it, within PROMPT_ARTICLE_TOKENS"""
+        return compact_article(article.title, article.paragraphs, AppConfig.PROMPT_ARTICLE_TOKENS)
+
+
+# ============================================
+# SHARED ENGINE
+# ============================================
+
+class SharedVerifierEngine:
+    """
+    Process-wide holder for a single warmed-up IndianNewsVerifier.
+    The engine is built in a background thread (start() or the first get())
+    and re-probed in the background at most once per `probe_interval`
+    seconds, so no page render waits on model probes; sessions keep only
+    their own lightweight state.
+    """
+    
+    def __init__(self, probe_interval=None):
+        self.probe_interval = AppConfig.ENGINE_PROBE_INTERVAL if probe_interval is None else probe_interval
+        self._verifier = None
+        self._last_probe = 0.0
+        self._started = False
+        self._built = threading.Event()
+        self._start_lock = threading.Lock()
+        self._lock = threading.Lock()
+    
+    def start(self):
+        """Begin building the engine in the background; returns immediately"""
+        with self._start_lock:
+            if self._started:
+                return
+            self._started = True
+        threading.Thread(target=self._build, name='engine-warmup', daemon=True).start()
+    
+    def _build(self):
+        try:
+            self._verifier = IndianNewsVerifier()
+            self._last_probe = time.monotonic()
+        finally:
+            self._built.set()
+    
+    def get(self, wait=True):
+        """
+        Return the shared verifier, scheduling a background re-probe when due.
+        While the engine is still being built, waits for it, or returns None
+        when `wait` is False.
+        """
+        verifier = self._verifier
+        if verifier is None:
+            self.start()
+            if not wait:
+                return None
+            self._built.wait()
+            verifier = self._verifier
+            if verifier is None:
+                # The background build raised; build here so the error reaches the caller
+                with self._lock:
+                    if self._verifier is None:
+                        self._verifier = IndianNewsVerifier()
+                        self._last_probe = time.monotonic()
+                    return self._verifier
+            return verifier
+        
+        # Refresh in the background: every session keeps using the current engine
+        if self._probe_due() and self._lock.acquire(blocking=False):
+            self._last_probe = time.monotonic()
+            threading.Thread(target=self._refresh, args=(verifier,), name='engine-probe', daemon=True).start()
+        return verifier
+    
+    def _refresh(self, verifier):
+        try:
+            verifier.refresh()
+            self._last_probe = time.monotonic()
+        finally:
+            self._lock.release()
+    
+    def peek(self):
+        """Current verifier without creating or probing it (None before first use)"""
+        return self._verifier
+    
+    def _probe_due(self):
+        """Check whether the refresh interval has elapsed since the last probe"""
+        return time.monotonic() - self._last_probe >= self.probe_interval
+
+
+@st.cache_resource(show_spinner=False)
+def get_shared_engine():
+    """Single SharedVerifierEngine for the whole process, shared across sessions and reruns"""
+    return SharedVerifierEngine()
+
+@st.cache_resource(show_spinner=False)
+def get_shared_fetcher():
+    """Single pooled NewsFetcher for the whole process"""
+    from fetcher import NewsFetcher
+    return NewsFetcher(
+        cache_dir=AppConfig.FETCH_CACHE_DIR or None,
+        max_bytes=AppConfig.FETCH_MAX_BYTES,
+        connect_timeout=AppConfig.FETCH_CONNECT_TIMEOUT,
+        read_timeout=AppConfig.FETCH_READ_TIMEOUT,
+        total_timeout=AppConfig.FETCH_TOTAL_TIMEOUT,
+        per_domain_limit=AppConfig.FETCH_PER_DOMAIN_LIMIT,
+        fresh_seconds=AppConfig.FETCH_FRESH_SECONDS,
+        allow_private_hosts=AppConfig.FETCH_ALLOW_PRIVATE_HOSTS
+    )
+
+@st.cache_resource(show_spinner=False)
+def get_shared_extractor():
+    """Single ArticleExtractor for the whole process, created on the first URL"""
+    from article_extractor import ArticleExtractor
+    return ArticleExtractor()
+
+@st.cache_resource(show_spinner=False)
+def get_url_flights():
+    """Process-wide coalescing of concurrent article extractions by URL"""
+    return SingleFlight()
+
+# ============================================
+# BACKGROUND VERIFICATION JOBS
+# ============================================
+
+def run_verification_job(engine, kind, payload, progress):
+    """
+    Job handler: fetch the article for 'url' jobs and verify it claim by
+    claim, or verify a typed claim. Streamed sections and finished claims
+    are published as job progress.
+    """
+    verifier = engine.get()
+    if kind != 'url':
+        return _verify_streamed(verifier, payload, progress)
+    
+    try:
+        article = NewsURLExtractor.extract_article(payload)
+    except Exception as e:
+        return verifier._create_error_response(f"Error extracting URL: {str(e)}", type(e).__name__)
+    if not article.paragraphs:
+        return verifier._create_error_response("Could not extract text from this URL", 'no_article')
+    
+    news_claim = NewsURLExtractor.claim_from(article)
+    if AppConfig.ARTICLE_MAX_CLAIMS:
+        result = verifier.verify_article(
+            article.title, article.paragraphs,
+            progress=lambda done, total: progress({'type': 'claims', 'done': done, 'total': total})
+        )
+    else:
+        result = _verify_streamed(verifier, news_claim, progress)
+    return dict(result, article={
+        'url': payload,
+        'title': article.title,
+        'byline': article.byline,
+        'published': article.published,
+        'text': news_claim
+    })
+
+
+def _verify_streamed(verifier, news_claim, progress):
+    if not AppConfig.STREAM_RESPONSES:
+        return verifier.verify_news(news_claim)
+    for event in verifier.verify_news_stream(news_claim):
+        if event['type'] == 'result':
+            return event['result']
+        progress(event)
+
+
+@st.cache_resource(show_spinner=False)
+def get_job_queue():
+    """Process-wide verification job queue with its worker threads running"""
+    engine = get_shared_engine()
+    return JobQueue(
+        AppConfig.JOB_QUEUE_PATH,
+        lambda kind, payload, progress: run_verification_job(engine, kind, payload, progress),
+        workers=AppConfig.JOB_WORKERS,
+        retention=AppConfig.JOB_RETENTION,
+        lease=AppConfig.JOB_LEASE
+    ).start()
+
+# ============================================
+# FEED MONITOR
+# ============================================
+
+@st.cache_resource(show_spinner=False)
+def get_feed_fetcher():
+    """NewsFetcher for feeds, sitemaps and robots.txt: accepts XML and revalidates on every poll"""
+    from fetcher import NewsFetcher, DEFAULT_CONTENT_TYPES
+    from feed_monitor import FEED_CONTENT_TYPES
+    return NewsFetcher(
+        cache_dir=AppConfig.FETCH_CACHE_DIR or None,
+        max_bytes=AppConfig.FETCH_MAX_BYTES,
+        connect_timeout=AppConfig.FETCH_CONNECT_TIMEOUT,
+        read_timeout=AppConfig.FETCH_READ_TIMEOUT,
+        total_timeout=AppConfig.FETCH_TOTAL_TIMEOUT,
+        per_domain_limit=AppConfig.FETCH_PER_DOMAIN_LIMIT,
+        fresh_seconds=0,
+        content_types=DEFAULT_CONTENT_TYPES + FEED_CONTENT_TYPES,
+        allow_private_hosts=AppConfig.FETCH_ALLOW_PRIVATE_HOSTS
+    )
+
+
+def pre_verify_article(engine, article):
+    """Feed monitor handler: verify a new story the way a submitted URL is verified, at batch priority"""
+    verifier = engine.get()
+    if AppConfig.ARTICLE_MAX_CLAIMS:
+        return verifier.verify_article(article.title, article.paragraphs, priority=BATCH)
+    return verifier.verify_news(NewsURLExtractor.claim_from(article), priority=BATCH)
+
+
+@st.cache_resource(show_spinner=False)
+def get_feed_monitor():
+    """Process-wide feed monitor with its threads running; None when MONITOR_BUDGET_PER_HOUR is 0"""
+    if AppConfig.MONITOR_BUDGET_PER_HOUR <= 0:
+        return None
+    from feed_monitor import FeedMonitor, outlet_homepages
+    
+    engine = get_shared_engine()
+    return FeedMonitor(
+        AppConfig.MONITOR_STATE_PATH,
+        fetch=get_feed_fetcher().fetch,
+        extract=NewsURLExtractor.extract_article,
+        verify=lambda article: pre_verify_article(engine, article),
+        homepages=outlet_homepages(AppConfig.TRUSTED_SOURCES) if AppConfig.MONITOR_DISCOVER else (),
+        feeds=AppConfig.MONITOR_FEEDS,
+        poll_interval=AppConfig.MONITOR_POLL_INTERVAL,
+        budget_per_hour=AppConfig.MONITOR_BUDGET_PER_HOUR,
+        max_age=AppConfig.MONITOR_MAX_AGE,
+        workers=AppConfig.MONITOR_WORKERS
+    ).start()
+
+# ============================================
+# METRICS EXPORT
+# ============================================
+
+MODEL_STATES = {'closed': 0, 'half_open': 1, 'open': 2}
+
+
+def is_admin(token):
+    """Check an admin token against ADMIN_TOKEN (always False when none is configured)"""
+    return bool(AppConfig.ADMIN_TOKEN) and hmac.compare_digest(str(token or ''), AppConfig.ADMIN_TOKEN)
+
+
+def engine_gauges(verifier):
+    """Cache, model, coalescing and token figures of the shared engine as Prometheus samples"""
+    urls = get_url_flights().stats()
+    gauges = [
+        ('coalesced_requests_total', 'Requests that waited on an identical in-flight call', {'kind': 'url'}, urls['coalesced']),
+    ]
+    monitor = get_feed_monitor()
+    if monitor is not None:
+        feeds = monitor.stats()
+        for state, count in feeds['stories'].items():
+            gauges.append(('monitor_stories', 'Stories found by the feed monitor', {'state': state}, count))
+        gauges += [
+            ('monitor_feeds', 'Feeds and sitemaps polled by the feed monitor', {}, feeds['feeds']),
+            ('monitor_feed_polls_total', 'Feed polls', {}, feeds['polls']),
+            ('monitor_feed_not_modified_total', 'Feed polls answered 304 Not Modified', {}, feeds['not_modified']),
+            ('monitor_budget_used', 'Stories pre-verified in the last hour', {}, feeds['budget_used']),
+        ]
+    if verifier is None:
+        return gauges
+    
+    claims = verifier.flights.stats()
+    usage = verifier.token_usage.stats()
+    gauges += [
+        ('verifier_ready', 'Whether the AI engine is ready', {}, int(verifier.is_ready)),
+        ('coalesced_requests_total', 'Requests that waited on an identical in-flight call', {'kind': 'claim'}, claims['coalesced']),
+        ('triaged_claims_total', 'Claims answered by the local triage model', {}, verifier.triaged_claims),
+        ('model_tokens_total', 'Tokens sent to and received from the AI model', {'direction': 'input'}, usage['input_tokens']),
+        ('model_tokens_total', 'Tokens sent to and received from the AI model', {'direction': 'output'}, usage['output_tokens']),
+    ]
+    if verifier.cache is not None:
+        cache = verifier.cache.stats()
+        gauges += [
+            ('verdict_cache_hits_total', 'Verdict cache hits', {}, cache['hits']),
+            ('verdict_cache_misses_total', 'Verdict cache misses', {}, cache['misses']),
+            ('verdict_cache_evictions_total', 'Verdict cache evictions', {}, cache['evictions']),
+            ('verdict_cache_entries', 'Verdicts stored in the cache', {}, cache['size']),
+        ]
+    limits = verifier.limiter.stats()
+    for priority, depth in limits['queue_depth'].items():
+        gauges.append(('rate_limit_queue_depth', 'Model calls waiting for AI quota', {'priority': priority}, depth))
+    gauges += [
+        ('rate_limit_delayed_total', 'Model calls that had to wait for AI quota', {}, limits['delayed']),
+        ('rate_limit_timeouts_total', 'Model calls that gave up waiting for AI quota', {}, limits['timeouts']),
+        ('rate_limited_responses_total', 'Rate-limit (429) responses from the AI API', {}, limits['rate_limited']),
+        ('rate_limit_backoff_seconds', 'Remaining pause after a rate-limit response', {}, limits['backoff_remaining']),
+        ('rate_limit_tokens_available', 'Tokens left in the per-minute token bucket', {}, limits['tokens_available']),
+    ]
+    for model in verifier.router.stats():
+        labels = {'model': model['model']}
+        gauges += [
+            ('model_requests_total', 'Calls sent to each AI model', labels, model['requests']),
+            ('model_failures_total', 'Failed calls per AI model', labels, model['failures']),
+            ('model_circuit_state', 'Circuit breaker state (0 closed, 1 half-open, 2 open)', labels, MODEL_STATES.get(model['state'])),
+            ('model_latency_p50_seconds', 'Rolling median model latency', labels,
+             round(model['p50_ms'] / 1000, 6) if model['p50_ms'] is not None else None),
+            ('model_latency_p95_seconds', 'Rolling 95th percentile model latency', labels,
+             round(model['p95_ms'] / 1000, 6) if model['p95_ms'] is not None else None),
+        ]
+    return gauges
+
+
+def render_metrics():
+    """Prometheus text for this process: stage latencies, verdict counters and engine gauges"""
+    return METRICS.render_prometheus(engine_gauges(get_shared_engine().peek()))
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves GET /metrics for the Streamlit process"""
+    
+    def do_GET(self):
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render_metrics().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_server():
+    """Start the local /metrics endpoint once per process; None when disabled or the port is taken"""
+    if not AppConfig.METRICS_PORT:
+        return None
+    try:
+        server = ThreadingHTTPServer((AppConfig.METRICS_HOST, AppConfig.METRICS_PORT), _MetricsHandler)
+    except OSError:
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
+
 # ============================================
 # USER INTERFACE COMPONENTS
 # ============================================
@@ -289,7 +1426,23 @@ class BeautifulUI:
         """, unsafe_allow_html=True)
     
     @staticmethod
-    def render_sidebar():
+    def render_engine_status(verifier):
+        """Report shared engine readiness to the current session"""
+        if verifier is None:
+            st.info("⏳ Warming up the AI engine - you can start typing your news claim")
+        elif verifier.setup_error == "missing_api_key":
+            st.error("🚫 No API key found!")
+            st.warning("📝 **For Streamlit Cloud:** Add GEMINI_API_KEY in your app's Secrets (⚙️ Settings → Secrets)")
+            st.info("💡 **For local development:** Create a .env file with: GEMINI_API_KEY=your_api_key_here")
+            st.code("GEMINI_API_KEY = \"your_api_key_here\"", language="toml")
+        elif verifier.setup_error:
+            st.error(f"❌ {verifier.setup_error}")
+        elif verifier.is_ready and not st.session_state.get('engine_ready_shown'):
+            st.session_state.engine_ready_shown = True
+            st.success(f"✅ AI Engine Ready!")
+    
+    @staticmethod
+    def render_sidebar(verifier=None):
         """Render simple sidebar"""
         with st.sidebar:
             st.markdown("### 🛠️ How It Works")
@@ -303,9 +1456,104 @@ class BeautifulUI:
             st.markdown("### ⚠️ Note")
             st.markdown("Always verify with multiple sources")
             
+            if verifier is not None and verifier.cache is not None:
+                cache_stats = verifier.cache.stats()
+                st.markdown("---")
+                st.caption(f"⚡ Verdict cache: {cache_stats['hits']} hits • {cache_stats['misses']} misses • {cache_stats['size']} stored")
+            
+            if verifier is not None and verifier.triaged_claims:
+                st.caption(f"⚡ Answered locally by triage: {verifier.triaged_claims} claims")
+            
+            if verifier is not None:
+                claims, urls = verifier.flights.stats(), get_url_flights().stats()
+                if claims['coalesced'] or urls['coalesced']:
+                    st.caption(f"🔗 Coalesced duplicate requests: {claims['coalesced']} claims • {urls['coalesced']} URLs")
+            
+            monitor = get_feed_monitor()
+            if monitor is not None:
+                feeds = monitor.stats()
+                st.caption(f"📡 Pre-verified from {feeds['feeds']} news feeds: {feeds['stories']['verified']} stories"
+                           f" • {feeds['budget_used']}/{feeds['budget_per_hour']} this hour")
+            
+            jobs = get_job_queue().stats()
+            if jobs['queued'] or jobs['running']:
+                st.caption(f"🧵 Verification jobs: {jobs['running']} running • {jobs['queued']} queued")
+            
+            if verifier is not None and verifier.token_usage.requests:
+                usage = verifier.token_usage.stats()
+                st.caption(f"🔢 Tokens per verification: {usage['avg_input_tokens']:.0f} in • {usage['avg_output_tokens']:.0f} out")
+            
+            if AppConfig.ADMIN_TOKEN:
+                BeautifulUI.render_admin_panel(verifier)
+            
             st.markdown("---")
             st.markdown(f"**Version {AppConfig.VERSION}** 🇮🇳")
     
+    @staticmethod
+    def render_admin_panel(verifier=None):
+        """Stage latencies, counters and the one-shot profiler, behind ADMIN_TOKEN"""
+        with st.expander("🔐 Admin metrics"):
+            token = st.text_input("Admin token", type="password", key="admin_token")
+            if not is_admin(token):
+                if token:
+                    st.caption("❌ Invalid token")
+                return
+            
+            stages = METRICS.summary()
+            if stages:
+                st.markdown("**⏱️ Stage latency (ms)**")
+                st.table([dict(stage=name, **figures) for name, figures in stages.items()])
+            else:
+                st.caption("No verifications timed yet")
+            
+            verdicts, errors = METRICS.counters()
+            if verdicts:
+                st.markdown("**📊 Verdicts**")
+                st.table([{'status': status, 'source': source, 'count': count}
+                          for (status, source), count in sorted(verdicts.items())])
+            if errors:
+                st.markdown("**❌ Errors**")
+                st.table([{'type': error_type, 'count': count} for error_type, count in sorted(errors.items())])
+            if verifier is not None:
+                st.markdown("**🤖 Models**")
+                st.table(verifier.router.stats())
+                limits = verifier.limiter.stats()
+                st.markdown("**🚦 AI quota**")
+                st.caption(f"Queue: {limits['queue_depth']['interactive']} interactive • {limits['queue_depth']['batch']} batch"
+                           f" • {limits['delayed']} delayed (avg {limits['avg_wait_ms']:.0f} ms)"
+                           f" • {limits['rate_limited']} rate-limited • {limits['timeouts']} timed out")
+            
+            if verifier is not None and verifier.history is not None:
+                history = verifier.history.stats()
+                st.markdown("**🗂️ Verification history**")
+                st.caption(f"{history['records']} records • {history['first'] or '-'} → {history['last'] or '-'}")
+                query = st.text_input("Search past claims", key="admin_history_query")
+                if query.strip():
+                    records = verifier.history.search(query, limit=20)
+                    if records:
+                        st.table(records)
+                    else:
+                        st.caption("No matching claims")
+            
+            monitor = get_feed_monitor()
+            if monitor is not None:
+                stories = monitor.recent()
+                if stories:
+                    st.markdown("**📡 Pre-verified stories**")
+                    st.table(stories)
+            
+            if AppConfig.METRICS_PORT:
+                st.caption(f"📈 Prometheus: http://{AppConfig.METRICS_HOST}:{AppConfig.METRICS_PORT}/metrics")
+            
+            if st.button("🔬 Profile next verification"):
+                METRICS.profile_next()
+            if METRICS.profile_armed:
+                st.caption("🔬 The next verification will be profiled")
+            profile = METRICS.last_profile
+            if profile is not None:
+                st.caption(f"🔬 Last profile: {profile['seconds']:.2f}s at {profile['profiled_at']} - {profile['label']}")
+                st.code(profile['report'], language="text")
+    
     @staticmethod
     def render_verification_form():
         """Render news input form"""
@@ -333,33 +1581,8 @@ class BeautifulUI:
                 placeholder="https://example.com/news-article"
             )
             if url:
-                # Extract text from URL
-                try:
-                    import requests
-                    from bs4 import BeautifulSoup
-                    
-                    with st.spinner("� Extracting text from URL..."):
-                        response = requests.get(url, headers={'User-Agent': 'Mozilla/5.0'})
-                        soup = BeautifulSoup(response.content, 'html.parser')
-                        
-                        # Remove script and style elements
-                        for script in soup(["script", "style"]):
-                            script.decompose()
-                        
-                        # Extract text from paragraphs
-                        paragraphs = soup.find_all('p')
-                        extracted_text = ' '.join([p.get_text().strip() for p in paragraphs if p.get_text().strip()])
-                        
-                        if extracted_text:
-                            news_text = extracted_text[:1000]  # Limit to 1000 characters
-                            st.success("✅ Text extracted successfully!")
-                            st.text_area("Extracted text:", value=news_text, height=100, disabled=True)
-                        else:
-                            st.error("❌ Could not extract text from this URL")
-                            news_text = ""
-                except Exception as e:
-                    st.error(f"❌ Error extracting URL: {str(e)}")
-                    news_text = ""
+                # The page is downloaded and extracted by the verification job
+                news_text = url.strip()
         # Action buttons
         col1, col2, col3 = st.columns([2, 2, 3])
         
@@ -371,13 +1594,105 @@ class BeautifulUI:
         
         with col3:
             if st.button("🔄 Clear"):
-                st.experimental_rerun()
+                BeautifulUI.forget_job()
+                st.rerun()
         
         # Handle example button
         if example_clicked:
-            return "PM Modi is the current Prime Minister of India", verify_clicked, True
+            return 'claim', "PM Modi is the current Prime Minister of India", verify_clicked, True
         
-        return news_text, verify_clicked, False
+        kind = 'claim' if input_method == "✏️ Type/Paste Text" else 'url'
+        return kind, news_text, verify_clicked, False
+    
+    @staticmethod
+    def remember_job(identifier):
+        """Keep the session's current job in session state and the page URL, so reruns and reconnects find it"""
+        st.session_state.job_id = identifier
+        st.query_params['job'] = identifier
+    
+    @staticmethod
+    def forget_job():
+        st.session_state.pop('job_id', None)
+        st.query_params.pop('job', None)
+    
+    @staticmethod
+    def current_job():
+        return st.session_state.get('job_id') or st.query_params.get('job')
+    
+    @staticmethod
+    def render_job(queue, identifier):
+        """
+        Show a verification job: its queue position and live analysis while
+        it runs (polled by a fragment), or the stored result once it is ready
+        """
+        job = queue.get(identifier)
+        if job is not None and job['state'] not in FINISHED_STATES:
+            BeautifulUI.poll_job(queue, identifier)
+            return
+        
+        if job is None:
+            # Pruned after JOB_RETENTION
+            BeautifulUI.forget_job()
+            return
+        
+        result = job['result']
+        if result is None:
+            st.error(f"❌ Verification failed: {job['error']}")
+            return
+        
+        article = result.get('article')
+        st.session_state.last_query = article['text'] if article is not None else job['payload']
+        if article is not None:
+            details = [item for item in (article['title'], article['byline'], article['published']) if item]
+            if details:
+                st.caption("📰 " + " • ".join(details))
+            st.text_area("Extracted text:", value=article['text'], height=100, disabled=True)
+        BeautifulUI.render_results(result)
+    
+    @staticmethod
+    @st.fragment(run_every=AppConfig.JOB_POLL_INTERVAL)
+    def poll_job(queue, identifier):
+        """
+        Progress of an unfinished job, re-run every JOB_POLL_INTERVAL seconds
+        without blocking the rest of the page; reruns the app when it finishes
+        """
+        job = queue.get(identifier)
+        if job is None or job['state'] in FINISHED_STATES:
+            st.rerun()
+        
+        progress = job['progress']
+        if progress is not None and progress['type'] == 'claims':
+            st.info(f"🧩 Checked {progress['done']} of {progress['total']} claims from the article...")
+        elif progress is not None:
+            BeautifulUI.render_live_analysis(progress)
+        elif job['state'] == QUEUED and job['ahead']:
+            st.info(f"⏳ Waiting in the queue - {job['ahead']} verifications ahead")
+        elif job['kind'] == 'url' and job['state'] == QUEUED:
+            st.info("🔗 Extracting text from URL...")
+        else:
+            st.info("🤖 AI is analyzing the news claim...")
+    
+    @staticmethod
+    def render_live_analysis(update):
+        """Render the partially received analysis"""
+        st.markdown("### 📊 Verification Results")
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.metric("📊 Verification Status", update['status'] or "⏳ Analyzing...")
+        
+        with col2:
+            confidence = update['confidence']
+            st.metric("🎯 Confidence Level", f"{confidence}%" if confidence is not None else "⏳")
+        
+        st.markdown("### 🧠 Detailed AI Analysis")
+        for name in SECTION_NAMES:
+            content = update['sections'].get(name)
+            if content is None:
+                continue
+            writing = " ✍️" if name == update['current_section'] else ""
+            st.markdown(f"**{name.replace('_', ' ').title()}**{writing}")
+            st.markdown(content)
     
     @staticmethod
     def render_results(result_data):
@@ -424,6 +1739,37 @@ class BeautifulUI:
                 help="When this analysis was performed"
             )
         
+        timings = result_data.get('timings')
+        if timings:
+            st.caption(f"⏱️ First verdict in {timings['first_verdict_ms'] / 1000:.2f}s • full analysis in {timings['total_ms'] / 1000:.2f}s")
+        
+        if result_data.get('near_duplicate'):
+            st.caption(f"♻️ Matched a recently verified claim ({result_data['similarity']:.0%} similar) - verdict reused from the cache")
+        elif result_data.get('fact_check'):
+            fact_check = result_data['fact_check']
+            st.caption(f"📰 Matched a published fact-check by {fact_check['source'] or 'a fact-checker'} "
+                       f"(rated {fact_check['rating']}) - no AI analysis was needed")
+        elif result_data.get('triage'):
+            st.caption("⚡ Answered instantly by the local triage model - no full AI analysis was needed")
+        elif result_data.get('cache_hit'):
+            st.caption("⚡ Served from the verdict cache - this claim was analyzed recently")
+        elif result_data.get('coalesced'):
+            st.caption("🔗 Shared the analysis of an identical claim that was already being verified")
+        
+        # Per-claim verdicts for articles
+        claims = result_data.get('claims')
+        if claims:
+            st.markdown("### 🧩 Claim-by-Claim Verdicts")
+            if result_data.get('article_score') is not None:
+                st.progress(result_data['article_score'] / 100,
+                            text=f"📰 Article credibility score: {result_data['article_score']}/100")
+            for claim in claims:
+                claim_icon, _ = status_icons.get(claim['status'], ('⚪', '#95A5A6'))
+                with st.expander(f"{claim_icon} {claim['status']} ({claim['confidence']}%) - {claim['claim']}"):
+                    if claim.get('cache_hit') or claim.get('coalesced'):
+                        st.caption("⚡ Already verified for another article or claim - analysis reused")
+                    st.markdown(claim['analysis'])
+        
         # Detailed analysis
         st.markdown("### 🧠 Detailed AI Analysis")
         with st.expander("📖 Click to view full analysis", expanded=True):
@@ -462,6 +1808,8 @@ class BeautifulUI:
                 'confidence': f"{result_data['confidence']}%",
                 'analysis': result_data['analysis'],
                 'timestamp': result_data['timestamp'],
+                'claims': [{'claim': claim['claim'], 'status': claim['status'], 'confidence': f"{claim['confidence']}%"}
+                           for claim in result_data.get('claims') or []],
                 'recommended_sources': AppConfig.TRUSTED_SOURCES,
                 'disclaimer': 'This is an AI-assisted analysis. Always verify with multiple sources.'
             }
@@ -487,34 +1835,38 @@ def main():
     # Setup page
     BeautifulUI.setup_page_config()
     
-    # Initialize session state
-    if 'verifier' not in st.session_state:
-        st.session_state.verifier = IndianNewsVerifier()
+    # Shared engine - built once per process in the background, so the page paints
+    # right away; None until the first build finishes
+    engine = get_shared_engine()
+    verifier = engine.get(wait=False)
+    start_metrics_server()
+    get_feed_monitor()
     
     # Render UI components
+    BeautifulUI.render_engine_status(verifier)
     BeautifulUI.render_header()
-    BeautifulUI.render_sidebar()
+    BeautifulUI.render_sidebar(verifier)
     
     # Main content area
-    news_text, verify_clicked, is_example = BeautifulUI.render_verification_form()
+    kind, news_text, verify_clicked, is_example = BeautifulUI.render_verification_form()
     
-    # Process verification
+    # Verifications run on the job queue's workers; this run only submits and polls,
+    # so a rerun or reconnect picks the same job up again
+    queue = get_job_queue()
     if (verify_clicked and news_text.strip()) or is_example:
-        st.session_state.last_query = news_text
-        
-        with st.spinner("🤖 AI is analyzing the news claim..."):
-            # Add realistic delay for better UX
-            time.sleep(1)
-            
-            # Perform verification
-            result = st.session_state.verifier.verify_news(news_text)
-            
-        # Display results
-        BeautifulUI.render_results(result)
+        if kind == 'url':
+            identifier = queue.submit('url', news_text.split('#', 1)[0])
+        else:
+            identifier = queue.submit('claim', news_text, key=claim_key(news_text))
+        BeautifulUI.remember_job(identifier)
     
     elif verify_clicked and not news_text.strip():
         st.warning("⚠️ Please enter some news text to verify!")
     
+    identifier = BeautifulUI.current_job()
+    if identifier:
+        BeautifulUI.render_job(queue, identifier)
+    
     # Footer
     st.markdown("---")
     st.markdown("""
@@ -0,0 +1,144 @@
+"""
+🇮🇳 INDIAN NEWS VERIFIER - STARTUP TIME
+=======================================
+Measure cold-start cost in fresh interpreters, as a container would see it:
+
+- import time of main_beautiful, broken down by the modules it imports
+  directly and by top-level package (python -X importtime)
+- time until the app has rendered its first page once streamlit itself is
+  loaded (streamlit's AppTest runner), and whether the AI engine was
+  still warming up at that point
+
+Usage:
+    python measure_startup.py
+    python measure_startup.py --runs 5 --top 15 --json startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+FIRST_RENDER_SCRIPT = """
+import json, time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file('main_beautiful.py', default_timeout=120)
+loaded = time.perf_counter()
+app.run()
+rendered = time.perf_counter()
+print(json.dumps({
+    'first_render_ms': (rendered - loaded) * 1000,
+    'exception': [str(e.value) for e in app.exception],
+    'engine_warming': any('Warming up' in info.value for info in app.info),
+}))
+"""
+
+
+def run_python(args):
+    completed = subprocess.run([sys.executable] + args, cwd=APP_DIR, capture_output=True, text=True, timeout=300)
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else
+                           f"exit status {completed.returncode}")
+    return completed
+
+
+def parse_importtime(output):
+    """Rows of (depth, module, self_us, cumulative_us) from -X importtime output"""
+    rows = []
+    for line in output.splitlines():
+        fields = line[len('import time:'):].split('|')
+        if not line.startswith('import time:') or len(fields) != 3 or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = fields
+        # One space after the separator, then two per nesting level
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        rows.append((depth, name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def import_breakdown(top):
+    """Import cost of main_beautiful in a fresh interpreter"""
+    rows = parse_importtime(run_python(['-X', 'importtime', '-c', 'import main_beautiful']).stderr)
+    app = next((row for row in rows if row[1] == 'main_beautiful'), None)
+    if app is None:
+        raise RuntimeError("main_beautiful did not appear in the import log")
+
+    # Modules are logged after their own imports, so main_beautiful's direct
+    # imports are the depth-1 rows just before it
+    position = rows.index(app)
+    direct = []
+    for depth, name, _, cumulative in reversed(rows[:position]):
+        if depth == 0:
+            break
+        if depth == 1:
+            direct.append((name, cumulative))
+
+    packages = {}
+    for _, name, self_us, _ in rows:
+        package = name.split('.', 1)[0]
+        packages[package] = packages.get(package, 0) + self_us
+
+    return {
+        'total_ms': round(app[3] / 1000, 1),
+        'modules': [{'module': name, 'ms': round(us / 1000, 1)}
+                    for name, us in sorted(direct, key=lambda item: -item[1])[:top]],
+        'packages': [{'package': name, 'ms': round(us / 1000, 1)}
+                     for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top]],
+    }
+
+
+def first_render():
+    """One fresh-interpreter run of the app up to its first complete page"""
+    return json.loads(run_python(['-c', FIRST_RENDER_SCRIPT]).stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure import and first-render time of the app")
+    parser.add_argument('--runs', type=int, default=3, help="Fresh interpreters per measurement (median)")
+    parser.add_argument('--top', type=int, default=12, help="Modules and packages to list")
+    parser.add_argument('--json', help="Also write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    try:
+        imports = [import_breakdown(args.top) for _ in range(args.runs)]
+        renders = [first_render() for _ in range(args.runs)]
+    except (RuntimeError, subprocess.TimeoutExpired) as e:
+        print(f"❌ Measurement failed: {e}", file=sys.stderr)
+        return 1
+
+    # Report the run with the median total import time
+    typical = sorted(imports, key=lambda report: report['total_ms'])[len(imports) // 2]
+    report = {
+        'runs': args.runs,
+        'import_ms': statistics.median(report['total_ms'] for report in imports),
+        'first_render_ms': round(statistics.median(render['first_render_ms'] for render in renders), 1),
+        'engine_warming_at_first_render': all(render['engine_warming'] for render in renders),
+        'render_exceptions': sorted({error for render in renders for error in render['exception']}),
+        'modules': typical['modules'],
+        'packages': typical['packages'],
+    }
+
+    print(f"📦 Import main_beautiful: {report['import_ms']:.0f} ms (median of {args.runs})")
+    print(f"{'module imported by the app':<40}{'ms':>9}")
+    for row in report['modules']:
+        print(f"  {row['module']:<38}{row['ms']:>9.1f}")
+    print(f"{'top-level package (self time)':<40}{'ms':>9}")
+    for row in report['packages']:
+        print(f"  {row['package']:<38}{row['ms']:>9.1f}")
+    print(f"🖥️  First render: {report['first_render_ms']:.0f} ms"
+          + (" (engine still warming up in the background)" if report['engine_warming_at_first_render'] else ""))
+    for error in report['render_exceptions']:
+        print(f"❌ Render error: {error}", file=sys.stderr)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""
+VERIFICATION METRICS
+====================
+In-process latency histograms and counters for the verification hot path,
+exported in the Prometheus text format.
+
+- stage(name) times one stage (fetch, extract, split, cache, fact_check, triage,
+  prompt, quota_wait, model, parse, total) into a fixed-bucket histogram.
+- Verdicts are counted by status and by where the answer came from;
+  failures are counted by error type.
+- Engine figures (cache, models, rate limits, coalescing, tokens) are added as gauges
+  at export time by the caller.
+- profile_next() arms cProfile for exactly one verification; the report
+  is kept as text for the admin panel and API.
+"""
+
+import cProfile
+import io
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+STAGES = ('fetch', 'extract', 'split', 'cache', 'fact_check', 'triage', 'prompt', 'quota_wait', 'model', 'parse', 'total')
+
+
+class Histogram:
+    """Cumulative-bucket latency histogram; thread-safe"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        index = len(self.buckets)
+        for position, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                index = position
+                break
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += seconds
+
+    def snapshot(self):
+        """(cumulative bucket counts incl. +Inf, count, sum)"""
+        with self._lock:
+            counts, count, total = list(self.counts), self.count, self.sum
+        cumulative, running = [], 0
+        for value in counts:
+            running += value
+            cumulative.append(running)
+        return cumulative, count, total
+
+    def quantile(self, share):
+        """Estimated quantile in seconds (linear within a bucket), or None without data"""
+        cumulative, count, _ = self.snapshot()
+        if not count:
+            return None
+        rank = share * count
+        lower, previous = 0.0, 0
+        for bound, running in zip(self.buckets + (self.buckets[-1],), cumulative):
+            if running >= rank:
+                inside = running - previous
+                return lower + (bound - lower) * ((rank - previous) / inside if inside else 1.0)
+            lower, previous = bound, running
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    """Stage histograms, labelled counters and a one-shot profiler"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.stages = {}
+        self.verdicts = {}
+        self.errors = {}
+        self.started_at = time.time()
+        self.last_profile = None
+        self._profile_armed = False
+        self._lock = threading.Lock()
+
+    # ---------- recording ----------
+
+    def histogram(self, stage):
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.stages.setdefault(stage, Histogram(self.buckets))
+        return histogram
+
+    def observe(self, stage, seconds):
+        self.histogram(stage).observe(seconds)
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block into the `name` stage histogram"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(name).observe(time.perf_counter() - started)
+
+    def count_verdict(self, status, source):
+        with self._lock:
+            key = (status, source)
+            self.verdicts[key] = self.verdicts.get(key, 0) + 1
+
+    def count_error(self, error_type):
+        with self._lock:
+            self.errors[error_type] = self.errors.get(error_type, 0) + 1
+
+    def record_result(self, result):
+        """Count a verification result by status and source, or by error type"""
+        if not result.get('success'):
+            self.count_error(result.get('error_type') or 'error')
+            return
+        self.count_verdict(result.get('status') or 'UNKNOWN', result_source(result))
+
+    def counters(self):
+        """Copies of the verdict counts {(status, source): n} and error counts {type: n}"""
+        with self._lock:
+            return dict(self.verdicts), dict(self.errors)
+
+    # ---------- profiling ----------
+
+    def profile_next(self):
+        """Profile the next verification only"""
+        with self._lock:
+            self._profile_armed = True
+
+    @property
+    def profile_armed(self):
+        return self._profile_armed
+
+    @contextmanager
+    def maybe_profile(self, label=''):
+        """Run the block under cProfile if a profile was armed; keeps the top functions as text"""
+        with self._lock:
+            armed, self._profile_armed = self._profile_armed, False
+        if not armed:
+            yield
+            return
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is active in this process; skip rather than fail the request
+            yield
+            return
+        try:
+            yield
+        finally:
+            profiler.disable()
+            report = io.StringIO()
+            pstats.Stats(profiler, stream=report).sort_stats('cumulative').print_stats(30)
+            self.last_profile = {
+                'label': label,
+                'profiled_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'seconds': round(time.perf_counter() - started, 4),
+                'report': report.getvalue(),
+            }
+
+    # ---------- export ----------
+
+    def summary(self):
+        """Per-stage count, mean and estimated p50/p95 in milliseconds"""
+        report = {}
+        for stage in sorted(self.stages, key=lambda s: STAGES.index(s) if s in STAGES else len(STAGES)):
+            histogram = self.stages[stage]
+            _, count, total = histogram.snapshot()
+            if not count:
+                continue
+            report[stage] = {
+                'count': count,
+                'mean_ms': round(total / count * 1000, 1),
+                'p50_ms': round(histogram.quantile(0.5) * 1000, 1),
+                'p95_ms': round(histogram.quantile(0.95) * 1000, 1),
+            }
+        return report
+
+    def render_prometheus(self, gauges=()):
+        """
+        Prometheus text exposition (format 0.0.4).
+        `gauges` is an iterable of (name, help, labels dict, value) added as-is;
+        names ending in _total are typed as counters.
+        """
+        lines = [
+            '# HELP verification_stage_seconds Latency of each verification stage',
+            '# TYPE verification_stage_seconds histogram',
+        ]
+        for stage, histogram in sorted(self.stages.items()):
+            cumulative, count, total = histogram.snapshot()
+            for bound, running in zip(self.buckets, cumulative):
+                lines.append(f'verification_stage_seconds_bucket{{stage="{stage}",le="{bound:g}"}} {running}')
+            lines.append(f'verification_stage_seconds_bucket{{stage="{stage}",le="+Inf"}} {cumulative[-1]}')
+            lines.append(f'verification_stage_seconds_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'verification_stage_seconds_count{{stage="{stage}"}} {count}')
+
+        verdicts, errors = (sorted(counts.items()) for counts in self.counters())
+        lines += ['# HELP verifications_total Completed verifications by verdict status and answer source',
+                  '# TYPE verifications_total counter']
+        lines += [f'verifications_total{{status="{_escape(status)}",source="{source}"}} {value}'
+                  for (status, source), value in verdicts]
+        lines += ['# HELP verification_errors_total Failed verifications and URL extractions by error type',
+                  '# TYPE verification_errors_total counter']
+        lines += [f'verification_errors_total{{type="{_escape(error_type)}"}} {value}' for error_type, value in errors]
+
+        lines += ['# HELP process_start_time_seconds Start time of the process since the Unix epoch',
+                  '# TYPE process_start_time_seconds gauge',
+                  f'process_start_time_seconds {self.started_at:.3f}']
+
+        described = set()
+        for name, help_text, labels, value in sorted(gauges, key=lambda gauge: gauge[0]):
+            if value is None:
+                continue
+            if name not in described:
+                described.add(name)
+                kind = 'counter' if name.endswith('_total') else 'gauge'
+                lines += [f'# HELP {name} {help_text}', f'# TYPE {name} {kind}']
+            label_text = ','.join(f'{key}="{_escape(str(val))}"' for key, val in labels.items())
+            lines.append(f'{name}{{{label_text}}} {value}' if label_text else f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+def result_source(result):
+    """Where a verification result's answer came from"""
+    if result.get('coalesced'):
+        return 'coalesced'
+    if result.get('cache_hit') or result.get('near_duplicate'):
+        return 'cache'
+    if result.get('fact_check'):
+        return 'fact_check'
+    if result.get('triage'):
+        return 'triage'
+    return 'model'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# Process-wide registry; the module is imported once even when Streamlit reruns the app script
+METRICS = MetricsRegistry()
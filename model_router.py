@@ -0,0 +1,403 @@
+"""
+MODEL ROUTER
+============
+Routes generate_content calls across the configured Gemini models.
+
+- Rolling per-model latency (p50/p95) and error-rate statistics.
+- A circuit breaker per model: after repeated failures the model is skipped
+  for a cooldown, then a single live request is let through as a probe
+  (half-open); success closes the breaker, failure re-opens it.
+- Failover: a failed call moves on to the next available model in the
+  configured preference order.
+- Optional hedging: if the primary has not answered after its p95 latency,
+  the same request is sent to the next model and the first success wins.
+- Quota refusals (429) are raised as RateLimited without failover, for the
+  rate limiter to back off and retry.
+- Empty or safety-blocked answers are raised as EmptyResponse without
+  failover: every model would refuse the same prompt.
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class NoModelAvailable(Exception):
+    """Every configured model is failing or has an open circuit"""
+
+
+class RequestError(Exception):
+    """
+    A failure that says nothing about the model's health (e.g. a replayed
+    cassette has no answer); raised to the caller without failover and
+    without counting against the model.
+    """
+
+
+class EmptyResponse(RequestError):
+    """
+    The model answered without usable text: no candidates, or a prompt
+    blocked by the safety filters. Another model would refuse it too.
+    """
+
+
+class RateLimited(RequestError):
+    """
+    The API refused the call for quota reasons (HTTP 429, resource
+    exhausted). Raised without failover or breaker penalty so the rate
+    limiter can back off; `retry_after` is the API's hint in seconds, if any.
+    """
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+RATE_LIMIT_PATTERN = re.compile(r'\b429\b|quota|rate.?limit|resource.?exhausted|too many requests', re.IGNORECASE)
+RETRY_AFTER_PATTERN = re.compile(r'retry[^0-9]{0,40}?(\d+(?:\.\d+)?)', re.IGNORECASE)
+
+
+def is_rate_limited(error):
+    """Whether an exception from the SDK is a 429 / quota refusal"""
+    if type(error).__name__ in ('ResourceExhausted', 'TooManyRequests'):
+        return True
+    if getattr(error, 'code', None) == 429:
+        return True
+    return bool(RATE_LIMIT_PATTERN.search(str(error)))
+
+
+def retry_after_hint(error):
+    """Seconds the API asked us to wait (Retry-After header or 'retry in Ns' text), or None"""
+    headers = getattr(getattr(error, 'response', None), 'headers', None)
+    if headers and headers.get('Retry-After'):
+        try:
+            return float(headers['Retry-After'])
+        except ValueError:
+            pass
+    match = RETRY_AFTER_PATTERN.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+def _as_rate_limited(error):
+    return RateLimited(str(error), retry_after_hint(error))
+
+
+class ModelStats:
+    """Rolling window of latencies and outcomes for one model; thread-safe"""
+
+    def __init__(self, window=50):
+        self._latencies = deque(maxlen=window)
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+
+    def record(self, seconds, ok):
+        with self._lock:
+            self.requests += 1
+            self._outcomes.append(ok)
+            if ok:
+                self._latencies.append(seconds)
+            else:
+                self.failures += 1
+
+    def percentile(self, share):
+        """Latency percentile in seconds over successful calls, or None without data"""
+        with self._lock:
+            if not self._latencies:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+    @property
+    def error_rate(self):
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return 1 - sum(self._outcomes) / len(self._outcomes)
+
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` consecutive failures; half-open probe after `cooldown` seconds"""
+
+    def __init__(self, failure_threshold=3, cooldown=30.0, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self.state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def _cooled_down(self):
+        return self.state == OPEN and self._clock() - self._opened_at >= self.cooldown
+
+    def available(self):
+        """Whether a request could be sent now (does not claim the probe slot)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            return self._cooled_down() or (self.state == HALF_OPEN and not self._probe_in_flight)
+
+    def acquire(self):
+        """Claim permission to send; when half-open only one probe is let through"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self._cooled_down():
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def release(self):
+        """Give back a claimed probe slot without an outcome"""
+        with self._lock:
+            self._probe_in_flight = False
+    
+    def success(self):
+        with self._lock:
+            self.state = CLOSED
+            self._consecutive_failures = 0
+            self._probe_in_flight = False
+
+    def failure(self):
+        with self._lock:
+            self._consecutive_failures += 1
+            if self.state == HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self.state = OPEN
+                self._opened_at = self._clock()
+            self._probe_in_flight = False
+
+
+class _Route:
+    """One model with its stats and breaker"""
+
+    __slots__ = ('name', 'model', 'stats', 'breaker')
+
+    def __init__(self, name, model, stats, breaker):
+        self.name = name
+        self.model = model
+        self.stats = stats
+        self.breaker = breaker
+
+
+class ModelRouter:
+    """
+    Front for GenerativeModel.generate_content across several models.
+    `models` is a list of (name, model) in order of preference; calls
+    return (response, name of the model that answered). `clock` drives the
+    breaker cooldowns (injectable for tests).
+    """
+
+    def __init__(self, models, failure_threshold=3, cooldown=30.0, window=50, hedge=False,
+                 hedge_min_delay=0.5, hedge_max_delay=8.0, max_workers=16, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.clock = clock
+        self.window = window
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_max_delay = hedge_max_delay
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        self._routes = []
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='model-hedge')
+        self.set_models(models)
+
+    def set_models(self, models):
+        """Replace the model list, keeping stats and breaker state for names already known"""
+        with self._lock:
+            known = {route.name: route for route in self._routes}
+            self._routes = [
+                _Route(name, model,
+                       known[name].stats if name in known else ModelStats(self.window),
+                       known[name].breaker if name in known
+                       else CircuitBreaker(self.failure_threshold, self.cooldown, self.clock))
+                for name, model in models
+            ]
+
+    @property
+    def model_names(self):
+        return [route.name for route in self._routes]
+
+    def record(self, name, seconds, ok):
+        """Feed an outcome observed outside the router (e.g. the startup probe)"""
+        for route in self._routes:
+            if route.name == name:
+                self._finish(route, seconds, ok)
+
+    def _finish(self, route, seconds, ok):
+        route.stats.record(seconds, ok)
+        if ok:
+            route.breaker.success()
+        else:
+            route.breaker.failure()
+
+    def _available(self):
+        """Routes whose breaker lets a request through, in preference order"""
+        return [route for route in self._routes if route.breaker.available()]
+
+    def _call(self, route, prompt, kwargs):
+        if not route.breaker.acquire():
+            raise NoModelAvailable(f"{route.name} is unavailable (circuit open)")
+        started = time.perf_counter()
+        try:
+            response = route.model.generate_content(prompt, **kwargs)
+        except RequestError:
+            route.breaker.release()
+            raise
+        except Exception as e:
+            if is_rate_limited(e):
+                route.breaker.release()
+                raise _as_rate_limited(e) from e
+            self._finish(route, time.perf_counter() - started, False)
+            raise
+        try:
+            # .text raises ValueError when the prompt or answer was blocked
+            text = response.text if response is not None else ''
+        except ValueError as e:
+            route.breaker.release()
+            raise EmptyResponse(f"Blocked response: {e}") from e
+        if not text:
+            route.breaker.release()
+            raise EmptyResponse("Empty response")
+        self._finish(route, time.perf_counter() - started, True)
+        return response
+
+    def _hedge_delay(self, route):
+        p95 = route.stats.percentile(0.95)
+        delay = self.hedge_max_delay if p95 is None else p95
+        return min(max(delay, self.hedge_min_delay), self.hedge_max_delay)
+
+    def generate_content(self, prompt, **kwargs):
+        """Non-streaming call with failover (and hedging when enabled); returns (response, model name)"""
+        if kwargs.get('stream'):
+            raise ValueError("use stream_content() for streaming calls")
+        routes = self._available()
+        if not routes:
+            raise NoModelAvailable("All AI models are temporarily unavailable, please retry shortly")
+
+        last_error = None
+        while routes:
+            route = routes.pop(0)
+            if self.hedge and routes:
+                try:
+                    return self._hedged(route, routes, prompt, kwargs)
+                except RequestError:
+                    raise
+                except Exception as e:
+                    last_error = e
+                    continue
+            try:
+                return self._call(route, prompt, kwargs), route.name
+            except RequestError:
+                raise
+            except Exception as e:
+                last_error = e
+        raise last_error
+
+    def _hedged(self, primary, others, prompt, kwargs):
+        """Send to `primary`; after its p95 also send to the next model; first success wins"""
+        futures = {self._executor.submit(self._call, primary, prompt, kwargs): primary}
+        done, _ = wait(futures, timeout=self._hedge_delay(primary))
+        if not done:
+            backup = others.pop(0)
+            with self._lock:
+                self.hedged_requests += 1
+            futures[self._executor.submit(self._call, backup, prompt, kwargs)] = backup
+
+        last_error = None
+        pending = set(futures)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except RequestError:
+                    raise
+                except Exception as e:
+                    last_error = e
+                    continue
+                if futures[future] is not primary:
+                    with self._lock:
+                        self.hedge_wins += 1
+                # The slower call finishes in the background and still updates its stats
+                return response, futures[future].name
+        raise last_error
+
+    def stream_content(self, prompt, **kwargs):
+        """
+        Streaming call with failover before the first chunk.
+        Returns (chunk iterator, model name); errors after the first chunk
+        are raised to the caller and recorded against the model.
+        """
+        kwargs = dict(kwargs, stream=True)
+        routes = self._available()
+        if not routes:
+            raise NoModelAvailable("All AI models are temporarily unavailable, please retry shortly")
+
+        last_error = None
+        for route in routes:
+            if not route.breaker.acquire():
+                continue
+            started = time.perf_counter()
+            try:
+                stream = iter(route.model.generate_content(prompt, **kwargs))
+                first = next(stream)
+            except StopIteration:
+                route.breaker.release()
+                raise EmptyResponse("Empty response") from None
+            except RequestError:
+                route.breaker.release()
+                raise
+            except Exception as e:
+                if is_rate_limited(e):
+                    route.breaker.release()
+                    raise _as_rate_limited(e) from e
+                self._finish(route, time.perf_counter() - started, False)
+                last_error = e
+                continue
+            return self._watch_stream(route, started, first, stream), route.name
+        raise last_error or NoModelAvailable("All AI models are temporarily unavailable, please retry shortly")
+
+    def _watch_stream(self, route, started, first, stream):
+        try:
+            yield first
+            for chunk in stream:
+                yield chunk
+        except GeneratorExit:
+            # The caller stopped reading; the model itself answered fine
+            self._finish(route, time.perf_counter() - started, True)
+            raise
+        except Exception:
+            self._finish(route, time.perf_counter() - started, False)
+            raise
+        self._finish(route, time.perf_counter() - started, True)
+
+    def stats(self):
+        """Per-model state and rolling latency/error figures"""
+        report = []
+        for route in self._routes:
+            p50 = route.stats.percentile(0.5)
+            p95 = route.stats.percentile(0.95)
+            report.append({
+                'model': route.name,
+                'state': route.breaker.state,
+                'requests': route.stats.requests,
+                'failures': route.stats.failures,
+                'error_rate': round(route.stats.error_rate, 3),
+                'p50_ms': round(p50 * 1000, 1) if p50 is not None else None,
+                'p95_ms': round(p95 * 1000, 1) if p95 is not None else None,
+            })
+        return report
@@ -0,0 +1,248 @@
+"""
+NEAR-DUPLICATE CLAIM INDEX
+==========================
+In-memory MinHash + LSH index over previously verified claims, so that
+reworded copies of a forwarded message can reuse an existing verdict.
+
+- Claims are shingled into character 5-grams of their normalized text and
+  summarized by a MinHash signature (b-bit: 16 bits per permutation).
+- Signatures are split into bands of 4 values; each band is hashed into a
+  fixed-size bucket table whose chains live in flat NumPy arrays, so memory
+  is bounded by `capacity` and does not grow with Python objects.
+- When the index is full the oldest claims are overwritten (ring buffer).
+- A small "guard" hash of numbers and negation words must match exactly,
+  so "X did not happen" never reuses the verdict for "X happened".
+- Snapshots only load into an index with the same capacity, permutations,
+  shingle size and seed; otherwise the caller rebuilds from the cache.
+"""
+
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+
+from verdict_cache import normalize_claim
+
+ROWS_PER_BAND = 4
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_SHINGLE_PRIME = np.uint64(1099511628211)
+_NUMBER_RE = re.compile(r'\d+(?:[.,]\d+)*')
+_NEGATIONS = frozenset([
+    'not', 'no', 'never', 'none', 'nobody', 'nothing', 'neither', 'nor',
+    'fake', 'false', 'hoax', 'denies', 'denied', 'deny', 'isnt', 'wasnt',
+    'dont', 'doesnt', 'didnt', 'cannot', 'cant', 'wont',
+    'नहीं', 'ना', 'न', 'कभी', 'झूठ', 'फर्जी',
+])
+
+
+class SnapshotMismatch(Exception):
+    """A snapshot was written by an index with a different layout"""
+
+
+class NearDuplicateMatch:
+    """A lookup hit: the stored cache key and the estimated Jaccard similarity"""
+
+    __slots__ = ('key', 'similarity')
+
+    def __init__(self, key, similarity):
+        self.key = key
+        self.similarity = similarity
+
+    def __repr__(self):
+        return f"NearDuplicateMatch(key={self.key[:12]}..., similarity={self.similarity:.3f})"
+
+
+class NearDuplicateIndex:
+    """
+    Bounded MinHash/LSH index mapping claims to verdict cache keys.
+    Thread-safe; lookups and inserts take a short lock.
+    """
+
+    def __init__(self, capacity=100000, num_perm=64, threshold=0.8, shingle_size=5, seed=1,
+                 max_chain=32):
+        if num_perm % ROWS_PER_BAND:
+            raise ValueError(f"num_perm must be a multiple of {ROWS_PER_BAND}")
+
+        self.capacity = int(capacity)
+        self.num_perm = int(num_perm)
+        self.bands = self.num_perm // ROWS_PER_BAND
+        self.threshold = float(threshold)
+        self.shingle_size = int(shingle_size)
+        self.seed = int(seed)
+        self.max_chain = int(max_chain)
+        self.table_bits = max(10, (self.capacity - 1).bit_length())
+
+        rng = np.random.default_rng(self.seed)
+        self._a = rng.integers(1, 2 ** 63, size=self.num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=self.num_perm, dtype=np.uint64)
+        self._band_salt = rng.integers(0, 2 ** 63, size=self.bands, dtype=np.uint64)
+        self._band_ids = np.arange(self.bands)
+
+        self._signatures = np.zeros((self.capacity, self.num_perm), dtype=np.uint16)
+        self._guards = np.zeros(self.capacity, dtype=np.uint32)
+        self._keys = np.zeros((self.capacity, 32), dtype=np.uint8)
+        self._seq = np.full(self.capacity, -1, dtype=np.int64)
+        self._heads = np.full((self.bands, 1 << self.table_bits), -1, dtype=np.int32)
+        self._next = np.full((self.bands, self.capacity), -1, dtype=np.int32)
+        self._inserted = 0
+        self._bind_views()
+
+        self._lock = threading.Lock()
+
+    def _bind_views(self):
+        """Flat memoryviews for the chain walk; indexing them is much cheaper than NumPy scalars"""
+        self._seq_view = memoryview(self._seq)
+        self._next_view = memoryview(self._next.reshape(-1))
+
+    def __len__(self):
+        return min(self._inserted, self.capacity)
+
+    # ---------- hashing ----------
+
+    def _shingles(self, text):
+        """Hashes of the character shingles of normalized text"""
+        codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+        k = self.shingle_size
+        if len(codes) <= k:
+            k = max(len(codes), 1)
+            if not len(codes):
+                codes = np.zeros(1, dtype=np.uint64)
+        count = len(codes) - k + 1
+        hashes = np.zeros(count, dtype=np.uint64)
+        for offset in range(k):
+            hashes = hashes * _SHINGLE_PRIME + codes[offset:offset + count]
+        return np.unique(hashes)
+
+    def _signature(self, claim):
+        """(MinHash signature, guard) for a claim"""
+        text = normalize_claim(claim)
+        shingles = self._shingles(text)
+        # Multiply-shift hashing: top 32 bits of a*x + b (mod 2**64)
+        hashed = (self._a[:, None] * shingles[None, :] + self._b[:, None]) >> np.uint64(32)
+        signature = hashed.min(axis=1).astype(np.uint16)
+        return signature, self._guard(text)
+
+    @staticmethod
+    def _guard(text):
+        """Hash of the numbers and negations in a normalized claim"""
+        markers = sorted(set(_NUMBER_RE.findall(text)) | (_NEGATIONS.intersection(text.split())))
+        return zlib.crc32('|'.join(markers).encode('utf-8'))
+
+    def _buckets(self, signature):
+        """Bucket index per band for a signature"""
+        rows = signature.astype(np.uint64).reshape(self.bands, ROWS_PER_BAND)
+        packed = rows[:, 0] | (rows[:, 1] << np.uint64(16)) | (rows[:, 2] << np.uint64(32)) | (rows[:, 3] << np.uint64(48))
+        mixed = (packed ^ self._band_salt) * _GOLDEN
+        return (mixed >> np.uint64(64 - self.table_bits)).astype(np.int64)
+
+    # ---------- public API ----------
+
+    def add(self, key, claim):
+        """Insert a claim under its verdict cache key (hex digest)"""
+        signature, guard = self._signature(claim)
+        buckets = self._buckets(signature)
+        with self._lock:
+            slot = self._inserted % self.capacity
+            self._signatures[slot] = signature
+            self._guards[slot] = guard
+            self._keys[slot] = np.frombuffer(bytes.fromhex(key), dtype=np.uint8)
+            self._seq[slot] = self._inserted
+            self._next[self._band_ids, slot] = self._heads[self._band_ids, buckets]
+            self._heads[self._band_ids, buckets] = slot
+            self._inserted += 1
+
+    def lookup(self, claim, threshold=None):
+        """Return the most similar stored claim above the threshold, or None"""
+        threshold = self.threshold if threshold is None else threshold
+        signature, guard = self._signature(claim)
+        buckets = self._buckets(signature)
+
+        with self._lock:
+            candidates = self._candidates(buckets)
+            if not candidates:
+                return None
+            ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+            similarity = (self._signatures[ids] == signature).mean(axis=1)
+            similarity[self._guards[ids] != guard] = 0.0
+            best = int(similarity.argmax())
+            if similarity[best] < threshold:
+                return None
+            return NearDuplicateMatch(self._keys[ids[best]].tobytes().hex(), float(similarity[best]))
+
+    def _candidates(self, buckets):
+        """Collect slot ids from the bucket chains (caller holds the lock)"""
+        candidates = set()
+        seq = self._seq_view
+        links = self._next_view
+        for band, slot in enumerate(self._heads[self._band_ids, buckets].tolist()):
+            offset = band * self.capacity
+            # Chains run from newest to oldest; a link to a newer sequence number
+            # points at a slot that has since been reused, so stop there.
+            previous = self._inserted
+            steps = 0
+            while slot >= 0 and steps < self.max_chain:
+                current = seq[slot]
+                if not 0 <= current < previous:
+                    break
+                candidates.add(slot)
+                previous = current
+                slot = links[offset + slot]
+                steps += 1
+        return candidates
+
+    def memory_bytes(self):
+        """Approximate size of the index arrays"""
+        arrays = (self._signatures, self._guards, self._keys, self._seq, self._heads, self._next)
+        return sum(array.nbytes for array in arrays)
+
+    # ---------- snapshot / restore ----------
+
+    def save(self, path):
+        """Write a snapshot atomically (NumPy .npz)"""
+        with self._lock:
+            state = {
+                'meta': np.array([self.capacity, self.num_perm, self.shingle_size, self.seed,
+                                  self.max_chain, self._inserted], dtype=np.int64),
+                'threshold': np.array([self.threshold]),
+                'signatures': self._signatures.copy(),
+                'guards': self._guards.copy(),
+                'keys': self._keys.copy(),
+                'seq': self._seq.copy(),
+                'heads': self._heads.copy(),
+                'next': self._next.copy(),
+            }
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, 'wb') as handle:
+            np.savez(handle, **state)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path, **settings):
+        """
+        Restore an index from a snapshot written by save(). `settings` are the
+        constructor arguments the caller is configured with; raises
+        SnapshotMismatch if the snapshot was built with a different capacity,
+        num_perm, shingle_size or seed (its slots and hashes would not fit).
+        """
+        index = cls(**settings)
+        with np.load(path) as state:
+            capacity, num_perm, shingle_size, seed, _, inserted = (int(v) for v in state['meta'])
+            stored = {'capacity': capacity, 'num_perm': num_perm, 'shingle_size': shingle_size, 'seed': seed}
+            changed = [f"{name} {value} != {getattr(index, name)}" for name, value in stored.items()
+                       if value != getattr(index, name)]
+            if changed:
+                raise SnapshotMismatch(f"Snapshot {path} does not match the index settings: {', '.join(changed)}")
+            index._signatures[:] = state['signatures']
+            index._guards[:] = state['guards']
+            index._keys[:] = state['keys']
+            index._seq[:] = state['seq']
+            index._heads[:] = state['heads']
+            index._next[:] = state['next']
+            index._inserted = inserted
+        return index
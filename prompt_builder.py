@@ -0,0 +1,248 @@
+"""
+TOKEN-BUDGETED PROMPTS
+======================
+Builds the per-request prompt for the verification model.
+
+- The fact-checker role and answer format live in SYSTEM_INSTRUCTION, which
+  is set once on the model, so each request carries only the claim.
+- The prompt sent to the model is counted with the model's own tokenizer
+  (count_tokens) when a counter is configured, else estimated locally.
+- Budgets for compaction always use the local estimate: sentence selection
+  sizes every sentence, which would otherwise cost a round trip each.
+- Claims over the budget are compacted by keeping the sentences most
+  relevant to the headline/lead, in their original order, instead of
+  cutting the text at a fixed character count.
+- TokenUsage tallies the input/output token counts the API reports.
+"""
+
+import re
+import threading
+
+from response_parser import JSON_RESPONSE_KEYS
+
+SYSTEM_INSTRUCTION = (
+    "You are an expert fact-checker for Indian news: politics, government, media, society "
+    "and common misinformation patterns in India.\n"
+    "Unless asked for JSON, answer in this format, each label starting a line:\n"
+    "VERIFICATION_STATUS: TRUE|FALSE|PARTIALLY_TRUE|UNVERIFIED\n"
+    "CONFIDENCE_SCORE: 0-100\n"
+    "DETAILED_ANALYSIS: why the claim is true or false\n"
+    "INDIAN_CONTEXT: relevance to Indian politics, society and current events\n"
+    "EVIDENCE_CHECK: evidence supporting or contradicting it\n"
+    "RECOMMENDED_SOURCES: Indian sources to verify it\n"
+    "RED_FLAGS: warning signs\n"
+    "CONCLUSION: final assessment"
+)
+
+STRUCTURED_SUFFIX = (
+    "Answer as one JSON object with keys " + ', '.join(JSON_RESPONSE_KEYS)
+    + "; verification_status is TRUE, FALSE, PARTIALLY_TRUE or UNVERIFIED, confidence_score an integer 0-100, "
+    "the other keys strings."
+)
+
+# Roughly one token per short word piece or punctuation mark. Gemini's
+# tokenizer averages about four characters per token on English and
+# Hinglish news text, so long words count as several pieces.
+TOKEN_PATTERN = re.compile(r'\w{1,4}|[^\w\s]')
+SENTENCE_PATTERN = re.compile(r'[^.!?।\n]+(?:[.!?।]+|\n|$)')
+WORD_PATTERN = re.compile(r'\w+')
+
+STOPWORDS = frozenset(
+    'a an and are as at be by for from has have in is it its of on or said says that the this to was were '
+    'will with after over about into new also more than their been'.split()
+)
+
+
+def estimate_tokens(text):
+    """
+    Local token estimate (no API call), used for compaction budgets and when
+    the model cannot count. It is not exact: errors only change how many
+    sentences fit a budget, and rate-limit reservations are settled with the
+    count the API reports.
+    """
+    return len(TOKEN_PATTERN.findall(text or ''))
+
+
+def split_sentences(text):
+    """Split text into trimmed sentences (handles the Devanagari danda)"""
+    return [sentence.strip() for sentence in SENTENCE_PATTERN.findall(text or '') if sentence.strip()]
+
+
+def _terms(text):
+    return {word for word in WORD_PATTERN.findall(text.lower()) if word not in STOPWORDS and len(word) > 2}
+
+
+def select_sentences(sentences, query, budget_tokens):
+    """
+    Pick the sentences most relevant to `query` that fit in budget_tokens,
+    returned in their original order. Relevance is term overlap with the
+    query plus a small bonus for early sentences and for figures, quotes
+    and named sources, which claims tend to hinge on.
+    """
+    query_terms = _terms(query)
+    scored = []
+    for position, sentence in enumerate(sentences):
+        terms = _terms(sentence)
+        score = len(terms & query_terms) / (len(query_terms) or 1)
+        score += 0.5 / (1 + position)
+        if re.search(r'\d', sentence):
+            score += 0.15
+        if re.search(r'["“”]|\b(said|according to|announced|claimed)\b', sentence, re.IGNORECASE):
+            score += 0.1
+        scored.append((score, position, sentence, estimate_tokens(sentence)))
+
+    chosen = []
+    used = 0
+    for score, position, sentence, tokens in sorted(scored, key=lambda item: (-item[0], item[1])):
+        if used + tokens > budget_tokens:
+            continue
+        chosen.append((position, sentence))
+        used += tokens
+    return [sentence for _, sentence in sorted(chosen)]
+
+
+def compact_text(text, budget_tokens, query=None):
+    """
+    Fit text into budget_tokens by sentence selection.
+    The query defaults to the first sentence (the headline or lead).
+    """
+    if estimate_tokens(text) <= budget_tokens:
+        return text
+    sentences = split_sentences(text)
+    if not sentences:
+        return text
+    selected = select_sentences(sentences, query or sentences[0], budget_tokens)
+    if not selected:
+        # A single sentence longer than the budget: keep its start
+        pieces = TOKEN_PATTERN.finditer(sentences[0])
+        end = 0
+        for count, piece in enumerate(pieces, start=1):
+            if count > budget_tokens:
+                break
+            end = piece.end()
+        return sentences[0][:end]
+    return ' '.join(selected)
+
+
+def compact_article(title, paragraphs, budget_tokens):
+    """Headline plus the body sentences most relevant to it, within budget_tokens"""
+    title = title or ''
+    sentences = [sentence for paragraph in paragraphs for sentence in split_sentences(paragraph)]
+    if not sentences:
+        return title
+    remaining = budget_tokens - estimate_tokens(title)
+    query = title or sentences[0]
+    body = ' '.join(select_sentences(sentences, query, max(remaining, 0)))
+    return f"{title} {body}".strip() if title else body
+
+
+class BuiltPrompt:
+    """Prompt text with its token count (counted by the model, or the local estimate)"""
+
+    __slots__ = ('text', 'estimated_tokens', 'compacted', 'counted')
+
+    def __init__(self, text, estimated_tokens, compacted=False, counted=False):
+        self.text = text
+        self.estimated_tokens = estimated_tokens
+        self.compacted = compacted
+        self.counted = counted
+
+
+class PromptBuilder:
+    """
+    Per-request prompts within a token budget; the static part is SYSTEM_INSTRUCTION.
+    `count_tokens(text)` optionally returns the model's token count for a request,
+    system instruction included; None or an error falls back to the estimate.
+    """
+
+    def __init__(self, claim_budget_tokens=600, evidence_budget_tokens=250, count_tokens=None):
+        self.claim_budget_tokens = claim_budget_tokens
+        self.evidence_budget_tokens = evidence_budget_tokens
+        self.count_tokens = count_tokens
+        self.system_tokens = estimate_tokens(SYSTEM_INSTRUCTION)
+
+    def build(self, news_claim, structured=False, evidence=None):
+        """
+        Prompt for one claim; long claims are compacted to the budget.
+        `evidence` is a list of related fact-check documents (dicts with
+        source, rating, title, claim, url), added within the evidence budget.
+        """
+        claim = ' '.join(news_claim.split())
+        compacted = False
+        if self.claim_budget_tokens and estimate_tokens(claim) > self.claim_budget_tokens:
+            claim = compact_text(claim, self.claim_budget_tokens)
+            compacted = True
+        text = f'Claim: "{claim}"'
+        if evidence:
+            text = f"{text}\n{self._evidence_block(evidence)}"
+        if structured:
+            text = f"{text}\n{STRUCTURED_SUFFIX}"
+        tokens = self._count(text)
+        if tokens is None:
+            return BuiltPrompt(text, self.system_tokens + estimate_tokens(text), compacted)
+        return BuiltPrompt(text, tokens, compacted, counted=True)
+
+    def _count(self, text):
+        """The model's token count for a request, or None to estimate locally"""
+        if self.count_tokens is None:
+            return None
+        try:
+            return self.count_tokens(text)
+        except Exception:
+            return None
+
+    def _evidence_block(self, evidence):
+        """Related published fact-checks, most relevant first, within evidence_budget_tokens"""
+        lines = ["Possibly related published fact-checks (use only if they match the claim):"]
+        used = estimate_tokens(lines[0])
+        for document in evidence:
+            checked = compact_text(document.get('claim') or document.get('title', ''), 60)
+            line = f"- {document.get('source') or 'Fact-check'} rated \"{document.get('rating')}\": {checked}"
+            if document.get('url'):
+                line += f" ({document['url']})"
+            tokens = estimate_tokens(line)
+            if used + tokens > self.evidence_budget_tokens:
+                break
+            lines.append(line)
+            used += tokens
+        return '\n'.join(lines)
+
+
+class TokenUsage:
+    """Thread-safe running totals of token usage reported by the API"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.estimated_input_tokens = 0
+
+    def record(self, response, estimated_input_tokens):
+        """Add one response's usage; returns the per-request usage dict"""
+        metadata = getattr(response, 'usage_metadata', None)
+        input_tokens = getattr(metadata, 'prompt_token_count', None) if metadata is not None else None
+        output_tokens = getattr(metadata, 'candidates_token_count', None) if metadata is not None else None
+        usage = {
+            'input_tokens': input_tokens if input_tokens is not None else estimated_input_tokens,
+            'output_tokens': output_tokens or 0,
+            'estimated_input_tokens': estimated_input_tokens,
+            'reported': input_tokens is not None
+        }
+        with self._lock:
+            self.requests += 1
+            self.input_tokens += usage['input_tokens']
+            self.output_tokens += usage['output_tokens']
+            self.estimated_input_tokens += estimated_input_tokens
+        return usage
+
+    def stats(self):
+        with self._lock:
+            requests = self.requests
+            return {
+                'requests': requests,
+                'input_tokens': self.input_tokens,
+                'output_tokens': self.output_tokens,
+                'avg_input_tokens': round(self.input_tokens / requests, 1) if requests else 0.0,
+                'avg_output_tokens': round(self.output_tokens / requests, 1) if requests else 0.0,
+            }
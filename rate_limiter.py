@@ -0,0 +1,265 @@
+"""
+AI API RATE LIMITER
+===================
+Process-wide quota manager for model calls.
+
+- Two token buckets: requests per minute and tokens per minute. A call
+  reserves its estimated tokens up front and settles the difference once
+  the API reports the real count.
+- Waiting calls queue by priority (interactive before batch, first come
+  first served within a priority); only the head of the queue draws from
+  the buckets, so a burst of batch work cannot starve the UI.
+- A 429 / quota error pauses every caller: the API's retry-after hint is
+  honoured when given, otherwise the pause grows exponentially with full
+  jitter. The call is then retried, up to max_retries times.
+- Queue depth, waits and rate-limit responses are reported by stats().
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+
+from model_router import RateLimited
+
+INTERACTIVE = 0
+BATCH = 1
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', BATCH: 'batch'}
+
+
+class QuotaWaitTimeout(Exception):
+    """A call gave up waiting for API quota"""
+
+
+class TokenBucket:
+    """
+    Refills at `per_minute` units per minute up to `capacity`. The level may
+    go negative when a reservation is larger than the capacity or a call
+    used more than it reserved; the debt is repaid by refilling.
+    Not thread-safe on its own (the limiter holds its lock).
+    """
+
+    def __init__(self, per_minute, capacity=None, clock=time.monotonic):
+        self.per_minute = per_minute
+        self.capacity = capacity or max(1.0, per_minute / 10)
+        self.level = self.capacity
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.per_minute / 60)
+        self._updated = now
+
+    def wait_time(self, amount):
+        """Seconds until `amount` (capped at the capacity) can be taken"""
+        self._refill()
+        missing = min(amount, self.capacity) - self.level
+        return max(0.0, missing * 60 / self.per_minute)
+
+    def take(self, amount):
+        self._refill()
+        self.level -= amount
+
+    def give_back(self, amount):
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+class Permit:
+    """Quota granted to one call"""
+
+    __slots__ = ('_limiter', 'tokens', 'waited')
+
+    def __init__(self, limiter, tokens, waited):
+        self._limiter = limiter
+        self.tokens = tokens
+        self.waited = waited
+
+    def settle(self, actual_tokens):
+        """Correct the token reservation with the count the API reported"""
+        if actual_tokens is None:
+            return
+        self._limiter._adjust_tokens(actual_tokens - self.tokens)
+        self.tokens = actual_tokens
+
+
+class RateLimiter:
+    """
+    Requests-per-minute and tokens-per-minute limits (0 disables either)
+    with a priority queue and shared backoff on rate-limit errors.
+    """
+
+    def __init__(self, requests_per_minute=0, tokens_per_minute=0, max_wait=120.0, max_retries=4,
+                 backoff_base=1.0, backoff_max=60.0, clock=time.monotonic):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._clock = clock
+        self._requests = TokenBucket(requests_per_minute, clock=clock) if requests_per_minute else None
+        self._tokens = TokenBucket(tokens_per_minute, clock=clock) if tokens_per_minute else None
+
+        self._cond = threading.Condition()
+        self._queue = []
+        self._sequence = itertools.count()
+        self._paused_until = 0.0
+        self._strikes = 0
+
+        self.granted = 0
+        self.delayed = 0
+        self.wait_seconds = 0.0
+        self.timeouts = 0
+        self.rate_limited = 0
+        self.retries = 0
+
+    # ---------- quota ----------
+
+    def acquire(self, tokens=0, priority=INTERACTIVE, timeout=None):
+        """
+        Block until the call may be sent and return its Permit.
+        Raises QuotaWaitTimeout after `timeout` seconds (default max_wait).
+        """
+        timeout = self.max_wait if timeout is None else timeout
+        ticket = (priority, next(self._sequence))
+        started = self._clock()
+        deadline = started + timeout if timeout else None
+
+        with self._cond:
+            heapq.heappush(self._queue, ticket)
+            try:
+                while True:
+                    now = self._clock()
+                    delay = self._delay(now, tokens) if self._queue[0] == ticket else None
+                    if delay is not None and delay <= 0:
+                        heapq.heappop(self._queue)
+                        self._take(tokens)
+                        waited = now - started
+                        self.granted += 1
+                        if waited > 0.001:
+                            self.delayed += 1
+                            self.wait_seconds += waited
+                        # The next caller in line may be able to go right away
+                        self._cond.notify_all()
+                        return Permit(self, tokens, waited)
+                    if deadline is not None:
+                        remaining = deadline - now
+                        if remaining <= 0 or (delay is not None and delay > remaining):
+                            self.timeouts += 1
+                            raise QuotaWaitTimeout(
+                                f"No AI quota available within {timeout:g}s; the service is busy, please retry shortly")
+                        delay = remaining if delay is None else delay
+                    self._cond.wait(delay)
+            except BaseException:
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+                    self._cond.notify_all()
+                raise
+
+    def _delay(self, now, tokens):
+        """Seconds the head of the queue still has to wait (caller holds the lock)"""
+        delay = self._paused_until - now
+        if self._requests is not None:
+            delay = max(delay, self._requests.wait_time(1))
+        if self._tokens is not None and tokens:
+            delay = max(delay, self._tokens.wait_time(tokens))
+        return delay
+
+    def _take(self, tokens):
+        if self._requests is not None:
+            self._requests.take(1)
+        if self._tokens is not None and tokens:
+            self._tokens.take(tokens)
+
+    def _adjust_tokens(self, difference):
+        if self._tokens is None or not difference:
+            return
+        with self._cond:
+            if difference > 0:
+                self._tokens.take(difference)
+            else:
+                self._tokens.give_back(-difference)
+                self._cond.notify_all()
+
+    # ---------- backoff ----------
+
+    def backoff(self, retry_after=None):
+        """
+        Pause every caller after a rate-limit response; returns the pause in
+        seconds. Uses the API's retry-after hint when given (plus a little
+        jitter so callers do not return together), otherwise exponential
+        backoff with full jitter.
+        """
+        with self._cond:
+            self._strikes += 1
+            self.rate_limited += 1
+            if retry_after:
+                delay = retry_after * random.uniform(1.0, 1.1)
+            else:
+                delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (self._strikes - 1)))
+            self._paused_until = max(self._paused_until, self._clock() + delay)
+            # The failed request did not spend its quota on an answer
+            if self._requests is not None:
+                self._requests.level = min(self._requests.level, 0.0)
+            return delay
+
+    def success(self):
+        """A call went through: reset the backoff exponent"""
+        if self._strikes:
+            with self._cond:
+                self._strikes = 0
+
+    def call(self, fn, tokens=0, priority=INTERACTIVE, timeout=None):
+        """
+        Run fn() under the limiter, retrying on RateLimited with backoff.
+        Returns (fn's result, Permit).
+        """
+        attempt = 0
+        while True:
+            permit = self.acquire(tokens, priority, timeout)
+            try:
+                result = fn()
+            except RateLimited as e:
+                self._adjust_tokens(-tokens)
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                with self._cond:
+                    self.retries += 1
+                self.backoff(e.retry_after)
+                continue
+            self.success()
+            return result, permit
+
+    # ---------- reporting ----------
+
+    def stats(self):
+        """Queue depth per priority, bucket levels, waits and rate-limit counts"""
+        with self._cond:
+            now = self._clock()
+            depth = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _ in self._queue:
+                name = PRIORITY_NAMES.get(priority, str(priority))
+                depth[name] = depth.get(name, 0) + 1
+            if self._requests is not None:
+                self._requests._refill()
+            if self._tokens is not None:
+                self._tokens._refill()
+            return {
+                'requests_per_minute': self.requests_per_minute,
+                'tokens_per_minute': self.tokens_per_minute,
+                'queue_depth': depth,
+                'requests_available': round(self._requests.level, 2) if self._requests is not None else None,
+                'tokens_available': round(self._tokens.level) if self._tokens is not None else None,
+                'backoff_remaining': round(max(0.0, self._paused_until - now), 2),
+                'granted': self.granted,
+                'delayed': self.delayed,
+                'avg_wait_ms': round(self.wait_seconds / self.delayed * 1000, 1) if self.delayed else 0.0,
+                'timeouts': self.timeouts,
+                'rate_limited': self.rate_limited,
+                'retries': self.retries,
+            }
@@ -0,0 +1,278 @@
+"""
+AI RESPONSE PARSING
+===================
+Parsers for the fact-check format requested by the analysis prompt:
+
+    VERIFICATION_STATUS: TRUE/FALSE/PARTIALLY_TRUE/UNVERIFIED
+    CONFIDENCE_SCORE: 0-100
+    DETAILED_ANALYSIS: / INDIAN_CONTEXT: / EVIDENCE_CHECK: /
+    RECOMMENDED_SOURCES: / RED_FLAGS: / CONCLUSION:
+
+Models often bold the labels (**CONFIDENCE_SCORE:** 85), wrap values in
+brackets, reorder sections or write the names with spaces; the patterns
+accept all of that. A label must start a line and be upper case or bold
+(**Conclusion:**), so analysis text such as "Conclusion: ..." does not
+open a section. With structured output enabled the model answers in
+JSON instead and parse_json_response() skips text parsing entirely.
+"""
+
+import json
+import re
+
+STATUSES = ('TRUE', 'FALSE', 'PARTIALLY_TRUE', 'UNVERIFIED')
+
+SECTION_NAMES = (
+    'DETAILED_ANALYSIS',
+    'INDIAN_CONTEXT',
+    'EVIDENCE_CHECK',
+    'RECOMMENDED_SOURCES',
+    'RED_FLAGS',
+    'CONCLUSION',
+)
+
+STATUS_PATTERN = re.compile(
+    r'VERIFICATION[ _]STATUS[*_]*\s*:\s*[*_\[\s]*(PARTIALLY[ _]TRUE|TRUE|FALSE|UNVERIFIED)\b',
+    re.IGNORECASE
+)
+CONFIDENCE_PATTERN = re.compile(
+    r'CONFIDENCE[ _]SCORE[*_]*\s*:\s*[*_\[\s]*(\d{1,3})(?!\d)',
+    re.IGNORECASE
+)
+
+
+def _label_pattern(names, lead):
+    """
+    Line-start label: upper case (optionally bold or underscored), or bold
+    in any case; the name is in group 1 or group 2 (see label_name)
+    """
+    alternatives = '|'.join(name.replace('_', '[ _]') for name in names)
+    return re.compile(
+        r'^' + lead + r'(?:[*_]*(' + alternatives + r')[*_ \t]*:'
+        r'|\*\*(?i:(' + alternatives + r'))(?:\*\*[ \t]*:|[ \t]*:\*\*))[*_ \t]*',
+        re.MULTILINE
+    )
+
+
+SECTION_HEADER_PATTERN = _label_pattern(SECTION_NAMES, r'[ \t>#]*')
+
+# Every label at the start of a line, for the single-pass parser
+LABEL_PATTERN = _label_pattern(('VERIFICATION_STATUS', 'CONFIDENCE_SCORE') + SECTION_NAMES, r'[ \t>#-]*')
+STATUS_VALUE_PATTERN = re.compile(r'[\[(\s]*(PARTIALLY[ _]TRUE|TRUE|FALSE|UNVERIFIED)\b', re.IGNORECASE)
+CONFIDENCE_VALUE_PATTERN = re.compile(r'[\[(\s]*(\d{1,3})(?!\d)')
+
+# JSON keys the model is asked for in structured-output mode
+JSON_RESPONSE_KEYS = ('verification_status', 'confidence_score') + tuple(name.lower() for name in SECTION_NAMES)
+
+# Default confidence per status when the model gives none
+DEFAULT_CONFIDENCE = {'TRUE': 85, 'FALSE': 90, 'PARTIALLY_TRUE': 70, 'UNVERIFIED': 30}
+
+# How far back to rescan on each chunk, so labels split across chunks are found
+_RESCAN_MARGIN = 80
+
+
+def canonical_name(label):
+    """'Detailed Analysis' / 'partially true' -> 'DETAILED_ANALYSIS' / 'PARTIALLY_TRUE'"""
+    return label.upper().replace(' ', '_')
+
+
+def label_name(match):
+    """Canonical label of a LABEL_PATTERN / SECTION_HEADER_PATTERN match"""
+    return canonical_name(match.group(1) or match.group(2))
+
+
+class ParsedResponse:
+    """Typed, compact result of parsing one model response"""
+
+    __slots__ = ('status', 'confidence', 'raw_text') + tuple(name.lower() for name in SECTION_NAMES)
+
+    def __init__(self, status='UNVERIFIED', confidence=50, raw_text='', **sections):
+        self.status = status
+        self.confidence = confidence
+        self.raw_text = raw_text
+        for name in SECTION_NAMES:
+            setattr(self, name.lower(), sections.get(name.lower(), ''))
+
+    def sections(self):
+        """Section texts keyed by their prompt label, in prompt order"""
+        return {name: getattr(self, name.lower()) for name in SECTION_NAMES}
+
+    def to_text(self):
+        """Readable text in the prompt's format (used for JSON responses)"""
+        lines = [f"VERIFICATION_STATUS: {self.status}", f"CONFIDENCE_SCORE: {self.confidence}", ""]
+        for name, content in self.sections().items():
+            if content:
+                lines.extend([f"{name}:", content, ""])
+        return '\n'.join(lines).strip()
+
+    def __repr__(self):
+        return f"ParsedResponse(status={self.status!r}, confidence={self.confidence})"
+
+
+def calibrate_confidence(status, extracted):
+    """
+    Keep the confidence consistent with the status: UNVERIFIED is capped at
+    50, and definite verdicts get sensible floors.
+    """
+    if status is None:
+        status, confidence = 'UNVERIFIED', 50
+    else:
+        confidence = DEFAULT_CONFIDENCE[status]
+
+    if extracted is not None:
+        # Only use extracted confidence if it makes sense with the status
+        if status == 'UNVERIFIED' and extracted > 50:
+            confidence = min(extracted, 50)
+        elif status in ('TRUE', 'FALSE', 'PARTIALLY_TRUE'):
+            confidence = extracted
+
+    # Ensure logical confidence ranges
+    if status == 'UNVERIFIED' and confidence > 50:
+        confidence = 30
+    elif status == 'TRUE' and confidence < 60:
+        confidence = 75
+    elif status == 'FALSE' and confidence < 70:
+        confidence = 80
+    elif status == 'PARTIALLY_TRUE' and confidence < 50:
+        confidence = 65
+    return status, confidence
+
+
+def parse_response(text):
+    """Parse a text response in one pass over its labels into a ParsedResponse"""
+    status = None
+    extracted = None
+    sections = {}
+    open_section = None
+    open_start = 0
+
+    for match in LABEL_PATTERN.finditer(text):
+        if open_section is not None:
+            sections.setdefault(open_section, text[open_start:match.start()].strip())
+            open_section = None
+
+        label = label_name(match)
+        if label == 'VERIFICATION_STATUS':
+            value = STATUS_VALUE_PATTERN.match(text, match.end())
+            if value and status is None:
+                status = canonical_name(value.group(1))
+        elif label == 'CONFIDENCE_SCORE':
+            value = CONFIDENCE_VALUE_PATTERN.match(text, match.end())
+            if value and extracted is None:
+                extracted = min(int(value.group(1)), 100)
+        else:
+            open_section, open_start = label.lower(), match.end()
+
+    if open_section is not None:
+        sections.setdefault(open_section, text[open_start:].strip())
+
+    # Labels written mid-line ("... VERIFICATION_STATUS: FALSE")
+    if status is None:
+        value = STATUS_PATTERN.search(text)
+        if value:
+            status = canonical_name(value.group(1))
+    if extracted is None:
+        value = CONFIDENCE_PATTERN.search(text)
+        if value:
+            extracted = min(int(value.group(1)), 100)
+
+    status, confidence = calibrate_confidence(status, extracted)
+    return ParsedResponse(status, confidence, text, **sections)
+
+
+def parse_json_response(text):
+    """Parse a structured (JSON) response; falls back to text parsing if it is not valid JSON"""
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return parse_response(text)
+    if not isinstance(data, dict):
+        return parse_response(text)
+
+    fields = {str(key).lower(): value for key, value in data.items()}
+    status = canonical_name(str(fields.get('verification_status', '')).strip('[] '))
+    if status not in STATUSES:
+        status = None
+    try:
+        extracted = min(max(int(fields.get('confidence_score')), 0), 100)
+    except (TypeError, ValueError):
+        extracted = None
+
+    sections = {}
+    for name in SECTION_NAMES:
+        value = fields.get(name.lower(), '')
+        if isinstance(value, list):
+            value = '\n'.join(f"- {item}" for item in value)
+        sections[name.lower()] = str(value).strip()
+
+    status, confidence = calibrate_confidence(status, extracted)
+    parsed = ParsedResponse(status, confidence, '', **sections)
+    parsed.raw_text = parsed.to_text()
+    return parsed
+
+
+class StreamingResponseParser:
+    """
+    Incremental parser for streamed model output.
+    feed() returns the names of the fields that changed: 'status',
+    'confidence' and/or section names, so a UI can update only those panes.
+    """
+
+    def __init__(self):
+        self.text = ''
+        self.status = None
+        self.confidence = None
+        self.sections = {}
+        self._headers = []  # (name, header_start, content_start), in text order
+
+    def feed(self, chunk):
+        """Add a chunk of streamed text; return the set of changed fields"""
+        if not chunk:
+            return set()
+        scan_from = max(0, len(self.text) - _RESCAN_MARGIN)
+        self.text += chunk
+        return self._scan(scan_from, final=False)
+
+    def finish(self):
+        """Flush values that were waiting for more text at the very end of the stream"""
+        return self._scan(max(0, len(self.text) - _RESCAN_MARGIN), final=True)
+
+    def _scan(self, scan_from, final):
+        changed = set()
+        text = self.text
+
+        if self.status is None:
+            match = STATUS_PATTERN.search(text)
+            if match and (final or match.end() < len(text)):
+                self.status = canonical_name(match.group(1))
+                changed.add('status')
+
+        if self.confidence is None:
+            match = CONFIDENCE_PATTERN.search(text)
+            # A number touching the end of the buffer may still be growing
+            if match and (final or match.end() < len(text)):
+                self.confidence = min(int(match.group(1)), 100)
+                changed.add('confidence')
+
+        known_starts = {start for _, start, _ in self._headers}
+        for match in SECTION_HEADER_PATTERN.finditer(text, scan_from):
+            if match.start() not in known_starts and (final or match.end() < len(text)):
+                self._headers.append((label_name(match), match.start(), match.end()))
+                known_starts.add(match.start())
+        self._headers.sort(key=lambda header: header[1])
+
+        for position, (name, _, content_start) in enumerate(self._headers):
+            if position + 1 < len(self._headers):
+                content_end = self._headers[position + 1][1]
+            else:
+                content_end = len(text)
+            content = text[content_start:content_end].strip()
+            if self.sections.get(name) != content:
+                self.sections[name] = content
+                changed.add(name)
+
+        return changed
+
+    @property
+    def current_section(self):
+        """Section currently being written, if any"""
+        return self._headers[-1][0] if self._headers else None
@@ -0,0 +1,96 @@
+"""
+SINGLE-FLIGHT COALESCING
+========================
+When several callers ask for the same thing at the same time, only the
+first (the leader) does the work; the others wait for its outcome.
+
+- Results and exceptions are both shared: if the leader fails, every
+  waiter sees the same error, and the key is released so the next caller
+  starts a fresh attempt (failures are never cached).
+- Waiters can give up after a timeout without affecting the leader.
+- Counters report how many calls led and how many were coalesced.
+"""
+
+import threading
+
+
+class FlightTimeout(Exception):
+    """A waiter gave up before the in-flight call finished"""
+
+
+class Flight:
+    """One in-flight call that waiters can block on"""
+
+    __slots__ = ('key', '_done', 'result', 'error', 'waiters')
+
+    def __init__(self, key):
+        self.key = key
+        self._done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+    def wait(self, timeout=None):
+        """Block until the leader finishes; returns its result or raises its error"""
+        if not self._done.wait(timeout):
+            raise FlightTimeout(f"Timed out after {timeout:g}s waiting for an identical request")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    """Per-key call coalescing; safe to share between threads"""
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.leaders = 0
+        self.coalesced = 0
+
+    def join(self, key):
+        """Returns (flight, is_leader). The leader must call finish() exactly once."""
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                self.coalesced += 1
+                return flight, False
+            flight = self._flights[key] = Flight(key)
+            self.leaders += 1
+            return flight, True
+
+    def finish(self, flight, result=None, error=None):
+        """Publish the leader's outcome and release the key"""
+        with self._lock:
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+        flight.result = result
+        flight.error = error
+        flight._done.set()
+
+    def do(self, key, function, *args, timeout=None, **kwargs):
+        """
+        Run function(*args, **kwargs) once per key at a time.
+        Returns (result, coalesced); waiters raise FlightTimeout after `timeout`.
+        """
+        flight, leader = self.join(key)
+        if not leader:
+            return flight.wait(timeout), True
+        try:
+            result = function(*args, **kwargs)
+        except BaseException as e:
+            self.finish(flight, error=e)
+            raise
+        self.finish(flight, result=result)
+        return result, False
+
+    def stats(self):
+        with self._lock:
+            calls = self.leaders + self.coalesced
+            return {
+                'leaders': self.leaders,
+                'coalesced': self.coalesced,
+                'coalesced_rate': round(self.coalesced / calls, 4) if calls else 0.0,
+                'in_flight': len(self._flights),
+            }
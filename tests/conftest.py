@@ -0,0 +1,62 @@
+"""Shared fixtures: the repository root on sys.path, a fake clock and fake models"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+
+class FakeClock:
+    """Manually advanced clock; callable like time.monotonic / time.time"""
+
+    def __init__(self, start=1000.0):
+        self.now = start
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            return self.now
+
+    def advance(self, seconds):
+        with self._lock:
+            self.now += seconds
+
+
+class ScriptedModel:
+    """
+    Fake GenerativeModel that answers from a script: each call takes the next
+    item (an exception is raised, anything else is returned); the last item
+    repeats. `calls` counts generate_content calls.
+    """
+
+    def __init__(self, *script):
+        self.script = list(script)
+        self.calls = 0
+
+    def generate_content(self, prompt, **kwargs):
+        self.calls += 1
+        outcome = self.script[min(self.calls, len(self.script)) - 1]
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def wait_until(condition, timeout=5.0):
+    """Poll `condition` until it is true (for state changes on other threads)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
@@ -0,0 +1,127 @@
+"""Caching, download limits and public-host checks in NewsFetcher, against a local HTTP server"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import fetcher as fetcher_module
+from fetcher import FetchError, NewsFetcher, check_public_url
+
+
+class _Handler(BaseHTTPRequestHandler):
+    requests_seen = []
+    stall = True
+
+    def do_GET(self):
+        self.requests_seen.append((self.path, self.headers.get('If-None-Match')))
+        if self.path.startswith('/redirect'):
+            self.send_response(302)
+            self.send_header('Location', self.path.split('to=', 1)[1])
+            self.end_headers()
+            return
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = b'<p>' + b'x' * 60000 + b'</p>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.path == '/slow' and _Handler.stall:
+            # First chunk, then stall past the fetcher's deadline
+            self.wfile.write(body[:20000])
+            self.wfile.flush()
+            time.sleep(0.6)
+        self.wfile.write(body[20000:] if self.path == '/slow' and _Handler.stall else body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.requests_seen = []
+    _Handler.stall = True
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_fetcher(tmp_path, **kwargs):
+    kwargs.setdefault('allow_private_hosts', True)
+    return NewsFetcher(cache_dir=str(tmp_path / 'http'), fresh_seconds=0, read_timeout=5, **kwargs)
+
+
+def test_page_cut_by_deadline_is_not_cached(tmp_path, server):
+    fetcher = make_fetcher(tmp_path, total_timeout=0.3)
+    page = fetcher.fetch(f"{server}/slow")
+    assert page.truncated
+    assert len(page.body) < 60007
+
+    # The next fetch downloads the whole page instead of revalidating the stub
+    _Handler.stall = False
+    page = fetcher.fetch(f"{server}/slow")
+    assert not page.truncated and not page.from_cache
+    assert len(page.body) == 60007
+    assert [validator for _, validator in _Handler.requests_seen] == [None, None]
+
+
+def test_page_cut_by_max_bytes_is_cached_and_revalidated(tmp_path, server):
+    fetcher = make_fetcher(tmp_path, max_bytes=16384)
+    first = fetcher.fetch(f"{server}/big")
+    assert first.truncated and len(first.body) == 16384
+
+    second = fetcher.fetch(f"{server}/big")
+    assert second.from_cache and second.truncated
+    assert second.body == first.body
+    assert _Handler.requests_seen[-1] == ('/big', '"v1"')
+
+
+@pytest.mark.parametrize('url', [
+    'http://127.0.0.1/', 'http://localhost:8000/admin', 'http://169.254.169.254/latest/meta-data/',
+    'http://10.1.2.3/', 'http://192.168.0.1/', 'http://[::1]/', 'http://[::ffff:127.0.0.1]/',
+    'http://0.0.0.0/', 'http://2130706433/', 'file:///etc/passwd',
+])
+def test_non_public_urls_are_refused(url):
+    with pytest.raises(FetchError):
+        check_public_url(url)
+
+
+def test_private_host_refused_before_connecting(tmp_path, server):
+    fetcher = make_fetcher(tmp_path, allow_private_hosts=False)
+    with pytest.raises(FetchError, match="non-public"):
+        fetcher.fetch(f"{server}/big")
+    assert _Handler.requests_seen == []
+
+
+def test_redirect_to_private_host_refused(tmp_path, server, monkeypatch):
+    # Treat the test server as public; every other hop gets the real check
+    checked = []
+
+    def check(url):
+        checked.append(url)
+        if not url.startswith(server):
+            check_public_url(url)
+
+    monkeypatch.setattr(fetcher_module, 'check_public_url', check)
+    fetcher = make_fetcher(tmp_path, allow_private_hosts=False)
+
+    page = fetcher.fetch(f"{server}/redirect?to=/big")
+    assert page.final_url == f"{server}/big"
+
+    with pytest.raises(FetchError, match="non-public"):
+        fetcher.fetch(f"{server}/redirect?to=http://169.254.169.254/latest/meta-data/")
+    assert checked[-1] == "http://169.254.169.254/latest/meta-data/"
+
+
+def test_redirect_loop_is_bounded(tmp_path, server):
+    fetcher = make_fetcher(tmp_path, max_redirects=2)
+    with pytest.raises(FetchError, match="Too many redirects"):
+        fetcher.fetch(f"{server}/redirect?to=/redirect?to=/redirect?to=/redirect?to=/big")
@@ -0,0 +1,105 @@
+"""Lease expiry, heartbeats and ownership in JobQueue"""
+
+import threading
+
+import pytest
+
+from conftest import wait_until
+from job_queue import DONE, FAILED, RUNNING, JobQueue
+
+
+def make_queue(tmp_path, clock, handler=None, **kwargs):
+    handler = handler or (lambda kind, payload, progress: {'success': True, 'echo': payload})
+    return JobQueue(str(tmp_path / 'jobs.sqlite3'), handler, lease=60, clock=clock, **kwargs)
+
+
+def test_expired_lease_hands_job_to_another_worker(tmp_path, clock):
+    first = make_queue(tmp_path, clock)
+    second = make_queue(tmp_path, clock)
+    identifier = first.submit('claim', 'rumour')
+
+    assert first._claim('worker-1')[0] == identifier
+    clock.advance(59)
+    assert second._claim('worker-2') is None
+
+    clock.advance(2)
+    assert second._claim('worker-2')[0] == identifier
+    job = second.get(identifier)
+    assert job['state'] == RUNNING
+    assert job['attempts'] == 2
+
+    # The worker that lost its lease can no longer store a result
+    assert not first._finish(identifier, 'worker-1', DONE, {'success': True}, None)
+    assert second._finish(identifier, 'worker-2', DONE, {'success': True, 'by': 2}, None)
+    assert first.get(identifier)['result'] == {'success': True, 'by': 2}
+
+
+def test_job_fails_after_max_attempts(tmp_path, clock):
+    queue = make_queue(tmp_path, clock, max_attempts=2)
+    identifier = queue.submit('claim', 'rumour')
+    for attempt in range(2):
+        assert queue._claim(f'worker-{attempt}') is not None
+        clock.advance(61)
+
+    assert queue._claim('worker-3') is None
+    job = queue.get(identifier)
+    assert job['state'] == FAILED
+    assert job['error'] == "The worker stopped before finishing"
+
+
+def test_heartbeat_keeps_a_long_job(tmp_path, clock):
+    release = threading.Event()
+
+    def handler(kind, payload, progress):
+        release.wait(5)
+        return {'success': True}
+
+    first = make_queue(tmp_path, clock, handler=handler)
+    second = make_queue(tmp_path, clock)
+    identifier = first.submit('claim', 'slow')
+    job = first._claim('worker-1')
+    runner = threading.Thread(target=first._run, args=('worker-1',) + job)
+    runner.start()
+    try:
+        assert wait_until(lambda: first._held)
+        for _ in range(3):
+            clock.advance(45)
+            assert first.renew_leases() == 1
+            assert second._claim('worker-2') is None
+    finally:
+        release.set()
+        runner.join(5)
+
+    assert first.get(identifier)['state'] == DONE
+    assert first.renew_leases() == 0
+
+
+def test_lost_lease_drops_progress(tmp_path, clock):
+    first = make_queue(tmp_path, clock, progress_interval=0)
+    second = make_queue(tmp_path, clock)
+    identifier = first.submit('claim', 'rumour')
+    job = first._claim('worker-1')
+    clock.advance(61)
+    second._claim('worker-2')
+
+    def handler(kind, payload, progress):
+        progress({'type': 'update', 'status': 'FALSE'})
+        return {'success': True}
+
+    first.handler = handler
+    first._run('worker-1', *job)
+    job = second.get(identifier)
+    assert job['state'] == RUNNING
+    assert job['progress'] is None
+
+
+@pytest.mark.parametrize('outcome, state', [({'success': True}, DONE), ({'success': False, 'analysis': 'x'}, FAILED)])
+def test_workers_run_submitted_jobs(tmp_path, clock, outcome, state):
+    queue = make_queue(tmp_path, clock, handler=lambda kind, payload, progress: outcome, poll_interval=0.01).start()
+    try:
+        identifier = queue.submit('claim', 'rumour')
+        assert wait_until(lambda: queue.get(identifier)['state'] == state)
+        assert queue.get(identifier)['result'] == outcome
+        assert not queue._held
+    finally:
+        queue.stop(5)
@@ -0,0 +1,138 @@
+"""Circuit breaker, failover and hedging state changes in ModelRouter"""
+
+import threading
+
+import pytest
+
+import fake_genai
+from conftest import ScriptedModel, wait_until
+from model_router import CLOSED, HALF_OPEN, OPEN, EmptyResponse, ModelRouter, NoModelAvailable, RateLimited
+
+
+class _Blocked:
+    """A response whose .text raises, like a safety-blocked prompt"""
+
+    @property
+    def text(self):
+        raise ValueError("The response was blocked")
+
+
+def healthy():
+    return fake_genai.GenerativeModel('fake')
+
+
+def states(router):
+    return {row['model']: row['state'] for row in router.stats()}
+
+
+def test_failover_opens_breaker_after_threshold(clock):
+    broken = ScriptedModel(RuntimeError("503"))
+    router = ModelRouter([('primary', broken), ('backup', healthy())], failure_threshold=2, cooldown=30, clock=clock)
+
+    for _ in range(2):
+        _, name = router.generate_content("claim")
+        assert name == 'backup'
+    assert states(router) == {'primary': OPEN, 'backup': CLOSED}
+
+    # While open the primary is not called at all
+    router.generate_content("claim")
+    assert broken.calls == 2
+
+
+def test_half_open_probe_closes_or_reopens(clock):
+    flaky = ScriptedModel(RuntimeError("503"), RuntimeError("503"), fake_genai._Response("ok"))
+    router = ModelRouter([('primary', flaky), ('backup', healthy())], failure_threshold=1, cooldown=30, clock=clock)
+
+    router.generate_content("claim")
+    assert states(router)['primary'] == OPEN
+
+    clock.advance(29)
+    router.generate_content("claim")
+    assert flaky.calls == 1
+
+    # The failed probe re-opens the breaker for another cooldown
+    clock.advance(1)
+    router.generate_content("claim")
+    assert flaky.calls == 2
+    assert states(router)['primary'] == OPEN
+
+    clock.advance(30)
+    _, name = router.generate_content("claim")
+    assert name == 'primary'
+    assert states(router)['primary'] == CLOSED
+
+
+def test_half_open_lets_one_probe_through(clock):
+    router = ModelRouter([('primary', ScriptedModel(RuntimeError("503")))], failure_threshold=1, cooldown=10,
+                         clock=clock)
+    with pytest.raises(RuntimeError):
+        router.generate_content("claim")
+    with pytest.raises(NoModelAvailable):
+        router.generate_content("claim")
+
+    clock.advance(10)
+    breaker = router._routes[0].breaker
+    assert breaker.acquire()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.acquire()
+
+
+def test_blocked_and_empty_answers_skip_failover_and_breaker(clock):
+    blocked = ScriptedModel(_Blocked())
+    backup = ScriptedModel(fake_genai._Response("ok"))
+    router = ModelRouter([('primary', blocked), ('backup', backup)], failure_threshold=1, clock=clock)
+
+    with pytest.raises(EmptyResponse):
+        router.generate_content("claim")
+    blocked.script = [fake_genai._Response("")]
+    with pytest.raises(EmptyResponse):
+        router.generate_content("claim")
+
+    assert backup.calls == 0
+    assert states(router) == {'primary': CLOSED, 'backup': CLOSED}
+    assert router.stats()[0]['failures'] == 0
+
+
+def test_rate_limited_raised_with_hint_and_no_penalty(clock):
+    limited = ScriptedModel(RuntimeError("429 Resource exhausted, please retry in 7s"))
+    backup = ScriptedModel(fake_genai._Response("ok"))
+    router = ModelRouter([('primary', limited), ('backup', backup)], failure_threshold=1, clock=clock)
+
+    with pytest.raises(RateLimited) as raised:
+        router.generate_content("claim")
+    assert raised.value.retry_after == 7
+    assert backup.calls == 0
+    assert states(router)['primary'] == CLOSED
+
+
+def test_stream_fails_over_before_first_chunk(clock):
+    broken = ScriptedModel(RuntimeError("503"))
+    router = ModelRouter([('primary', broken), ('backup', healthy())], failure_threshold=1, clock=clock)
+
+    chunks, name = router.stream_content("claim")
+    assert name == 'backup'
+    assert "VERIFICATION_STATUS" in "".join(chunk.text for chunk in chunks)
+    assert states(router) == {'primary': OPEN, 'backup': CLOSED}
+
+
+def test_hedge_sends_backup_after_delay_and_counts_win(clock):
+    release = threading.Event()
+
+    class Slow:
+        def generate_content(self, prompt, **kwargs):
+            release.wait(5)
+            return fake_genai._Response("late")
+
+    router = ModelRouter([('primary', Slow()), ('backup', healthy())], hedge=True,
+                         hedge_min_delay=0.01, hedge_max_delay=0.01, clock=clock)
+    try:
+        response, name = router.generate_content("claim")
+        assert name == 'backup'
+        assert router.hedged_requests == 1
+        assert router.hedge_wins == 1
+    finally:
+        release.set()
+
+    # The slower primary still records its (successful) outcome in the background
+    assert wait_until(lambda: router.stats()[0]['requests'] == 1)
+    assert states(router) == {'primary': CLOSED, 'backup': CLOSED}
@@ -0,0 +1,83 @@
+"""Lookup, guard words and snapshots in NearDuplicateIndex"""
+
+import numpy as np
+import pytest
+
+from near_duplicate import NearDuplicateIndex, SnapshotMismatch
+from verdict_cache import claim_key
+
+CLAIM = "RBI is withdrawing all 500 rupee notes from circulation starting next Monday across India"
+REWORDED = "RBI is withdrawing all 500 rupee notes from circulation starting next Monday across India!!"
+
+
+def make_index(*claims, **kwargs):
+    kwargs.setdefault('capacity', 64)
+    index = NearDuplicateIndex(**kwargs)
+    for claim in claims:
+        index.add(claim_key(claim), claim)
+    return index
+
+
+def test_reworded_claim_finds_stored_key():
+    index = make_index(CLAIM, "Government announces free electricity for all farmers in Punjab")
+    match = index.lookup(REWORDED)
+    assert match is not None
+    assert match.key == claim_key(CLAIM)
+    assert match.similarity >= index.threshold
+
+
+def test_unrelated_claim_misses():
+    index = make_index(CLAIM)
+    assert index.lookup("Chandrayaan-3 landed near the lunar south pole in August") is None
+    assert make_index().lookup(CLAIM) is None
+
+
+@pytest.mark.parametrize('variant', [
+    CLAIM.replace('500', '2000'),
+    CLAIM.replace('next Monday', 'next Monday 15'),
+    CLAIM.replace('RBI is', 'RBI is not'),
+    "Fake: " + CLAIM,
+])
+def test_changed_numbers_or_negations_are_rejected(variant):
+    index = make_index(CLAIM)
+    # Close enough to match on text alone; only the guard tells them apart
+    (stored, stored_guard), (signature, guard) = index._signature(CLAIM), index._signature(variant)
+    assert (stored == signature).mean() >= index.threshold
+    assert guard != stored_guard
+    assert index.lookup(variant) is None
+
+
+def test_oldest_claims_are_overwritten_when_full():
+    claims = [f"Claim number {word} about a new state scheme for farmers" for word in ('one', 'two', 'three')]
+    index = make_index(*claims, capacity=2)
+    assert len(index) == 2
+    assert index.lookup(claims[0]) is None
+    assert index.lookup(claims[2]).key == claim_key(claims[2])
+
+
+def test_snapshot_round_trip(tmp_path):
+    path = str(tmp_path / 'index.npz')
+    index = make_index(CLAIM, "Government announces free electricity for all farmers in Punjab")
+    index.save(path)
+
+    restored = NearDuplicateIndex.load(path, capacity=64, threshold=0.9)
+    assert len(restored) == 2
+    assert restored.threshold == 0.9
+    assert restored.lookup(REWORDED).key == claim_key(CLAIM)
+    for name in ('_signatures', '_guards', '_keys', '_seq', '_heads', '_next'):
+        assert np.array_equal(getattr(restored, name), getattr(index, name))
+
+    # New claims keep going into the ring after the restored ones
+    restored.add(claim_key("Another claim entirely"), "Another claim entirely")
+    assert len(restored) == 3
+
+
+@pytest.mark.parametrize('settings', [
+    {'capacity': 128}, {'capacity': 64, 'num_perm': 32}, {'capacity': 64, 'shingle_size': 4},
+    {'capacity': 64, 'seed': 2},
+])
+def test_snapshot_with_other_layout_is_refused(tmp_path, settings):
+    path = str(tmp_path / 'index.npz')
+    make_index(CLAIM).save(path)
+    with pytest.raises(SnapshotMismatch):
+        NearDuplicateIndex.load(path, **settings)
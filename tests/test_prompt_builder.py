@@ -0,0 +1,45 @@
+"""Token counting and compaction in PromptBuilder"""
+
+import pytest
+
+from prompt_builder import SYSTEM_INSTRUCTION, PromptBuilder, compact_text, estimate_tokens
+
+ARTICLE = ("The state government announced free electricity for farmers on Monday. "
+           "Officials said the scheme covers 200 units a month. "
+           "The weather was pleasant in the capital. "
+           "Opposition leaders called it an election stunt. ") * 20
+
+
+def test_model_count_is_used_when_available():
+    counted = []
+
+    def count(text):
+        counted.append(text)
+        return 123
+
+    prompt = PromptBuilder(count_tokens=count).build("Free electricity for farmers")
+    assert (prompt.estimated_tokens, prompt.counted) == (123, True)
+    assert counted == [prompt.text]
+
+
+@pytest.mark.parametrize('count', [None, lambda text: None, lambda text: 1 / 0])
+def test_falls_back_to_estimate(count):
+    prompt = PromptBuilder(count_tokens=count).build("Free electricity for farmers")
+    assert not prompt.counted
+    assert prompt.estimated_tokens == estimate_tokens(SYSTEM_INSTRUCTION) + estimate_tokens(prompt.text)
+
+
+def test_long_claim_is_compacted_to_budget():
+    prompt = PromptBuilder(claim_budget_tokens=60).build(ARTICLE)
+    assert prompt.compacted
+    claim = prompt.text[len('Claim: "'):-1]
+    assert estimate_tokens(claim) <= 60
+    assert claim.startswith("The state government announced free electricity")
+
+
+def test_compaction_keeps_relevant_sentences_in_original_order():
+    assert compact_text("Short claim.", 50) == "Short claim."
+    text = ("Free electricity for farmers starts in April. The weather was pleasant in the capital. "
+            "Cricket fans gathered at the stadium. Farmers get 200 free units of electricity a month.")
+    assert compact_text(text, 30) == ("Free electricity for farmers starts in April. "
+                                      "Farmers get 200 free units of electricity a month.")
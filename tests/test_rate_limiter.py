@@ -0,0 +1,120 @@
+"""Priority order, backoff and retries in RateLimiter"""
+
+import random
+import threading
+
+import pytest
+
+from conftest import wait_until
+from model_router import RateLimited
+from rate_limiter import BATCH, INTERACTIVE, QuotaWaitTimeout, RateLimiter
+
+
+class _ClockedCondition(threading.Condition):
+    """Condition whose timed waits advance the fake clock instead of sleeping"""
+
+    def __init__(self, clock):
+        super().__init__()
+        self.clock = clock
+
+    def wait(self, timeout=None):
+        if timeout is None:
+            return super().wait()
+        self.clock.advance(timeout)
+        return False
+
+
+def clocked(limiter, clock):
+    limiter._cond = _ClockedCondition(clock)
+    return limiter
+
+
+def test_interactive_goes_ahead_of_earlier_batch(clock):
+    # 6000 requests/minute: one request every 10ms of fake time, burst of 600
+    limiter = RateLimiter(requests_per_minute=6000, clock=clock)
+    limiter._requests.level = 0.0
+    granted = []
+
+    def request(priority):
+        limiter.acquire(priority=priority, timeout=0)
+        granted.append(priority)
+
+    threads = [threading.Thread(target=request, args=(BATCH,))]
+    threads[0].start()
+    assert wait_until(lambda: limiter.stats()['queue_depth']['batch'] == 1)
+    threads.append(threading.Thread(target=request, args=(INTERACTIVE,)))
+    threads[1].start()
+    assert wait_until(lambda: limiter.stats()['queue_depth']['interactive'] == 1)
+
+    # Quota for one request: the later interactive call gets it
+    clock.advance(0.011)
+    assert wait_until(lambda: granted == [INTERACTIVE])
+    clock.advance(0.011)
+    for thread in threads:
+        thread.join(5)
+    assert granted == [INTERACTIVE, BATCH]
+    assert limiter.stats()['queue_depth'] == {'interactive': 0, 'batch': 0}
+
+
+def test_requests_per_minute_spaces_calls(clock):
+    limiter = clocked(RateLimiter(requests_per_minute=60, clock=clock), clock)
+    started = clock()
+    for _ in range(6 + 3):
+        limiter.acquire()
+    # A burst of capacity (6), then one request per second
+    assert clock() - started == pytest.approx(3.0)
+    assert limiter.delayed == 3
+
+
+def test_retries_with_retry_after_hint(clock):
+    limiter = clocked(RateLimiter(max_retries=4, clock=clock), clock)
+    attempts = []
+
+    def call():
+        attempts.append(clock())
+        if len(attempts) < 3:
+            raise RateLimited("429", retry_after=5)
+        return "answer"
+
+    result, permit = limiter.call(call)
+    assert result == "answer"
+    assert limiter.retries == 2
+    assert limiter.rate_limited == 2
+    # Each retry waits the hint plus at most 10% jitter
+    for earlier, later in zip(attempts, attempts[1:]):
+        assert 5.0 <= later - earlier <= 5.5
+
+
+def test_gives_up_after_max_retries(clock):
+    limiter = clocked(RateLimiter(max_retries=2, clock=clock), clock)
+
+    def call():
+        raise RateLimited("429")
+
+    with pytest.raises(RateLimited):
+        limiter.call(call)
+    assert limiter.retries == 2
+    assert limiter.rate_limited == 2
+
+
+def test_backoff_grows_exponentially_with_jitter_and_resets(clock):
+    random.seed(7)
+    limiter = RateLimiter(backoff_base=1.0, backoff_max=8.0, clock=clock)
+    for strike in range(1, 7):
+        delay = limiter.backoff()
+        assert 0 <= delay <= min(8.0, 2 ** (strike - 1))
+    assert limiter.stats()['backoff_remaining'] > 0
+
+    limiter.success()
+    assert limiter.backoff() <= 1.0
+
+
+def test_backoff_pauses_other_callers_until_timeout(clock):
+    limiter = clocked(RateLimiter(clock=clock), clock)
+    limiter.backoff(retry_after=30)
+    with pytest.raises(QuotaWaitTimeout):
+        limiter.acquire(timeout=10)
+    assert limiter.timeouts == 1
+
+    clock.advance(35)
+    assert limiter.acquire(timeout=10).waited == 0
@@ -0,0 +1,150 @@
+"""Text, JSON and streaming parsing of model responses"""
+
+import json
+
+import pytest
+
+import fake_genai
+from response_parser import (
+    SECTION_NAMES, StreamingResponseParser, calibrate_confidence, parse_json_response, parse_response
+)
+
+CANNED = fake_genai.canned_response("RBI to withdraw all 500 rupee notes")
+
+
+def test_canned_response_round_trip():
+    parsed = parse_response(CANNED)
+    assert parsed.status in ('TRUE', 'FALSE', 'PARTIALLY_TRUE', 'UNVERIFIED')
+    for name, text in fake_genai.SECTIONS.items():
+        assert parsed.sections()[name] == text
+
+
+def test_bold_bracketed_and_spaced_labels():
+    text = ("**VERIFICATION_STATUS:** [FALSE]\n"
+            "**Confidence Score**: (92)\n\n"
+            "## **Detailed Analysis:** No such order exists.\n"
+            "> RED_FLAGS: Forward as much as possible\n"
+            "**conclusion:** Fake.")
+    parsed = parse_response(text)
+    assert (parsed.status, parsed.confidence) == ('FALSE', 92)
+    assert parsed.detailed_analysis == "No such order exists."
+    assert parsed.red_flags == "Forward as much as possible"
+    assert parsed.conclusion == "Fake."
+
+
+def test_plain_case_words_in_analysis_do_not_open_sections():
+    text = ("VERIFICATION_STATUS: PARTIALLY_TRUE\nCONFIDENCE_SCORE: 66\n"
+            "DETAILED_ANALYSIS:\nThe scheme exists.\nConclusion: it covers only two states.\n"
+            "Red flags: none\n"
+            "CONCLUSION:\nPartly accurate.")
+    parsed = parse_response(text)
+    assert parsed.detailed_analysis == ("The scheme exists.\nConclusion: it covers only two states.\n"
+                                        "Red flags: none")
+    assert parsed.conclusion == "Partly accurate."
+    assert parsed.red_flags == ''
+
+
+def test_mid_line_labels_and_first_value_wins():
+    parsed = parse_response("After checking, VERIFICATION_STATUS: TRUE and CONFIDENCE_SCORE: 88.\n"
+                            "VERIFICATION_STATUS: FALSE")
+    assert parsed.status == 'FALSE'
+    assert parsed.confidence == 88
+
+
+@pytest.mark.parametrize('status, extracted, expected', [
+    (None, None, ('UNVERIFIED', 50)),
+    ('UNVERIFIED', 95, ('UNVERIFIED', 50)),
+    ('UNVERIFIED', 20, ('UNVERIFIED', 30)),
+    ('TRUE', None, ('TRUE', 85)),
+    ('TRUE', 40, ('TRUE', 75)),
+    ('FALSE', 50, ('FALSE', 80)),
+    ('FALSE', 97, ('FALSE', 97)),
+    ('PARTIALLY_TRUE', 10, ('PARTIALLY_TRUE', 65)),
+])
+def test_calibrate_confidence(status, extracted, expected):
+    assert calibrate_confidence(status, extracted) == expected
+
+
+def test_confidence_is_capped_at_100():
+    assert parse_response("VERIFICATION_STATUS: TRUE\nCONFIDENCE_SCORE: 250").confidence == 100
+    assert parse_json_response('{"verification_status": "TRUE", "confidence_score": 250}').confidence == 100
+
+
+def test_json_response():
+    text = json.dumps({'verification_status': 'partially true', 'confidence_score': '71',
+                       'detailed_analysis': 'Mixed.', 'red_flags': ['No source', 'Urgency']})
+    parsed = parse_json_response(text)
+    assert (parsed.status, parsed.confidence) == ('PARTIALLY_TRUE', 71)
+    assert parsed.red_flags == "- No source\n- Urgency"
+    assert parse_response(parsed.raw_text).sections() == parsed.sections()
+
+
+@pytest.mark.parametrize('text', ['[1, 2]', 'VERIFICATION_STATUS: FALSE\nCONFIDENCE_SCORE: 90'])
+def test_json_parser_falls_back_to_text(text):
+    parsed = parse_json_response(text)
+    assert parsed.status == ('FALSE' if 'FALSE' in text else 'UNVERIFIED')
+
+
+def test_json_with_unknown_status_and_bad_confidence():
+    parsed = parse_json_response(json.dumps({'verification_status': 'MAYBE', 'confidence_score': 'high'}))
+    assert (parsed.status, parsed.confidence) == ('UNVERIFIED', 50)
+
+
+def feed_all(parser, chunks):
+    changed = set()
+    for chunk in chunks:
+        changed |= parser.feed(chunk)
+    return changed | parser.finish()
+
+
+@pytest.mark.parametrize('size', [1, 3, 7, 80])
+def test_streaming_matches_one_shot_parse_for_any_chunking(size):
+    parser = StreamingResponseParser()
+    changed = feed_all(parser, [CANNED[start:start + size] for start in range(0, len(CANNED), size)])
+    parsed = parse_response(CANNED)
+    assert parser.status == parsed.status
+    assert parser.confidence == parsed.confidence
+    assert parser.sections == {name: getattr(parsed, name.lower()) for name in SECTION_NAMES}
+    assert {'status', 'confidence'} <= changed
+    assert parser.current_section == 'CONCLUSION'
+
+
+def test_streaming_label_split_across_chunks():
+    parser = StreamingResponseParser()
+    parser.feed("VERIFICATION_STATUS: FALSE\nCONFIDENCE_SCORE: 90\nDETAILED_ANA")
+    assert 'DETAILED_ANALYSIS' not in parser.sections
+    changed = parser.feed("LYSIS:\nNo such notification.")
+    assert 'DETAILED_ANALYSIS' in changed
+    assert parser.sections['DETAILED_ANALYSIS'] == "No such notification."
+
+
+def test_streaming_number_at_end_of_buffer_waits_for_more_text():
+    parser = StreamingResponseParser()
+    parser.feed("VERIFICATION_STATUS: TRUE\nCONFIDENCE_SCORE: 8")
+    assert parser.confidence is None
+    assert parser.feed("7\n") == {'confidence'}
+    assert parser.confidence == 87
+
+
+def test_streaming_number_at_end_of_stream_is_flushed():
+    parser = StreamingResponseParser()
+    parser.feed("VERIFICATION_STATUS: TRUE\nCONFIDENCE_SCORE: 9")
+    assert parser.confidence is None
+    assert parser.finish() == {'confidence'}
+    assert parser.confidence == 9
+
+
+def test_streaming_status_split_mid_word():
+    parser = StreamingResponseParser()
+    parser.feed("VERIFICATION_STATUS: PARTIALLY_")
+    assert parser.status is None
+    parser.feed("TRUE\n")
+    assert parser.status == 'PARTIALLY_TRUE'
+
+
+def test_streaming_reports_only_changed_sections():
+    parser = StreamingResponseParser()
+    parser.feed("DETAILED_ANALYSIS:\nFirst part")
+    parser.feed(" continues.\nRED_FLAGS:\n")
+    assert parser.feed("- No source") == {'RED_FLAGS'}
+    assert parser.sections['DETAILED_ANALYSIS'] == "First part continues."
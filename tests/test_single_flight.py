@@ -0,0 +1,87 @@
+"""Coalescing and error sharing in SingleFlight"""
+
+import threading
+
+import pytest
+
+from conftest import wait_until
+from single_flight import FlightTimeout, SingleFlight
+
+
+def run_concurrently(flights, key, function, callers):
+    """Start `callers` threads calling flights.do(key, function); returns their outcomes once released"""
+    outcomes = [None] * callers
+
+    def call(position):
+        try:
+            outcomes[position] = ('result',) + flights.do(key, function)
+        except Exception as e:
+            outcomes[position] = ('error', e)
+
+    threads = [threading.Thread(target=call, args=(position,)) for position in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        release.wait(5)
+        return {'status': 'FALSE'}
+
+    threads, outcomes = run_concurrently(flights, 'claim', work, 5)
+    assert wait_until(lambda: flights.stats()['coalesced'] == 4)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert sorted(coalesced for _, _, coalesced in outcomes) == [False, True, True, True, True]
+    # Every caller gets the leader's very object
+    assert all(result is outcomes[0][1] for _, result, _ in outcomes)
+    assert flights.stats() == {'leaders': 1, 'coalesced': 4, 'coalesced_rate': 0.8, 'in_flight': 0}
+
+
+def test_leader_error_reaches_every_waiter_and_is_not_cached():
+    flights = SingleFlight()
+    release = threading.Event()
+    error = RuntimeError("model unavailable")
+
+    def work():
+        release.wait(5)
+        raise error
+
+    threads, outcomes = run_concurrently(flights, 'claim', work, 3)
+    assert wait_until(lambda: flights.stats()['coalesced'] == 2)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert outcomes == [('error', error)] * 3
+    # The key was released: the next call starts a fresh attempt
+    assert flights.do('claim', lambda: 'retried') == ('retried', False)
+
+
+def test_different_keys_do_not_coalesce():
+    flights = SingleFlight()
+    assert flights.do('a', lambda: 1) == (1, False)
+    assert flights.do('b', lambda: 2) == (2, False)
+    assert flights.stats()['leaders'] == 2
+
+
+def test_waiter_timeout_leaves_leader_running():
+    flights = SingleFlight()
+    flight, leader = flights.join('claim')
+    assert leader
+
+    with pytest.raises(FlightTimeout):
+        flights.do('claim', lambda: 'unused', timeout=0.01)
+
+    flights.finish(flight, result='done')
+    assert flight.wait(0) == 'done'
+    assert flights.stats()['in_flight'] == 0
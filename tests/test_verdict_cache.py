@@ -0,0 +1,102 @@
+"""Keys, expiry, eviction and cross-process visibility in VerdictCache"""
+
+import pytest
+
+from verdict_cache import TRANSIENT_FIELDS, VerdictCache, claim_key, normalize_claim
+
+
+def verdict(status='FALSE', **extra):
+    return dict({'status': status, 'confidence': 80, 'analysis': 'checked', 'success': True}, **extra)
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return VerdictCache(str(tmp_path / 'verdicts.sqlite3'), clock=clock)
+
+
+def test_normalization_shares_keys_between_trivial_copies():
+    assert normalize_claim("  RBI   to WITHDRAW ₹500 notes!!! 🚨") == "rbi to withdraw 500 notes"
+    assert claim_key("RBI to withdraw 500 notes") == claim_key("rbi to withdraw, 500 notes.")
+    assert claim_key("RBI to withdraw 500 notes") != claim_key("RBI to withdraw 2000 notes")
+    # Combining marks keep Hindi words distinct
+    assert normalize_claim("किला") != normalize_claim("कला")
+
+
+def test_hit_is_a_marked_copy(cache):
+    cache.set("Free electricity for all", verdict())
+    hit = cache.get("free electricity for all!")
+    assert hit['status'] == 'FALSE' and hit['cache_hit']
+    hit['status'] = 'TRUE'
+    assert cache.get("Free electricity for all")['status'] == 'FALSE'
+    assert cache.stats()['hits'] == 2
+
+
+def test_errors_and_triage_verdicts_are_not_cached(cache):
+    cache.set("a", {'status': 'ERROR', 'success': False})
+    cache.set("b", verdict(triage=True))
+    assert cache.get("a") is None and cache.get("b") is None
+
+
+def test_transient_fields_are_stripped(cache):
+    # (a triage flag keeps a result out of the cache altogether, see above)
+    cache.set("claim", verdict(**{field: 1 for field in TRANSIENT_FIELDS - {'triage'}}))
+    stored = cache.get("claim")
+    assert stored['cache_hit'] is True
+    assert not (set(stored) - {'cache_hit'}) & TRANSIENT_FIELDS
+
+
+def test_ttl_depends_on_status(tmp_path, clock):
+    cache = VerdictCache(str(tmp_path / 'v.sqlite3'), ttl_by_status={'UNVERIFIED': 60, 'FALSE': 3600}, clock=clock)
+    cache.set("developing story", verdict('UNVERIFIED'))
+    cache.set("old hoax", verdict('FALSE'))
+
+    clock.advance(61)
+    assert cache.get("developing story") is None
+    assert cache.get("old hoax") is not None
+    clock.advance(3600)
+    assert cache.get("old hoax") is None
+
+
+def test_eviction_drops_least_recently_used(tmp_path, clock):
+    cache = VerdictCache(str(tmp_path / 'v.sqlite3'), max_entries=2, evict_every=1, clock=clock)
+    cache.set("first", verdict())
+    clock.advance(1)
+    cache.set("second", verdict())
+    clock.advance(1)
+    # A memory hit counts as a use
+    assert cache.get("first") is not None
+    clock.advance(1)
+    cache.set("third", verdict())
+
+    cache._memory.clear()
+    assert cache.get("second") is None
+    assert cache.get("first") is not None and cache.get("third") is not None
+    assert cache.stats()['evictions'] == 1
+
+
+def test_clear_in_another_process_seen_after_memory_ttl(tmp_path, clock):
+    path = str(tmp_path / 'v.sqlite3')
+    ui = VerdictCache(path, memory_ttl=30, clock=clock)
+    api = VerdictCache(path, memory_ttl=30, clock=clock)
+    ui.set("claim", verdict())
+    assert ui.get("claim") is not None
+
+    api.clear()
+    clock.advance(31)
+    assert ui.get("claim") is None
+
+
+def test_warm_skips_cached_expired_and_triage(cache, clock):
+    cache.set("already cached", verdict('TRUE'))
+    now = clock()
+    added = cache.warm([
+        ("already cached", verdict('FALSE'), now),
+        ("from history", verdict('FALSE'), now - 3600),
+        ("too old", verdict('UNVERIFIED'), now - 7 * 3600),
+        ("triaged", verdict(triage=True), now),
+        ("failed", {'status': 'ERROR', 'success': False}, now),
+    ])
+    assert [claim for _, claim in added] == ["from history"]
+    assert cache.get("already cached")['status'] == 'TRUE'
+    assert cache.get("from history")['status'] == 'FALSE'
+    assert cache.get("too old") is None
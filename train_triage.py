@@ -0,0 +1,113 @@
+"""
+🇮🇳 INDIAN NEWS VERIFIER - TRIAGE TRAINING CLI
+==============================================
+Train the local triage pre-filter (triage.py) on labelled verdict history
+and report how many LLM calls it would have saved on a held-out set.
+
+Training data comes from the verdict cache database and/or NDJSON files
+such as verify_batch.py output (objects with "claim" and "status").
+
+Usage:
+    python train_triage.py --from-cache
+    python train_triage.py verdicts.ndjson --target-precision 0.97 -o .cache/triage.model
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+
+from main_beautiful import AppConfig
+from response_parser import STATUSES
+from triage import DEFAULT_FEATURES, TriageModel
+from verdict_cache import VerdictCache, claim_key
+
+
+def read_labelled(path):
+    """Yield (claim, status) pairs from an NDJSON file"""
+    with open(path, encoding='utf-8') as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            claim = record.get('claim') or record.get('text')
+            status = record.get('status') or record.get('label')
+            if claim and status:
+                yield claim, status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the local claim triage model")
+    parser.add_argument('inputs', nargs='*', help="NDJSON files with 'claim' and 'status' fields")
+    parser.add_argument('--from-cache', action='store_true', help="Also train on the verdict cache database")
+    parser.add_argument('-o', '--output', default=AppConfig.TRIAGE_MODEL_PATH or 'triage.model',
+                        help="Model file to write (default: %(default)s)")
+    parser.add_argument('--features', type=int, default=DEFAULT_FEATURES,
+                        help="Hashed feature space size, a power of two (default: %(default)s)")
+    parser.add_argument('--epochs', type=int, default=10)
+    parser.add_argument('--holdout', type=float, default=0.2, help="Share of claims held out for the report")
+    parser.add_argument('--target-precision', type=float, default=0.95,
+                        help="Required agreement with the LLM for locally answered claims")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    sources = [read_labelled(path) for path in args.inputs]
+    if args.from_cache:
+        sources.append(VerdictCache(AppConfig.VERDICT_CACHE_PATH).iter_labelled())
+    if not sources:
+        parser.error("give NDJSON inputs and/or --from-cache")
+
+    # One example per normalized claim; the latest verdict wins
+    examples = {}
+    for source in sources:
+        for claim, status in source:
+            if status in STATUSES:
+                examples[claim_key(claim)] = (claim, status)
+    if len(examples) < 50:
+        print(f"❌ Need at least 50 labelled claims, found {len(examples)}", file=sys.stderr)
+        return 1
+
+    claims, statuses = zip(*examples.values())
+    order = np.random.default_rng(args.seed).permutation(len(claims))
+    test_size = max(1, int(len(order) * args.holdout))
+    calibration_size = max(1, int(len(order) * 0.1))
+    test, calibration, train = (order[:test_size], order[test_size:test_size + calibration_size],
+                                order[test_size + calibration_size:])
+
+    def pick(rows):
+        return [claims[i] for i in rows], [statuses[i] for i in rows]
+
+    started = time.perf_counter()
+    model = TriageModel.train(*pick(train), n_features=args.features, epochs=args.epochs, seed=args.seed)
+    model.calibrate(*pick(calibration), target_precision=args.target_precision)
+    train_seconds = time.perf_counter() - started
+
+    test_claims, test_statuses = pick(test)
+    report = model.evaluate(test_claims, test_statuses)
+    started = time.perf_counter()
+    model.decide_many(test_claims)
+    report['claims_per_second'] = round(len(test_claims) / max(time.perf_counter() - started, 1e-9))
+
+    model.metadata = {
+        'trained_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'train_claims': len(train),
+        'target_precision': args.target_precision,
+        'holdout': report,
+    }
+    model.save(args.output)
+
+    print(f"✅ Trained on {len(train)} claims in {train_seconds:.1f}s → {args.output}", file=sys.stderr)
+    print(f"📊 Held-out {report['claims']} claims: accuracy {report['accuracy']:.1%}, "
+          f"threshold {report['threshold']:.2f}", file=sys.stderr)
+    print(f"⚡ LLM calls saved: {report['llm_calls_saved']} ({report['llm_calls_saved_rate']:.1%}), "
+          f"agreeing with the LLM on {report['triaged_accuracy']:.1%} of them; "
+          f"{report['claims_per_second']:,} claims/s batch scoring", file=sys.stderr)
+    print(json.dumps(report))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
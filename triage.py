@@ -0,0 +1,233 @@
+"""
+CLAIM TRIAGE PRE-FILTER
+=======================
+Optional local classifier that answers the easy claims before the LLM.
+
+- Claims are hashed into a fixed-size feature space (word unigrams and
+  bigrams of the normalized text plus a length bucket, signed hashing).
+- A multinomial logistic regression over verdict statuses is trained on
+  the verdict history (see train_triage.py); scoring is a NumPy gather
+  and sum, so single claims take microseconds and batches are vectorized.
+- Only predictions at or above the calibrated probability threshold are
+  answered locally; everything else is routed to the LLM.
+
+Model file layout (little-endian), loaded with a read-only memory map:
+    b'TRIAGE01' | uint32 header length | JSON header | padding to 64 bytes
+    | float32 weights [n_features, n_labels] | float32 bias [n_labels]
+"""
+
+import json
+import os
+import struct
+import zlib
+
+import numpy as np
+
+from response_parser import STATUSES
+from verdict_cache import normalize_claim
+
+MAGIC = b'TRIAGE01'
+ALIGNMENT = 64
+DEFAULT_FEATURES = 1 << 18
+
+
+def claim_features(claim, n_features=DEFAULT_FEATURES):
+    """Hashed feature indices and signed values for one claim"""
+    words = normalize_claim(claim).split()
+    tokens = words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+    tokens.append(f"__len{min(len(words) // 8, 8)}")
+
+    mask = n_features - 1
+    indices = np.empty(len(tokens), dtype=np.int64)
+    values = np.empty(len(tokens), dtype=np.float32)
+    for position, token in enumerate(tokens):
+        digest = zlib.crc32(token.encode('utf-8'))
+        indices[position] = digest & mask
+        values[position] = 1.0 if digest & 0x80000000 else -1.0
+    values /= np.sqrt(len(tokens))
+    return indices, values
+
+
+def hash_batch(claims, n_features=DEFAULT_FEATURES):
+    """Features for many claims in CSR form: (indptr, indices, values)"""
+    rows = [claim_features(claim, n_features) for claim in claims]
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum([len(indices) for indices, _ in rows], out=indptr[1:])
+    if not rows:
+        return indptr, np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    return indptr, np.concatenate([r[0] for r in rows]), np.concatenate([r[1] for r in rows])
+
+
+def _softmax(logits):
+    logits = logits - logits.max(axis=1, keepdims=True)
+    np.exp(logits, out=logits)
+    logits /= logits.sum(axis=1, keepdims=True)
+    return logits
+
+
+class TriageDecision:
+    """Predicted status, its probability and whether it clears the threshold"""
+
+    __slots__ = ('status', 'probability', 'confident')
+
+    def __init__(self, status, probability, confident):
+        self.status = status
+        self.probability = probability
+        self.confident = confident
+
+    def __repr__(self):
+        return f"TriageDecision(status={self.status!r}, probability={self.probability:.3f}, confident={self.confident})"
+
+
+class TriageModel:
+    """Hashed-feature linear classifier over verdict statuses"""
+
+    def __init__(self, weights, bias, labels, threshold=0.9, metadata=None):
+        self.weights = weights
+        self.bias = bias
+        self.labels = tuple(labels)
+        self.threshold = threshold
+        self.metadata = metadata or {}
+        self.n_features = weights.shape[0]
+
+    # ---------- scoring ----------
+
+    def _logits(self, indptr, indices, values):
+        contributions = self.weights[indices] * values[:, None]
+        # Every claim has at least its length-bucket feature, so no row is empty
+        return np.add.reduceat(contributions, indptr[:-1], axis=0) + self.bias
+
+    def predict_proba(self, claims):
+        """Class probabilities, shape (len(claims), len(labels))"""
+        if not claims:
+            return np.zeros((0, len(self.labels)), dtype=np.float32)
+        return _softmax(self._logits(*hash_batch(claims, self.n_features)))
+
+    def decide(self, claim):
+        """Triage a single claim"""
+        indices, values = claim_features(claim, self.n_features)
+        logits = (self.weights[indices] * values[:, None]).sum(axis=0) + self.bias
+        probabilities = _softmax(logits[None, :])[0]
+        best = int(probabilities.argmax())
+        probability = float(probabilities[best])
+        return TriageDecision(self.labels[best], probability, probability >= self.threshold)
+
+    def decide_many(self, claims):
+        """Triage a batch of claims; returns one TriageDecision per claim"""
+        probabilities = self.predict_proba(list(claims))
+        best = probabilities.argmax(axis=1)
+        top = probabilities[np.arange(len(best)), best]
+        return [TriageDecision(self.labels[b], float(p), bool(p >= self.threshold)) for b, p in zip(best, top)]
+
+    # ---------- training ----------
+
+    @classmethod
+    def train(cls, claims, statuses, n_features=DEFAULT_FEATURES, epochs=10, learning_rate=5.0, batch_size=256,
+              l2=1e-6, seed=0):
+        """Fit on labelled claims with minibatch SGD; threshold is left at its default"""
+        if n_features & (n_features - 1):
+            raise ValueError("n_features must be a power of two")
+        labels = [label for label in STATUSES if label in set(statuses)]
+        label_index = {label: position for position, label in enumerate(labels)}
+        targets = np.array([label_index[status] for status in statuses], dtype=np.int64)
+        features = [claim_features(claim, n_features) for claim in claims]
+
+        weights = np.zeros((n_features, len(labels)), dtype=np.float32)
+        bias = np.zeros(len(labels), dtype=np.float32)
+        model = cls(weights, bias, labels)
+        rng = np.random.default_rng(seed)
+
+        for epoch in range(epochs):
+            rate = learning_rate / (1 + epoch)
+            order = rng.permutation(len(features))
+            for start in range(0, len(order), batch_size):
+                batch = order[start:start + batch_size]
+                rows = [features[i] for i in batch]
+                lengths = np.array([len(indices) for indices, _ in rows])
+                indptr = np.concatenate([[0], np.cumsum(lengths)])
+                indices = np.concatenate([r[0] for r in rows])
+                values = np.concatenate([r[1] for r in rows])
+
+                gradient = _softmax(model._logits(indptr, indices, values))
+                gradient[np.arange(len(batch)), targets[batch]] -= 1.0
+                gradient /= len(batch)
+
+                row_of_feature = np.repeat(np.arange(len(batch)), lengths)
+                np.add.at(weights, indices, -rate * (values[:, None] * gradient[row_of_feature]
+                                                     + l2 * weights[indices]))
+                bias -= rate * gradient.sum(axis=0)
+        return model
+
+    def calibrate(self, claims, statuses, target_precision=0.95, min_threshold=0.5):
+        """
+        Pick the lowest threshold whose confident predictions agree with
+        the LLM verdicts at least `target_precision` of the time.
+        """
+        probabilities = self.predict_proba(list(claims))
+        best = probabilities.argmax(axis=1)
+        top = probabilities[np.arange(len(best)), best]
+        correct = np.array([self.labels[b] == status for b, status in zip(best, statuses)])
+
+        order = np.argsort(-top)
+        precision = np.cumsum(correct[order]) / np.arange(1, len(order) + 1)
+        meets = np.nonzero(precision >= target_precision)[0]
+        if len(meets) == 0:
+            self.threshold = 1.01  # never confident: route everything to the LLM
+        else:
+            self.threshold = max(float(top[order[meets[-1]]]), min_threshold)
+        return self.threshold
+
+    def evaluate(self, claims, statuses):
+        """Held-out report: accuracy, share of LLM calls saved and accuracy on those"""
+        decisions = self.decide_many(claims)
+        total = len(decisions)
+        confident = [(d, status) for d, status in zip(decisions, statuses) if d.confident]
+        return {
+            'claims': total,
+            'accuracy': round(sum(d.status == s for d, s in zip(decisions, statuses)) / total, 4) if total else 0.0,
+            'threshold': round(self.threshold, 4),
+            'llm_calls_saved': len(confident),
+            'llm_calls_saved_rate': round(len(confident) / total, 4) if total else 0.0,
+            'triaged_accuracy': round(sum(d.status == s for d, s in confident) / len(confident), 4) if confident else 0.0,
+        }
+
+    # ---------- persistence ----------
+
+    def save(self, path):
+        """Write the model file atomically"""
+        header = json.dumps({
+            'labels': list(self.labels),
+            'n_features': int(self.n_features),
+            'threshold': float(self.threshold),
+            'metadata': self.metadata,
+        }).encode('utf-8')
+        offset = len(MAGIC) + 4 + len(header)
+        padding = (-offset) % ALIGNMENT
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as handle:
+            handle.write(MAGIC + struct.pack('<I', len(header)) + header + b'\0' * padding)
+            handle.write(np.ascontiguousarray(self.weights, dtype='<f4').tobytes())
+            handle.write(np.ascontiguousarray(self.bias, dtype='<f4').tobytes())
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Open a model file; the weights are memory-mapped read-only, not read into memory"""
+        with open(path, 'rb') as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a triage model file")
+            (header_length,) = struct.unpack('<I', handle.read(4))
+            header = json.loads(handle.read(header_length).decode('utf-8'))
+        offset = len(MAGIC) + 4 + header_length
+        offset += (-offset) % ALIGNMENT
+
+        n_labels = len(header['labels'])
+        data = np.memmap(path, dtype='<f4', mode='r', offset=offset,
+                         shape=(header['n_features'] * n_labels + n_labels,))
+        weights = data[:-n_labels].reshape(header['n_features'], n_labels)
+        bias = np.array(data[-n_labels:])
+        return cls(weights, bias, header['labels'], header['threshold'], header.get('metadata'))
@@ -0,0 +1,299 @@
+"""
+VERDICT CACHE
+=============
+Persistent cache of parsed verdicts for the Indian News Verifier.
+
+Claims are keyed on a normalized form (Unicode NFKC, case folding,
+punctuation and whitespace collapsing) so trivially different copies of
+the same viral claim share one entry. Entries live in SQLite (WAL mode),
+which survives restarts and can be shared by several app processes on
+one host. A small in-process LRU sits in front of the database; its
+entries are re-read from SQLite after `memory_ttl` seconds, so a clear()
+or eviction in another process is seen within that time.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+# Default time-to-live in seconds per verdict status. Developing stories are
+# usually UNVERIFIED at first, so those expire quickly.
+DEFAULT_TTL_BY_STATUS = {
+    'TRUE': 7 * 24 * 3600,
+    'FALSE': 7 * 24 * 3600,
+    'PARTIALLY_TRUE': 3 * 24 * 3600,
+    'UNVERIFIED': 6 * 3600,
+}
+
+# Per-request annotations that must not be persisted with a verdict
+TRANSIENT_FIELDS = frozenset(['cache_hit', 'near_duplicate', 'similarity', 'timings', 'usage', 'coalesced', 'triage'])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    key TEXT PRIMARY KEY,
+    claim TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_verdicts_last_access ON verdicts (last_access);
+CREATE INDEX IF NOT EXISTS idx_verdicts_expires_at ON verdicts (expires_at);
+"""
+
+
+def normalize_claim(claim):
+    """Normalize a claim for cache keying: NFKC, casefold, no punctuation/symbols, single spaces"""
+    text = unicodedata.normalize('NFKC', claim or '').casefold()
+    # Drop punctuation (P*) and symbols/emoji (S*) but keep combining marks,
+    # which Indic scripts need to keep words distinct
+    text = ''.join(' ' if unicodedata.category(ch)[0] in 'PS' else ch for ch in text)
+    return ' '.join(text.split())
+
+
+def claim_key(claim):
+    """Stable cache key for a claim"""
+    return hashlib.sha256(normalize_claim(claim).encode('utf-8')).hexdigest()
+
+
+class VerdictCache:
+    """
+    SQLite-backed verdict cache with per-status TTLs and LRU size bounds.
+    Safe to use from many threads; each thread gets its own connection.
+
+    Hits served from memory update last_access in SQLite in batches of
+    `touch_batch`; size bounds are enforced every `evict_every` writes or
+    `evict_interval` seconds, so the table may briefly hold a few more
+    than max_entries rows.
+
+    Memory hits are served without reading SQLite for up to `memory_ttl`
+    seconds after the entry was loaded; a verdict cleared or evicted by
+    another process can be served that long. `clock` returns wall-clock
+    seconds (injectable for tests).
+    """
+
+    def __init__(self, path, max_entries=50000, ttl_by_status=None, memory_entries=1024,
+                 touch_batch=64, evict_every=100, evict_interval=60.0, memory_ttl=30.0, clock=time.time):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_by_status = dict(DEFAULT_TTL_BY_STATUS)
+        if ttl_by_status:
+            self.ttl_by_status.update(ttl_by_status)
+        self.memory_entries = memory_entries
+        self.touch_batch = touch_batch
+        self.evict_every = evict_every
+        self.evict_interval = evict_interval
+        self.memory_ttl = memory_ttl
+        self.clock = clock
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._memory = OrderedDict()
+        self._touched = {}
+        self._writes = 0
+        self._last_evict = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self):
+        """Per-thread SQLite connection"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, claim):
+        """Return a copy of the cached result dict for a claim, or None"""
+        return self.get_by_key(claim_key(claim))
+
+    def get_by_key(self, key):
+        """Return a copy of the cached result dict for a precomputed key, or None"""
+        now = self.clock()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, loaded_at, result = entry
+                if expires_at > now and now - loaded_at < self.memory_ttl:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    self._touched[key] = now
+                    flush = len(self._touched) >= self.touch_batch
+                else:
+                    del self._memory[key]
+                    entry = None
+        if entry is not None:
+            if flush:
+                self._flush_touched(self._connection())
+            return self._as_hit(result)
+
+        conn = self._connection()
+        row = conn.execute(
+            'SELECT result, expires_at FROM verdicts WHERE key = ?', (key,)
+        ).fetchone()
+
+        if row is None or row[1] <= now:
+            if row is not None:
+                conn.execute('DELETE FROM verdicts WHERE key = ? AND expires_at <= ?', (key, now))
+            with self._lock:
+                self.misses += 1
+            return None
+
+        conn.execute('UPDATE verdicts SET last_access = ? WHERE key = ?', (now, key))
+        result = json.loads(row[0])
+        with self._lock:
+            self._remember(key, row[1], result, now)
+            self.hits += 1
+        return self._as_hit(result)
+
+    def set(self, claim, result):
+        """Store a successful result dict for a claim; errors and triage verdicts are never cached"""
+        if not result.get('success') or result.get('triage'):
+            return
+        status = result.get('status', 'UNVERIFIED')
+        ttl = self.ttl_by_status.get(status, 0)
+        if ttl <= 0:
+            return
+
+        key = claim_key(claim)
+        now = self.clock()
+        expires_at = now + ttl
+        stored = {k: v for k, v in result.items() if k not in TRANSIENT_FIELDS}
+
+        conn = self._connection()
+        conn.execute(
+            'INSERT OR REPLACE INTO verdicts '
+            '(key, claim, status, result, created_at, expires_at, last_access) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (key, claim, status, json.dumps(stored, ensure_ascii=False), now, expires_at, now)
+        )
+        with self._lock:
+            self._remember(key, expires_at, stored, now)
+            self._touched.pop(key, None)
+        self._maybe_evict(conn, now)
+
+    def warm(self, entries):
+        """
+        Load (claim, result, created_at) verdicts from another source, e.g. the
+        verification history. Expiry counts from created_at; claims already
+        cached, triage verdicts and verdicts past their TTL are skipped. Returns the
+        (key, claim) pairs that were added.
+        """
+        now = self.clock()
+        added = []
+        conn = self._connection()
+        for claim, result, created_at in entries:
+            status = result.get('status', 'UNVERIFIED')
+            expires_at = created_at + self.ttl_by_status.get(status, 0)
+            if not result.get('success') or result.get('triage') or expires_at <= now:
+                continue
+            key = claim_key(claim)
+            stored = {k: v for k, v in result.items() if k not in TRANSIENT_FIELDS}
+            inserted = conn.execute(
+                'INSERT OR IGNORE INTO verdicts '
+                '(key, claim, status, result, created_at, expires_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, claim, status, json.dumps(stored, ensure_ascii=False), created_at, expires_at, created_at)
+            ).rowcount
+            if inserted:
+                added.append((key, claim))
+        if added:
+            self._evict(conn, now)
+        return added
+
+    def _remember(self, key, expires_at, result, now):
+        """Insert into the in-process LRU (caller holds the lock)"""
+        self._memory[key] = (expires_at, now, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _flush_touched(self, conn):
+        """Write last_access for entries served from memory since the last flush"""
+        with self._lock:
+            touched, self._touched = self._touched, {}
+        if touched:
+            conn.executemany('UPDATE verdicts SET last_access = MAX(last_access, ?) WHERE key = ?',
+                             [(when, key) for key, when in touched.items()])
+
+    def _maybe_evict(self, conn, now):
+        """Run _evict every evict_every writes or evict_interval seconds"""
+        with self._lock:
+            self._writes += 1
+            due = self._writes % self.evict_every == 0 or now - self._last_evict >= self.evict_interval
+            if due:
+                self._last_evict = now
+        if due:
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        """Drop expired rows, then least recently used rows beyond max_entries"""
+        # Memory hits count as uses, so they must be on disk before picking LRU victims
+        self._flush_touched(conn)
+        removed = conn.execute('DELETE FROM verdicts WHERE expires_at <= ?', (now,)).rowcount
+        overflow = conn.execute('SELECT COUNT(*) FROM verdicts').fetchone()[0] - self.max_entries
+        if overflow > 0:
+            removed += conn.execute(
+                'DELETE FROM verdicts WHERE key IN '
+                '(SELECT key FROM verdicts ORDER BY last_access LIMIT ?)', (overflow,)
+            ).rowcount
+        if removed > 0:
+            with self._lock:
+                self.evictions += removed
+
+    @staticmethod
+    def _as_hit(result):
+        """Copy a stored result and mark it as served from cache"""
+        hit = dict(result)
+        hit['cache_hit'] = True
+        return hit
+
+    def iter_claims(self):
+        """Yield (key, claim) for every unexpired entry, oldest first"""
+        rows = self._connection().execute(
+            'SELECT key, claim FROM verdicts WHERE expires_at > ? ORDER BY created_at', (self.clock(),)
+        )
+        for key, claim in rows:
+            yield key, claim
+
+    def iter_labelled(self):
+        """Yield (claim, status) for every stored verdict, expired or not, oldest first"""
+        rows = self._connection().execute('SELECT claim, status FROM verdicts ORDER BY created_at')
+        for claim, status in rows:
+            yield claim, status
+
+    def clear(self):
+        """Remove every cached verdict"""
+        self._connection().execute('DELETE FROM verdicts')
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+
+    def stats(self):
+        """Hit/miss counters and current size"""
+        size = self._connection().execute('SELECT COUNT(*) FROM verdicts').fetchone()[0]
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'size': size,
+                'max_entries': self.max_entries,
+            }
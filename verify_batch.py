@@ -0,0 +1,151 @@
+"""
+🇮🇳 INDIAN NEWS VERIFIER - BATCH CLI
+====================================
+Verify claims from a moderation queue export without the Streamlit UI.
+
+Input is JSONL (one object per line with a "claim" or "text" field and an
+optional "id") or CSV (a "claim"/"text" column, otherwise the first column).
+Verdicts are written as NDJSON, one object per claim; a JSONL line that is
+not valid JSON or whose claim is not a string gets an error line instead.
+
+Usage:
+    python verify_batch.py claims.jsonl -o verdicts.ndjson --workers 8
+    python verify_batch.py queue.csv --ordered > verdicts.ndjson
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import sys
+import time
+
+from main_beautiful import AppConfig, get_shared_engine
+
+TEXT_FIELDS = ('claim', 'text', 'news', 'content')
+
+
+def read_records(path, input_format):
+    """
+    Yield (record_id, claim, error) from a JSONL or CSV file ('-' for stdin);
+    claim is None and error says why for records that cannot be verified
+    """
+    handle = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+    try:
+        if input_format == 'csv':
+            reader = csv.DictReader(handle)
+            for line_number, row in enumerate(reader, start=1):
+                claim = next((row[field] for field in TEXT_FIELDS if row.get(field)), None)
+                if claim is None and reader.fieldnames:
+                    claim = row[reader.fieldnames[0]]
+                if claim and claim.strip():
+                    yield row.get('id') or line_number, claim.strip(), None
+        else:
+            for line_number, line in enumerate(handle, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield line_number, None, f"Line {line_number} is not valid JSON: {e}"
+                    continue
+                if isinstance(record, str):
+                    record = {'claim': record}
+                if not isinstance(record, dict):
+                    yield line_number, None, f"Line {line_number} is not a JSON object or string"
+                    continue
+                record_id = record.get('id', line_number)
+                field = next((field for field in TEXT_FIELDS if record.get(field)), None)
+                if field is None:
+                    continue
+                if not isinstance(record[field], str):
+                    yield record_id, None, f"Line {line_number}: '{field}' must be a string"
+                elif record[field].strip():
+                    yield record_id, record[field].strip(), None
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def detect_format(path):
+    """Guess the input format from the file extension"""
+    return 'csv' if path.lower().endswith('.csv') else 'jsonl'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Verify news claims in bulk and write verdicts as NDJSON"
+    )
+    parser.add_argument('input', help="JSONL or CSV file of claims ('-' for stdin)")
+    parser.add_argument('-o', '--output', default='-', help="NDJSON output file (default: stdout)")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], help="Input format (default: from extension)")
+    parser.add_argument('--workers', type=int, default=AppConfig.BATCH_MAX_WORKERS,
+                        help="Concurrent verifications (default: %(default)s)")
+    parser.add_argument('--timeout', type=float, default=AppConfig.BATCH_CLAIM_TIMEOUT,
+                        help="Per-claim timeout in seconds (default: %(default)s)")
+    parser.add_argument('--ordered', action='store_true',
+                        help="Write verdicts in input order instead of as they complete")
+    args = parser.parse_args(argv)
+
+    verifier = get_shared_engine().get()
+    if not verifier.is_ready and verifier.cache is None:
+        print(f"❌ AI engine not ready: {verifier.setup_error}", file=sys.stderr)
+        return 1
+
+    input_format = args.format or detect_format(args.input)
+    records = {}
+    # Position among the claims handed to the verifier -> position in the input
+    input_positions = {}
+    verify_positions = itertools.count()
+
+    def claims():
+        # Remember ids only for claims that are in flight
+        for position, (record_id, claim, error) in enumerate(read_records(args.input, input_format)):
+            records[position] = (record_id, claim)
+            if error is not None:
+                finish(position, verifier._create_error_response(error, 'invalid_record'))
+                continue
+            input_positions[next(verify_positions)] = position
+            yield claim
+
+    output = sys.stdout if args.output == '-' else open(args.output, 'w', encoding='utf-8')
+    started = time.perf_counter()
+    counts = {}
+    buffered = {}
+    next_position = 0
+
+    def write(position, result):
+        record_id, claim = records.pop(position)
+        line = {'id': record_id, 'claim': claim}
+        line.update(result)
+        output.write(json.dumps(line, ensure_ascii=False) + '\n')
+
+    def finish(position, result):
+        nonlocal next_position
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+        if not args.ordered:
+            write(position, result)
+            return
+        buffered[position] = result
+        while next_position in buffered:
+            write(next_position, buffered.pop(next_position))
+            next_position += 1
+
+    try:
+        for position, result in verifier.iter_verify(claims(), max_workers=args.workers, timeout=args.timeout):
+            finish(input_positions.pop(position), result)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    summary = ', '.join(f"{status}: {count}" for status, count in sorted(counts.items()))
+    print(f"✅ Verified {total} claims in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.1f}/s) - {summary}",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())